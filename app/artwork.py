@@ -0,0 +1,175 @@
+"""
+Server-side poster/cover cache for the home-page strips.
+
+TMDB and RAWG lookups used to happen in the browser, one title at a time, on
+every page view. Now a background refresher resolves each tmdb_id / rawg_id
+once and stores the image path in `media_catalog.artwork_cache`
+(db/migrate_artwork_cache.sql); the dashboards read the cache in one query and
+render with the URLs already in place.
+
+The HTTP client is pluggable: anything with `get_json(url, params) -> dict|None`
+(None meaning "not found") can be passed to `init_artwork(app, client=...)`,
+e.g. a stub that serves canned responses in tests.
+"""
+import threading
+
+import requests
+from sqlalchemy import text
+
+from extensions import db
+from queries import artwork_lookup_query, artwork_missing_query, artwork_upsert_query
+from games.queries import artwork_missing_query as game_artwork_missing_query
+
+TMDB_IMG_BASE = 'https://image.tmdb.org/t/p/w200'
+
+
+class RequestsClient:
+    """Default HTTP client: a pooled requests.Session with a short timeout."""
+
+    def __init__(self, timeout: float = 10.0):
+        self.session = requests.Session()
+        self.timeout = timeout
+
+    def get_json(self, url: str, params: dict = None):
+        res = self.session.get(url, params=params, timeout=self.timeout)
+        if res.status_code == 404:
+            return None
+        res.raise_for_status()
+        return res.json()
+
+
+def image_url(source: str, path: str):
+    """Browser-ready URL for a cached path (TMDB stores a path, RAWG a full URL)."""
+    if not path:
+        return None
+    if source.startswith('tmdb_'):
+        return TMDB_IMG_BASE + path
+    return path
+
+
+def with_artwork(rows, id_key: str, source_fn) -> list:
+    """Copy `rows` to dicts with a `poster_url` filled from the cache.
+
+    `source_fn(row)` names the cache source ('tmdb_movie', 'tmdb_tv', 'rawg').
+    Ids the cache has never seen get poster_url=None and wake the refresher,
+    so they show up on a later page view.
+    """
+    out = [dict(r) for r in rows]
+    keys = {(source_fn(r), str(r[id_key])) for r in out if r[id_key]}
+    if not keys:
+        return out
+
+    sources, ids = zip(*keys)
+    found = {
+        (r['source'], r['external_id']): image_url(r['source'], r['image_path'])
+        for r in db.session.execute(
+            text(artwork_lookup_query()),
+            {'sources': list(sources), 'ids': list(ids)},
+        ).mappings()
+    }
+    for r in out:
+        key = (source_fn(r), str(r[id_key])) if r[id_key] else None
+        r['poster_url'] = found.get(key)
+
+    if len(found) < len(keys):
+        refresher = _refresher()
+        if refresher:
+            refresher.wake()
+    return out
+
+
+class ArtworkRefresher:
+    """Daemon thread that fills artwork_cache for ids the catalog has but the
+    cache lacks. Runs every `interval` seconds, or sooner when woken."""
+
+    def __init__(self, app, client):
+        self.app = app
+        self.client = client
+        self.interval = app.config.get('ARTWORK_REFRESH_INTERVAL', 600)
+        self.batch = app.config.get('ARTWORK_BATCH_SIZE', 50)
+        self.retry = f"{app.config.get('ARTWORK_RETRY_DAYS', 7)} days"
+        self.tmdb_key = app.config.get('TMDB_API_KEY')
+        self.rawg_key = app.config.get('RAWG_API_KEY')
+        self.tmdb_base = app.config.get('TMDB_API_BASE', 'https://api.themoviedb.org/3')
+        self.rawg_base = app.config.get('RAWG_API_BASE', 'https://api.rawg.io/api')
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='artwork-refresher',
+                                        daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def wake(self):
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            try:
+                with self.app.app_context():
+                    self.refresh_once()
+            except Exception:
+                self.app.logger.exception('artwork refresh failed')
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def refresh_once(self) -> int:
+        """Resolve one batch of missing ids per source; returns rows written.
+        Must run inside an app context."""
+        params = {'retry': self.retry, 'limit': self.batch}
+        todo = []
+        try:
+            if self.tmdb_key:
+                todo += db.session.execute(text(artwork_missing_query()), params).mappings().all()
+            if self.rawg_key:
+                todo += db.session.execute(text(game_artwork_missing_query()), params).mappings().all()
+
+            written = 0
+            for row in todo:
+                try:
+                    path = self._lookup(row['source'], row['external_id'])
+                except Exception:
+                    # Transport error or rate limit: leave it uncached, retry next pass.
+                    self.app.logger.warning('artwork lookup failed for %s/%s',
+                                            row['source'], row['external_id'])
+                    continue
+                db.session.execute(text(artwork_upsert_query()), {
+                    'source': row['source'],
+                    'external_id': row['external_id'],
+                    'image_path': path,
+                })
+                written += 1
+            db.session.commit()
+            return written
+        except Exception:
+            db.session.rollback()
+            raise
+        finally:
+            db.session.remove()
+
+    def _lookup(self, source: str, external_id: str):
+        if source == 'rawg':
+            data = self.client.get_json(f'{self.rawg_base}/games/{external_id}',
+                                        {'key': self.rawg_key})
+            return (data or {}).get('background_image')
+        kind = 'movie' if source == 'tmdb_movie' else 'tv'
+        data = self.client.get_json(f'{self.tmdb_base}/{kind}/{external_id}',
+                                    {'api_key': self.tmdb_key})
+        return (data or {}).get('poster_path')
+
+
+def _refresher():
+    from flask import current_app
+    return current_app.extensions.get('artwork')
+
+
+def init_artwork(app, client=None):
+    """Attach the refresher to `app` and start it, unless ARTWORK_REFRESH is off
+    or neither API key is configured (the strips then show placeholders)."""
+    if not app.config.get('ARTWORK_REFRESH', True):
+        return None
+    if not (app.config.get('TMDB_API_KEY') or app.config.get('RAWG_API_KEY')):
+        return None
+    refresher = ArtworkRefresher(app, client or RequestsClient())
+    app.extensions['artwork'] = refresher
+    refresher.start()
+    return refresher
@@ -0,0 +1,30 @@
+"""`flask ledger ...` maintenance commands, registered by create_app().
+
+    flask --app dvd ledger reconcile           # recompute portfolio_totals, report drift
+    flask --app dvd ledger reconcile --check   # report only; exit 1 if anything drifted
+"""
+import sys
+
+import click
+from flask.cli import AppGroup
+
+from card_ledger import service
+
+ledger_cli = AppGroup('ledger', help='Card-ledger maintenance.')
+
+
+@ledger_cli.command('reconcile')
+@click.option('--check', is_flag=True,
+              help='Only report drift (exit status 1 if any); leave the counters alone.')
+def reconcile(check):
+    """Recompute the portfolio counters from scratch and report any drift."""
+    drift = service.reconcile_portfolio(fix=not check)
+    if not drift:
+        click.echo('portfolio_totals: no drift')
+        return
+    for counter, (stored, actual) in drift.items():
+        delta = '' if stored is None else f'  ({actual - stored:+})'
+        click.echo(f'{counter:<20} stored {stored}  actual {actual}{delta}')
+    click.echo('portfolio_totals: ' + ('drift found (not corrected)' if check else 'corrected'))
+    if check:
+        sys.exit(1)
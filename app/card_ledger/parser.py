@@ -84,101 +84,319 @@ def find_paid_column(fieldnames):
     return None
 
 
-def parse_csv(text_or_bytes):
-    """Parse a TCGplayer CSV (str or bytes) into the structured intake payload.
-
-    Returns a dict:
-        items      list of per-physical-card dicts (quantities expanded)
-        n_cards    len(items)
-        set_code   set code of the first parsed card (acquisition-level)
-        total_value sum of market values across all cards
-        sum_paid   sum of Paid column across all cards (0 if none)
-        paid_seen  True if any row had a Paid value
-        warnings   list of human-readable warnings
-    """
-    if isinstance(text_or_bytes, bytes):
-        text = text_or_bytes.decode("utf-8-sig")
-    else:
+def _text_stream(source):
+    """(text stream, wrapped) for parse_csv/iter_csv. bytes/str are parsed from
+    memory as before; a binary file object is decoded incrementally, so only the
+    current line is ever held. `wrapped` means we own a TextIOWrapper that must
+    be detached (not closed) so the caller's file stays usable."""
+    if isinstance(source, bytes):
+        return io.StringIO(source.decode("utf-8-sig")), False
+    if isinstance(source, str):
         # strip a leading BOM if present
-        text = text_or_bytes.lstrip("﻿")
+        return io.StringIO(source.lstrip("﻿")), False
+    if isinstance(source, io.TextIOBase):
+        return source, False
+    return io.TextIOWrapper(source, encoding="utf-8-sig", newline=""), True
+
+
+def _variant(rarity, printing):
+    """Rarity, plus the printing unless it is 'Normal' ('SR' + 'Foil' -> 'SR Foil')."""
+    variant = rarity
+    if printing and printing.lower() != "normal":
+        variant = (rarity + " " + printing).strip()
+    return variant or None
+
+
+def _qty(value):
+    """Add to Quantity / Total Quantity -> int >= 1 (blank or junk counts as 1)."""
+    try:
+        return max(1, int(float(value or 1)))
+    except ValueError:
+        return 1
+
+
+def _card_from_row(row, paid_col):
+    """One CSV row -> (card dict, qty), or None for a row without a name."""
+    name = _get(row, "Product Name", "Title")
+    if not name:
+        return None
+
+    game = game_from_product_line(_get(row, "Product Line"))
 
-    reader = csv.DictReader(io.StringIO(text))
-    paid_col = find_paid_column(reader.fieldnames)
+    rarity, printing = _get(row, "Rarity"), _get(row, "Printing")
+    code = strip_rarity(_get(row, "Number"), rarity)
+    set_code = set_code_for(game, code, _get(row, "Set Name"))
 
-    items = []
-    box_set_code = None
+    condition = CONDITION_MAP.get(_get(row, "Condition").lower(), None)
+    price = _num(_get(row, "TCG Market Price"))
+    product_id = _get(row, "Product ID")
+    image_url = _get(row, "Photo URL")
+    paid_val = _num(_get(row, paid_col)) if paid_col else None
+
+    qty = _qty(_get(row, "Add to Quantity", "Total Quantity"))
+
+    return {
+        "name": name,
+        "game": game,
+        "set_code": set_code,
+        "collector_number": code,
+        "variant": _variant(rarity, printing),
+        "condition": condition,
+        "market_value": price,
+        "tcgplayer_product_id": product_id or None,
+        "image_url": image_url or None,
+        "paid": paid_val,
+    }, qty
+
+
+def _collect(groups, expand=True):
+    """Fold (card, qty) pairs into the intake payload, totalling as it goes.
+
+    expand=True  -> "items": one dict per physical card (the original shape).
+    expand=False -> "groups": the (card, qty) pairs as-is, so a qty-500 bulk row
+                    stays one dict; use iter_items() to walk the cards.
+    """
+    items = [] if expand else None
+    kept = [] if not expand else None
+    n_cards = 0
+    first_set_code = None
     total_value = 0.0
     sum_paid = 0.0
     paid_seen = False
     games_seen = set()
 
-    for row in reader:
-        name = _get(row, "Product Name", "Title")
-        if not name:
-            continue
+    for card, qty in groups:
+        first_set_code = first_set_code or card["set_code"]
+        if card["game"]:
+            games_seen.add(card["game"])
+        if card["paid"] is not None:
+            paid_seen = True
+            sum_paid += card["paid"] * qty
+        if card["market_value"] is not None:
+            total_value += card["market_value"] * qty
+        n_cards += qty
+        if expand:
+            items.extend(dict(card) for _ in range(qty))
+        else:
+            kept.append((card, qty))
+
+    payload = {
+        "n_cards": n_cards,
+        "set_code": first_set_code,
+        "games": sorted(games_seen),
+        "mixed": len(games_seen) > 1,
+        "total_value": round(total_value, 2),
+        "sum_paid": round(sum_paid, 2),
+        "paid_seen": paid_seen,
+    }
+    if expand:
+        payload["items"] = items
+    else:
+        payload["groups"] = kept
+    return payload
 
-        game = game_from_product_line(_get(row, "Product Line"))
-        games_seen.add(game)
 
-        rarity, printing = _get(row, "Rarity"), _get(row, "Printing")
-        code = strip_rarity(_get(row, "Number"), rarity)
-        set_code = set_code_for(game, code, _get(row, "Set Name"))
-        box_set_code = box_set_code or set_code
+def iter_csv(source):
+    """Stream a TCGplayer CSV as (card, qty) pairs, one per named CSV row and
+    never expanded. `source` may be bytes, str, or a binary/text file object
+    (read incrementally)."""
+    stream, wrapped = _text_stream(source)
+    try:
+        reader = csv.DictReader(stream)
+        paid_col = find_paid_column(reader.fieldnames)
+        for row in reader:
+            group = _card_from_row(row, paid_col)
+            if group is not None:
+                yield group
+    finally:
+        if wrapped:
+            stream.detach()
+
+
+def iter_items(parsed):
+    """Per-physical-card dicts from either payload shape: expanded "items", or
+    the compact "groups" from parse_csv(..., expand=False)."""
+    if "groups" in parsed:
+        for card, qty in parsed["groups"]:
+            for _ in range(qty):
+                yield card
+    else:
+        yield from parsed["items"]
+
+
+# ── Columnar engine ─────────────────────────────────────────────────────────
+# Same rules as _card_from_row(), applied a column at a time: csv.reader rows
+# are transposed into per-column lists, each derived column is computed with a
+# memoized mapping over its distinct inputs (an export repeats the same product
+# line, set, rarity, condition and price strings thousands of times), and the
+# totals are sums over the columns. It only builds the compact (card, qty)
+# payload the routes use: expanded per-card items are slower and bigger this
+# way than on the row path. Compact, on a 50k-row export (bench/parser_bench.py)
+# it is ~0-25% faster than the row path for ~1.5x the peak memory, since the
+# whole CSV is held as columns while parsing.
+
+def _mapped(fn, *columns):
+    """[fn(*args) for args in zip(*columns)], computing fn once per distinct args."""
+    cache = {}
+    out = []
+    append = out.append
+    for key in zip(*columns):
+        try:
+            append(cache[key])
+        except KeyError:
+            cache[key] = value = fn(*key)
+            append(value)
+    return out
+
+
+def _column(columns, index, n_rows, *names):
+    """Stripped values of the first of `names` that is non-blank, per row —
+    the column-wise equivalent of _get(row, *names)."""
+    present = [index[n] for n in names if n in index]
+    if not present:
+        return [""] * n_rows
+    out = [v.strip() for v in columns[present[0]]]
+    for i in present[1:]:
+        fallback = columns[i]
+        out = [v or fallback[r].strip() for r, v in enumerate(out)]
+    return out
+
+
+def _columnar_payload(stream):
+    reader = csv.reader(stream)
+    header = next(reader, None)
+    if header is None:
+        return _collect((), expand=False), None
+    paid_col = find_paid_column(header)
+    # DictReader semantics: a repeated header name maps to its last column,
+    # blank lines are skipped, and short rows read as missing (blank) values.
+    index = {name: i for i, name in enumerate(header)}
+    width = len(header)
+    rows = [r if len(r) >= width else r + [""] * (width - len(r))
+            for r in reader if r]
+    n = len(rows)
+    columns = list(zip(*rows)) if rows else [()] * width
+
+    def col(*names):
+        return _column(columns, index, n, *names)
+
+    names = col("Product Name", "Title")
+    keep = [i for i, name in enumerate(names) if name]
+
+    games = _mapped(game_from_product_line, col("Product Line"))
+    rarities, printings = col("Rarity"), col("Printing")
+    codes = _mapped(strip_rarity, col("Number"), rarities)
+    set_codes = _mapped(set_code_for, games, codes, col("Set Name"))
+    variants = _mapped(_variant, rarities, printings)
+    conditions = _mapped(lambda c: CONDITION_MAP.get(c.lower(), None), col("Condition"))
+    prices = _mapped(_num, col("TCG Market Price"))
+    product_ids = col("Product ID")
+    image_urls = col("Photo URL")
+    paid = _mapped(_num, col(paid_col)) if paid_col else [None] * n
+    qtys = _mapped(_qty, col("Add to Quantity", "Total Quantity"))
+
+    groups = [({
+        "name": names[i],
+        "game": games[i],
+        "set_code": set_codes[i],
+        "collector_number": codes[i],
+        "variant": variants[i],
+        "condition": conditions[i],
+        "market_value": prices[i],
+        "tcgplayer_product_id": product_ids[i] or None,
+        "image_url": image_urls[i] or None,
+        "paid": paid[i],
+    }, qtys[i]) for i in keep]
+
+    # Totals over the kept columns, summed in row order like _collect().
+    paid_kept = [(paid[i], qtys[i]) for i in keep if paid[i] is not None]
+    games_seen = {games[i] for i in keep if games[i]}
+    payload = {
+        "n_cards": sum(qtys[i] for i in keep),
+        "set_code": next((set_codes[i] for i in keep if set_codes[i]), None),
+        "games": sorted(games_seen),
+        "mixed": len(games_seen) > 1,
+        "total_value": round(sum(prices[i] * qtys[i] for i in keep
+                                 if prices[i] is not None), 2),
+        "sum_paid": round(sum(p * q for p, q in paid_kept), 2),
+        "paid_seen": bool(paid_kept),
+        "groups": groups,
+    }
+    return payload, paid_col
 
-        variant = rarity
-        if printing and printing.lower() != "normal":
-            variant = (rarity + " " + printing).strip()
 
-        condition = CONDITION_MAP.get(_get(row, "Condition").lower(), None)
-        price = _num(_get(row, "TCG Market Price"))
-        product_id = _get(row, "Product ID")
-        image_url = _get(row, "Photo URL")
+ENGINES = ("rows", "columnar")
 
-        paid_val = _num(_get(row, paid_col)) if paid_col else None
-        if paid_val is not None:
-            paid_seen = True
 
-        try:
-            qty = max(1, int(float(_get(row, "Add to Quantity", "Total Quantity") or 1)))
-        except ValueError:
-            qty = 1
-
-        if price is not None:
-            total_value += price * qty
-        if paid_val is not None:
-            sum_paid += paid_val * qty
-
-        for _ in range(qty):
-            items.append({
-                "name": name,
-                "game": game,
-                "set_code": set_code,
-                "collector_number": code,
-                "variant": variant or None,
-                "condition": condition,
-                "market_value": price,
-                "tcgplayer_product_id": product_id or None,
-                "image_url": image_url or None,
-                "paid": paid_val,
-            })
+def parse_csv(source, expand=True, engine="rows"):
+    """Parse a TCGplayer CSV into the structured intake payload.
+
+    `source` is bytes, str, or a file object; a binary file is decoded and parsed
+    row by row. With expand=False the payload carries compact (card, qty)
+    "groups" instead of "items", so memory tracks CSV rows, not card count.
+
+    engine="columnar" (expand=False only; ValueError otherwise) parses the same
+    rules a column at a time (see _columnar_payload): a modest speedup at best,
+    for holding the whole CSV in memory. It returns an identical payload.
+
+    Returns a dict:
+        items      list of per-physical-card dicts (quantities expanded), or
+        groups     list of (card, qty) pairs when expand=False
+        n_cards    number of physical cards
+        set_code   set code of the first parsed card (acquisition-level)
+        total_value sum of market values across all cards
+        sum_paid   sum of Paid column across all cards (0 if none)
+        paid_seen  True if any row had a Paid value
+        warnings   list of human-readable warnings
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"unknown parse engine {engine!r}; expected one of {ENGINES}")
+    if engine == "columnar" and expand:
+        raise ValueError("the columnar engine only builds the compact payload (expand=False)")
+    stream, wrapped = _text_stream(source)
+    try:
+        if engine == "columnar":
+            payload, paid_col = _columnar_payload(stream)
+        else:
+            reader = csv.DictReader(stream)
+            paid_col = find_paid_column(reader.fieldnames)
+            rows = (_card_from_row(row, paid_col) for row in reader)
+            payload = _collect((g for g in rows if g is not None), expand)
+    finally:
+        if wrapped:
+            stream.detach()
 
     warnings = []
-    if not items:
+    if not payload["n_cards"]:
         warnings.append("No item rows parsed — check the CSV format (expected a "
                         "'Product Name' column).")
 
+    payload["has_paid_column"] = paid_col is not None
+    payload["warnings"] = warnings
+    return payload
+
+
+def _card_from_manual(r):
+    """One hand-typed row -> (card dict, qty), or None for a row without a name."""
+    name = (r.get("name") or "").strip()
+    if not name:
+        return None
+    try:
+        qty = max(1, int(float(r.get("qty") or 1)))
+    except (ValueError, TypeError):
+        qty = 1
     return {
-        "items": items,
-        "n_cards": len(items),
-        "set_code": box_set_code,
-        "games": sorted(games_seen),
-        "mixed": len(games_seen) > 1,
-        "total_value": round(total_value, 2),
-        "sum_paid": round(sum_paid, 2),
-        "paid_seen": paid_seen,
-        "has_paid_column": paid_col is not None,
-        "warnings": warnings,
-    }
+        "name": name,
+        "game": (r.get("game") or "").strip().lower() or None,
+        "set_code": (r.get("set_code") or "").strip() or None,
+        "collector_number": (r.get("collector_number") or "").strip() or None,
+        "variant": (r.get("variant") or "").strip() or None,
+        "condition": (r.get("condition") or "").strip() or None,
+        "market_value": _num(r.get("market_value")),
+        "tcgplayer_product_id": (r.get("tcgplayer_product_id") or "").strip() or None,
+        "image_url": (r.get("image_url") or "").strip() or None,
+        "paid": _num(r.get("paid")),
+    }, qty
 
 
 def build_manual(rows):
@@ -190,60 +408,8 @@ def build_manual(rows):
     an empty item list (no warning) when nothing is entered — a valid log-only
     acquisition; the route decides whether that's allowed for the chosen mode.
     """
-    items = []
-    set_code0 = None
-    total_value = 0.0
-    sum_paid = 0.0
-    paid_seen = False
-    games_seen = set()
-
-    for r in rows:
-        name = (r.get("name") or "").strip()
-        if not name:
-            continue
-        set_code = (r.get("set_code") or "").strip() or None
-        set_code0 = set_code0 or set_code
-        game = (r.get("game") or "").strip().lower() or None
-        if game:
-            games_seen.add(game)
-        price = _num(r.get("market_value"))
-        paid_val = _num(r.get("paid"))
-        if paid_val is not None:
-            paid_seen = True
-
-        try:
-            qty = max(1, int(float(r.get("qty") or 1)))
-        except (ValueError, TypeError):
-            qty = 1
-
-        if price is not None:
-            total_value += price * qty
-        if paid_val is not None:
-            sum_paid += paid_val * qty
-
-        for _ in range(qty):
-            items.append({
-                "name": name,
-                "game": game,
-                "set_code": set_code,
-                "collector_number": (r.get("collector_number") or "").strip() or None,
-                "variant": (r.get("variant") or "").strip() or None,
-                "condition": (r.get("condition") or "").strip() or None,
-                "market_value": price,
-                "tcgplayer_product_id": (r.get("tcgplayer_product_id") or "").strip() or None,
-                "image_url": (r.get("image_url") or "").strip() or None,
-                "paid": paid_val,
-            })
-
-    return {
-        "items": items,
-        "n_cards": len(items),
-        "set_code": set_code0,
-        "games": sorted(games_seen),
-        "mixed": len(games_seen) > 1,
-        "total_value": round(total_value, 2),
-        "sum_paid": round(sum_paid, 2),
-        "paid_seen": paid_seen,
-        "has_paid_column": paid_seen,
-        "warnings": [],
-    }
+    groups = (g for g in map(_card_from_manual, rows) if g is not None)
+    payload = _collect(groups)
+    payload["has_paid_column"] = payload["paid_seen"]
+    payload["warnings"] = []
+    return payload
@@ -2,7 +2,8 @@
 
 Mirrors the catalog's app/queries.py style: each function returns a SQL string with
 the ledger schema injected from LEDGER_SCHEMA. All reporting numbers come straight
-from the v_* views — no metrics are recomputed here.
+from the v_* views (or box_pl, v_box_pl's precomputed copy) — no metrics are
+recomputed here.
 """
 import os
 
@@ -12,21 +13,28 @@ def _schema() -> str:
 
 
 def portfolio_query() -> str:
-    """All-time totals (one row): invested, realized, unrealized."""
-    return f"SELECT * FROM {_schema()}.v_portfolio"
+    """All-time totals (one row): invested, realized, unrealized — v_portfolio's
+    columns, read from the running portfolio_totals counters (see
+    db/migrate_portfolio_totals.sql)."""
+    return f"SELECT * FROM {_schema()}.portfolio_totals"
 
 
-def box_pl_query() -> str:
-    """Per-acquisition P&L, newest first."""
+def box_pl_query(after: bool = False) -> str:
+    """One page of per-acquisition P&L, newest first, from the precomputed box_pl
+    table (v_box_pl's rows, kept current by the service writers — see
+    db/migrate_box_pl_summary.sql). Bind :limit; with after=True also bind
+    :after_date/:after_id (the last row of the previous page) for a keyset page."""
     return f"""
-        SELECT * FROM {_schema()}.v_box_pl
+        SELECT * FROM {_schema()}.box_pl
+        {'WHERE (purchase_date, acquisition_id) < (:after_date, :after_id)' if after else ''}
         ORDER BY purchase_date DESC, acquisition_id DESC
+        LIMIT :limit
     """
 
 
 def box_pl_one_query() -> str:
-    """P&L for a single acquisition."""
-    return f"SELECT * FROM {_schema()}.v_box_pl WHERE acquisition_id = :id"
+    """P&L for a single acquisition (precomputed box_pl row)."""
+    return f"SELECT * FROM {_schema()}.box_pl WHERE acquisition_id = :id"
 
 
 def acquisition_one_query() -> str:
@@ -40,9 +48,11 @@ def acquisition_one_query() -> str:
     """
 
 
-def item_ledger_base() -> str:
+def item_ledger_base(where: str = '', extra_columns: str = '') -> str:
     """Per-item ledger joined to item/acquisition for the fields the view omits
-    (image_url, variant, collector_number, game). Wrap in a subquery to filter."""
+    (image_url, variant, collector_number, game). `where` and `extra_columns`
+    are trusted SQL over the v/i/a aliases; append ORDER BY/LIMIT over the same
+    aliases, or wrap in a subquery to sort by output columns."""
     s = _schema()
     return f"""
         SELECT
@@ -64,19 +74,23 @@ def item_ledger_base() -> str:
             i.image_url,
             COALESCE(i.game, a.game) AS game,
             a.description AS acquisition_description
+            {f', {extra_columns}' if extra_columns else ''}
         FROM {s}.v_item_ledger v
         JOIN {s}.item i        ON i.item_id        = v.item_id
         JOIN {s}.acquisition a ON a.acquisition_id = v.acquisition_id
+        {f'WHERE {where}' if where else ''}
     """
 
 
 def box_items_query() -> str:
-    """All ledger rows for one acquisition, with each card's grading tier (if any)."""
+    """All ledger rows for one acquisition, with each card's grading tier (if any).
+    Both sides are filtered to the box, so tiers are evaluated for its cards only
+    (the view reads the stored box_median, see db/migrate_box_median.sql)."""
     return f"""
         SELECT sub.*, gc.tier
-        FROM ({item_ledger_base()}) AS sub
-        LEFT JOIN {_schema()}.v_grade_candidates gc ON gc.item_id = sub.item_id
-        WHERE sub.acquisition_id = :id
+        FROM ({item_ledger_base('i.acquisition_id = :id')}) AS sub
+        LEFT JOIN {_schema()}.v_grade_candidates gc
+               ON gc.item_id = sub.item_id AND gc.acquisition_id = :id
         ORDER BY sub.name
     """
 
@@ -138,7 +152,8 @@ def grade_candidates_query() -> str:
 
 
 def grade_candidate_one_query() -> str:
-    """The candidate row (tier, median_value, est_upside) for a single item, if any."""
+    """The candidate row (tier, median_value, est_upside) for a single item, if any.
+    An indexed lookup of that one item joined to its box's stored median."""
     return f"SELECT * FROM {_schema()}.v_grade_candidates WHERE item_id = :id"
 
 
@@ -168,15 +183,58 @@ def grading_history_for_query() -> str:
     """
 
 
-def ledger_posters_query() -> str:
-    """A random set of cards that carry a thumbnail, for the ledger home strip."""
+def grading_history_batch_query() -> str:
+    """grading_history_for_query() for many names in one round trip.
+
+    Bind :names to a list of lower-cased card names. Returns up to 5 graded copies
+    per name (same order as the single-name query), tagged with name_key so the
+    caller can group them; a window function does the per-name top-5.
+    """
     s = _schema()
     return f"""
-        SELECT item_id, name, set_code, image_url, market_value
-        FROM {s}.item
+        SELECT * FROM (
+            SELECT
+                lower(i.name)                                             AS name_key,
+                i.item_id,
+                i.name,
+                i.grader,
+                i.grade,
+                i.market_value,
+                (i.cost_basis + i.grading_total)                          AS total_basis,
+                s.net_proceeds,
+                s.net_proceeds - (i.cost_basis + i.grading_total)         AS profit_after_grading,
+                s.sale_date,
+                ROW_NUMBER() OVER (
+                    PARTITION BY lower(i.name)
+                    ORDER BY s.sale_date DESC NULLS LAST, i.item_id DESC
+                )                                                         AS rn
+            FROM {s}.item i
+            LEFT JOIN {s}.sale s ON s.item_id = i.item_id
+            WHERE i.grader IS NOT NULL AND lower(i.name) = ANY(:names)
+        ) AS h
+        WHERE rn <= 5
+        ORDER BY name_key, rn
+    """
+
+
+def ledger_poster_pool_query() -> str:
+    """Ids of every card that carries a thumbnail (the home strip samples these)."""
+    return f"""
+        SELECT item_id
+        FROM {_schema()}.item
         WHERE image_url IS NOT NULL AND image_url <> ''
-        ORDER BY random()
-        LIMIT 24
+    """
+
+
+def ledger_posters_query() -> str:
+    """Thumbnail rows for a pre-sampled list of item ids (:ids), in that order."""
+    s = _schema()
+    return f"""
+        SELECT i.item_id, i.name, i.set_code, i.image_url, i.market_value
+        FROM unnest(CAST(:ids AS bigint[])) WITH ORDINALITY AS k(id, ord)
+        JOIN {s}.item i ON i.item_id = k.id
+        WHERE i.image_url IS NOT NULL AND i.image_url <> ''
+        ORDER BY k.ord
     """
 
 
@@ -191,23 +249,6 @@ def appendable_acquisitions_query() -> str:
     """
 
 
-def location_search_query() -> str:
-    """Cards whose storage_location matches a shelf/bin label (for the unified locator)."""
-    s = _schema()
-    return f"""
-        SELECT
-            i.item_id,
-            i.name,
-            i.set_code,
-            i.condition,
-            i.status,
-            i.storage_location
-        FROM {s}.item i
-        WHERE i.storage_location ILIKE :loc
-        ORDER BY i.name
-    """
-
-
 def games_query() -> str:
     """Distinct games for the collection filter — per item (so a mixed lot's
     Pokémon and Weiss cards both appear), falling back to the acquisition's game."""
@@ -5,10 +5,14 @@ inside a single transaction with a preview/confirm step upstream (the route show
 preview before this commits). Sealed-product cost allocation is delegated to the
 database function allocate_box_cost() — never recomputed here.
 """
+import csv
+import io
+import itertools
 import os
 from sqlalchemy import text
 from extensions import db
-from card_ledger.parser import SEALED_TYPES
+from card_ledger import parser as csv_parser
+from card_ledger.parser import SEALED_TYPES, iter_items
 
 
 def _schema() -> str:
@@ -41,6 +45,105 @@ def _pos_int_or_none(value):
     return n if (n is not None and n > 0) else None
 
 
+def _refresh_box(s, fn, acquisition_id=None, item_id=None):
+    """Call a per-box refresh function (refresh_box_pl / refresh_box_median) for
+    one acquisition, or the one that owns `item_id`, inside the caller's
+    transaction, after its writes. The work is bounded by that box's item count,
+    not the whole ledger."""
+    if item_id is not None:
+        ids_sql = f"ARRAY(SELECT acquisition_id FROM {s}.item WHERE item_id = :id)"
+        params = {'id': int(item_id)}
+    else:
+        ids_sql = "ARRAY[CAST(:id AS bigint)]"
+        params = {'id': int(acquisition_id)}
+    db.session.execute(text(f"SELECT {s}.{fn}({ids_sql})"), params)
+
+
+def _refresh_box_pl(s, acquisition_id=None, item_id=None):
+    """Re-derive the box's precomputed box_pl row (db/migrate_box_pl_summary.sql)."""
+    _refresh_box(s, 'refresh_box_pl', acquisition_id, item_id)
+
+
+def _refresh_box_median(s, acquisition_id=None, item_id=None):
+    """Re-derive the box's stored median market value (db/migrate_box_median.sql).
+    Only needed after writes that add items or change market_value."""
+    _refresh_box(s, 'refresh_box_median', acquisition_id, item_id)
+
+
+# portfolio_totals columns (db/migrate_portfolio_totals.sql), named as in v_portfolio.
+PORTFOLIO_COUNTERS = (
+    'total_invested', 'total_realized_net', 'realized_profit',
+    'unsold_market_value', 'unrealized_profit',
+)
+_UNSOLD_STATUSES = "('inventory','listed','keep','grading')"
+
+
+def _portfolio_contribution_sql(s, scope):
+    """v_portfolio's numbers restricted to one acquisition (scope='acquisition':
+    its cost, items and their sales; bind :id), a list of them ('acquisitions';
+    bind :ids), one item ('item': no acquisition cost; bind :id), or the whole
+    ledger ('all')."""
+    item_where = {'acquisition': 'i.acquisition_id = :id',
+                  'acquisitions': 'i.acquisition_id = ANY(:ids)',
+                  'item': 'i.item_id = :id',
+                  'all': 'true'}[scope]
+    invested = {'acquisition': f"""(SELECT COALESCE(SUM(total_cost), 0)
+                                     FROM {s}.acquisition WHERE acquisition_id = :id)""",
+                'acquisitions': f"""(SELECT COALESCE(SUM(total_cost), 0)
+                                      FROM {s}.acquisition WHERE acquisition_id = ANY(:ids))""",
+                'item': '0',
+                'all': f"(SELECT COALESCE(SUM(total_cost), 0) FROM {s}.acquisition)"}[scope]
+    return f"""
+        SELECT
+            {invested} AS total_invested,
+            (SELECT COALESCE(SUM(s.net_proceeds), 0)
+               FROM {s}.sale s JOIN {s}.item i ON i.item_id = s.item_id
+              WHERE {item_where}) AS total_realized_net,
+            (SELECT COALESCE(SUM(s.net_proceeds - (i.cost_basis + i.grading_total)), 0)
+               FROM {s}.sale s JOIN {s}.item i ON i.item_id = s.item_id
+              WHERE {item_where}) AS realized_profit,
+            (SELECT COALESCE(SUM(i.market_value), 0)
+               FROM {s}.item i
+              WHERE {item_where} AND i.status IN {_UNSOLD_STATUSES}) AS unsold_market_value,
+            (SELECT COALESCE(SUM(i.market_value - (i.cost_basis + i.grading_total)), 0)
+               FROM {s}.item i
+              WHERE {item_where} AND i.status IN {_UNSOLD_STATUSES}
+                AND i.market_value IS NOT NULL) AS unrealized_profit
+    """
+
+
+def _lock_portfolio(s):
+    """Lock the portfolio_totals row for the rest of the transaction. Every writer
+    that applies a delta calls this first, before any contribution is read:
+    under READ COMMITTED a delta UPDATE takes its snapshot before it waits for
+    the row lock, so two writers on the same box could otherwise each subtract a
+    stale contribution and drift the counters. Once the lock is held, each later
+    statement sees everything the previous lock holder committed."""
+    db.session.execute(text(f"SELECT 1 FROM {s}.portfolio_totals FOR UPDATE"))
+
+
+def _apply_portfolio_delta(s, sign, acquisition_id=None, item_id=None):
+    """Add (sign=1) or remove (sign=-1) one acquisition's or item's contribution
+    to portfolio_totals, in the caller's transaction. Run with -1 before the
+    writes that change it and 1 after (like the dashboard_stats deltas), after
+    _lock_portfolio()."""
+    scope, key = ('item', item_id) if item_id is not None else ('acquisition', acquisition_id)
+    _portfolio_delta(s, sign, scope, {'id': int(key)})
+
+
+def _portfolio_delta(s, sign, scope, params):
+    """UPDATE portfolio_totals by sign * the contribution of `scope` (see
+    _portfolio_contribution_sql)."""
+    sets = ', '.join(f"{c} = t.{c} + :sign * c.{c}" for c in PORTFOLIO_COUNTERS)
+    db.session.execute(
+        text(f"""
+            UPDATE {s}.portfolio_totals t SET {sets}
+            FROM ({_portfolio_contribution_sql(s, scope)}) AS c
+        """),
+        {'sign': sign, **params},
+    )
+
+
 def _detect_game(form, parsed):
     """Acquisition-level game from the parsed CSV: 'mixed' if it spans games, the
     single game if uniform, else the form's choice (manual entry / no Product Line)."""
@@ -110,6 +213,7 @@ def commit_sealed_import(form, parsed):
     language = acq['language']
 
     try:
+        _lock_portfolio(s)
         # allocate_box_cost() references its tables unqualified, so it resolves them
         # via search_path. Scope the ledger schema onto the path for this transaction
         # only (SET LOCAL resets at commit/rollback — no leak across requests).
@@ -130,41 +234,18 @@ def commit_sealed_import(form, parsed):
             acq,
         ).scalar_one()
 
-        item_rows = [{
-            'acquisition_id': acquisition_id,
-            'name': it['name'],
-            'game': it.get('game'),
-            'set_code': it['set_code'],
-            'collector_number': it['collector_number'],
-            'variant': it['variant'],
-            'language': language,
-            'condition': it['condition'],
-            'market_value_at_open': it['market_value'],
-            'market_value': it['market_value'],
-            'tcgplayer_product_id': it['tcgplayer_product_id'],
-            'image_url': it['image_url'],
-        } for it in parsed['items']]
-
-        if item_rows:
-            db.session.execute(
-                text(f"""
-                    INSERT INTO {s}.item
-                        (acquisition_id, name, game, set_code, collector_number, variant, language,
-                         condition, cost_basis, market_value_at_open, market_value,
-                         tcgplayer_product_id, image_url, status)
-                    VALUES
-                        (:acquisition_id, :name, :game, :set_code, :collector_number, :variant, :language,
-                         :condition, 0, :market_value_at_open, :market_value,
-                         :tcgplayer_product_id, :image_url, 'inventory')
-                """),
-                item_rows,
-            )
+        # Pulls start at cost_basis 0; allocate_box_cost() settles them below.
+        _insert_items(s, acquisition_id, iter_items(parsed), language,
+                      basis_fn=lambda it, i: 0)
 
         # Sealed product: let the database allocate cost across pulls by market value.
         db.session.execute(
             text(f"SELECT {s}.allocate_box_cost(:id)"),
             {'id': acquisition_id},
         )
+        _refresh_box_pl(s, acquisition_id)
+        _refresh_box_median(s, acquisition_id)
+        _apply_portfolio_delta(s, 1, acquisition_id)
 
         db.session.commit()
         return acquisition_id
@@ -173,37 +254,64 @@ def commit_sealed_import(form, parsed):
         raise
 
 
+# item columns written by an import, in COPY order (status is always 'inventory').
+_ITEM_COPY_COLUMNS = (
+    'acquisition_id', 'name', 'game', 'set_code', 'collector_number', 'variant',
+    'language', 'condition', 'cost_basis', 'market_value_at_open', 'market_value',
+    'tcgplayer_product_id', 'image_url', 'status',
+)
+_COPY_NULL = r'\N'
+_COPY_BATCH = 10000   # rows per COPY round trip
+
+
+def _copy_rows(table, columns, rows):
+    """Bulk-load tuples (in `columns` order) into `table` with COPY FROM STDIN.
+
+    Runs on the session's own DBAPI connection, so it shares the surrounding
+    transaction (and its SET LOCAL search_path) and rolls back with it. Rows are
+    CSV-encoded into a buffer and shipped _COPY_BATCH at a time: a 5,000-card bulk
+    lot is one round trip instead of 5,000 INSERTs. Returns the row count.
+    """
+    cursor = db.session.connection().connection.cursor()
+    copy_sql = (f"COPY {table} ({', '.join(columns)}) "
+                f"FROM STDIN WITH (FORMAT csv, NULL '{_COPY_NULL}')")
+    total = 0
+    try:
+        while True:
+            batch = list(itertools.islice(rows, _COPY_BATCH))
+            if not batch:
+                return total
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            for row in batch:
+                writer.writerow(_COPY_NULL if v is None else v for v in row)
+            buf.seek(0)
+            cursor.copy_expert(copy_sql, buf)
+            total += len(batch)
+    finally:
+        cursor.close()
+
+
 def _insert_items(s, acquisition_id, items, language, basis_fn):
-    """Insert item rows for an acquisition. basis_fn(item, index) -> cost_basis."""
-    rows = [{
-        'acquisition_id': acquisition_id,
-        'name': it['name'],
-        'game': it.get('game'),
-        'set_code': it['set_code'],
-        'collector_number': it['collector_number'],
-        'variant': it['variant'],
-        'language': language,
-        'condition': it['condition'],
-        'cost_basis': basis_fn(it, i),
-        'market_value_at_open': it['market_value'],
-        'market_value': it['market_value'],
-        'tcgplayer_product_id': it['tcgplayer_product_id'],
-        'image_url': it['image_url'],
-    } for i, it in enumerate(items)]
-    if rows:
-        db.session.execute(
-            text(f"""
-                INSERT INTO {s}.item
-                    (acquisition_id, name, game, set_code, collector_number, variant, language,
-                     condition, cost_basis, market_value_at_open, market_value,
-                     tcgplayer_product_id, image_url, status)
-                VALUES
-                    (:acquisition_id, :name, :game, :set_code, :collector_number, :variant, :language,
-                     :condition, :cost_basis, :market_value_at_open, :market_value,
-                     :tcgplayer_product_id, :image_url, 'inventory')
-            """),
-            rows,
-        )
+    """Insert item rows for an acquisition. `items` is any iterable of per-card
+    dicts (e.g. parser.iter_items()); basis_fn(item, index) -> cost_basis."""
+    rows = ((
+        acquisition_id,
+        it['name'],
+        it.get('game'),
+        it['set_code'],
+        it['collector_number'],
+        it['variant'],
+        language,
+        it['condition'],
+        basis_fn(it, i),
+        it['market_value'],
+        it['market_value'],
+        it['tcgplayer_product_id'],
+        it['image_url'],
+        'inventory',
+    ) for i, it in enumerate(items))
+    return _copy_rows(f"{s}.item", _ITEM_COPY_COLUMNS, rows)
 
 
 def resolve_singles_basis(parsed, paid_overrides):
@@ -212,10 +320,9 @@ def resolve_singles_basis(parsed, paid_overrides):
     Returns (basis_list, used_market_fallback). The fallback mirrors the loader's
     warning behaviour when no paid price is available.
     """
-    items = parsed['items']
     basis = []
     used_fallback = False
-    for i, it in enumerate(items):
+    for i, it in enumerate(iter_items(parsed)):
         val = None
         if paid_overrides and i < len(paid_overrides):
             val = paid_overrides[i]
@@ -256,6 +363,7 @@ def commit_singles_import(form, parsed, paid_overrides=None):
     }
 
     try:
+        _lock_portfolio(s)
         db.session.execute(text(f"SET LOCAL search_path TO {s}, public"))
         acquisition_id = db.session.execute(
             text(f"""
@@ -273,8 +381,11 @@ def commit_singles_import(form, parsed, paid_overrides=None):
         ).scalar_one()
 
         # Singles carry their as-paid basis directly — no allocate_box_cost().
-        _insert_items(s, acquisition_id, parsed['items'], language,
+        _insert_items(s, acquisition_id, iter_items(parsed), language,
                       basis_fn=lambda it, i: basis[i])
+        _refresh_box_pl(s, acquisition_id)
+        _refresh_box_median(s, acquisition_id)
+        _apply_portfolio_delta(s, 1, acquisition_id)
 
         db.session.commit()
         return acquisition_id
@@ -285,7 +396,9 @@ def commit_singles_import(form, parsed, paid_overrides=None):
 
 # ── Card lifecycle writers (edit / sell / grade / bulk location) ─────────────
 # All mirror the import pattern: schema-qualified SQL, one transaction,
-# rollback on error. None recompute view metrics — the v_* views do that.
+# rollback on error. None recompute view metrics — the v_* views do that; those
+# that change a box's numbers re-derive its box_pl row and apply their
+# portfolio_totals delta before committing.
 
 # Columns the edit form may set, with a coercer for each (so blanks become NULL
 # and numbers/bools parse). Anything not in this map is ignored — no arbitrary
@@ -317,10 +430,16 @@ def update_item(item_id, fields):
         return int(item_id)
 
     try:
+        _lock_portfolio(s)
+        _apply_portfolio_delta(s, -1, item_id=item_id)
         db.session.execute(
             text(f"UPDATE {s}.item SET {', '.join(sets)} WHERE item_id = :id"),
             params,
         )
+        _refresh_box_pl(s, item_id=item_id)
+        if 'market_value' in params:
+            _refresh_box_median(s, item_id=item_id)
+        _apply_portfolio_delta(s, 1, item_id=item_id)
         db.session.commit()
         return int(item_id)
     except Exception:
@@ -349,6 +468,8 @@ def record_sale(item_id, form):
         'notes':            form.get('notes') or None,
     }
     try:
+        _lock_portfolio(s)
+        _apply_portfolio_delta(s, -1, item_id=item_id)
         db.session.execute(
             text(f"""
                 INSERT INTO {s}.sale
@@ -366,6 +487,8 @@ def record_sale(item_id, form):
             text(f"UPDATE {s}.item SET status = 'sold' WHERE item_id = :id"),
             {'id': int(item_id)},
         )
+        _refresh_box_pl(s, item_id=item_id)
+        _apply_portfolio_delta(s, 1, item_id=item_id)
         db.session.commit()
         return int(item_id)
     except Exception:
@@ -393,6 +516,8 @@ def set_grading(item_id, form):
         'status':        form.get('status') or 'inventory',
     }
     try:
+        _lock_portfolio(s)
+        _apply_portfolio_delta(s, -1, item_id=item_id)
         db.session.execute(
             text(f"""
                 UPDATE {s}.item SET
@@ -404,6 +529,8 @@ def set_grading(item_id, form):
             """),
             grading,
         )
+        _refresh_box_pl(s, item_id=item_id)
+        _apply_portfolio_delta(s, 1, item_id=item_id)
         db.session.commit()
         return int(item_id)
     except Exception:
@@ -412,7 +539,8 @@ def set_grading(item_id, form):
 
 
 def bulk_set_location(acquisition_id, location):
-    """Set storage_location for every item in an acquisition. One transaction."""
+    """Set storage_location for every item in an acquisition. One transaction.
+    Location is not part of the P&L, so box_pl is left alone."""
     s = _schema()
     try:
         db.session.execute(
@@ -435,10 +563,13 @@ def commit_append_import(form, parsed):
     language = form.get('language') or 'EN'
 
     try:
+        _lock_portfolio(s)
         db.session.execute(text(f"SET LOCAL search_path TO {s}, public"))
+        # Re-allocation moves every existing card's basis, so swap the whole box out.
+        _apply_portfolio_delta(s, -1, target_id)
 
         # New cards start at cost_basis 0; allocate_box_cost re-settles the whole box.
-        _insert_items(s, target_id, parsed['items'], language, basis_fn=lambda it, i: 0)
+        _insert_items(s, target_id, iter_items(parsed), language, basis_fn=lambda it, i: 0)
 
         if packs_now is not None:
             db.session.execute(
@@ -455,9 +586,260 @@ def commit_append_import(form, parsed):
             )
 
         db.session.execute(text(f"SELECT {s}.allocate_box_cost(:id)"), {'id': target_id})
+        _refresh_box_pl(s, target_id)
+        _refresh_box_median(s, target_id)
+        _apply_portfolio_delta(s, 1, target_id)
 
         db.session.commit()
         return target_id
     except Exception:
         db.session.rollback()
         raise
+
+
+def reconcile_portfolio(fix=True):
+    """Recompute portfolio_totals from scratch (v_portfolio's definition) and
+    compare with the stored counters. Returns {counter: (stored, actual)} for
+    each one that drifted (stored is None if the row is missing). With fix=True
+    the row is overwritten with the recomputed values. One transaction; the row
+    is locked first, so writers that commit meanwhile apply their deltas on top.
+    """
+    s = _schema()
+    cols = ', '.join(PORTFOLIO_COUNTERS)
+    try:
+        stored = db.session.execute(
+            text(f"SELECT {cols} FROM {s}.portfolio_totals FOR UPDATE"),
+        ).mappings().first()
+        actual = db.session.execute(
+            text(_portfolio_contribution_sql(s, 'all')),
+        ).mappings().first()
+        drift = {c: (stored[c] if stored else None, actual[c])
+                 for c in PORTFOLIO_COUNTERS
+                 if stored is None or stored[c] != actual[c]}
+        if fix:
+            db.session.execute(
+                text(f"""
+                    INSERT INTO {s}.portfolio_totals ({cols}, reconciled_at)
+                    VALUES ({', '.join(':' + c for c in PORTFOLIO_COUNTERS)}, now())
+                    ON CONFLICT (singleton) DO UPDATE SET
+                        {', '.join(f'{c} = EXCLUDED.{c}' for c in PORTFOLIO_COUNTERS)},
+                        reconciled_at = now()
+                """),
+                dict(actual),
+            )
+        db.session.commit()
+        return drift
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def _set_statement_timeout(timeout_ms):
+    """SET LOCAL statement_timeout for the current transaction (0 = no limit).
+    None keeps the connection's own (DB_STATEMENT_TIMEOUT_MS, 30 s by default)."""
+    if timeout_ms is not None:
+        db.session.execute(text(f"SET LOCAL statement_timeout = {int(timeout_ms)}"))
+
+
+def reallocate_costs(acquisition_ids=None, timeout_ms=0):
+    """Re-settle cost_basis for many acquisitions at once — e.g. after correcting
+    tax/shipping or refreshing market_value_at_open. One transaction.
+
+    Runs allocate_box_costs() (db/migrate_bulk_allocation.sql): allocate_box_cost()'s
+    math as a single set-based UPDATE instead of one call per box.
+    acquisition_ids=None means every acquisition except singles (as-paid basis).
+    The boxes' box_pl rows are refreshed and their portfolio_totals contribution
+    swapped around the update. Returns the number of items whose basis changed.
+
+    A whole-ledger run is two big single statements, so by default the
+    transaction lifts statement_timeout (timeout_ms=0); pass a limit in ms, or
+    None to keep the connection's.
+    """
+    s = _schema()
+    ids = None if acquisition_ids is None else [int(a) for a in acquisition_ids]
+    scope, params = ('all', {}) if ids is None else ('acquisitions', {'ids': ids})
+    try:
+        _set_statement_timeout(timeout_ms)
+        _lock_portfolio(s)
+        _portfolio_delta(s, -1, scope, params)
+        changed = db.session.execute(
+            text(f"SELECT {s}.allocate_box_costs(CAST(:ids AS bigint[]))"), {'ids': ids},
+        ).scalar_one()
+        db.session.execute(text(f"SELECT {s}.refresh_box_pl(CAST(:ids AS bigint[]))"), {'ids': ids})
+        _portfolio_delta(s, 1, scope, params)
+        db.session.commit()
+        return changed
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+# ── Bulk repricing from a fresh TCGplayer scan export ───────────────────────
+# Only cards still owned and ungraded are repriced: a slab's value is not the
+# raw market price, and a sold card keeps the value it had when it left.
+_REPRICE_STATUSES = _UNSOLD_STATUSES
+_REPRICE_COLUMNS = ('row_no', 'tcgplayer_product_id', 'name', 'set_code',
+                    'collector_number', 'variant', 'market_value')
+
+# Staged CSV rows and eligible items, both with the match keys normalised the
+# same way (blank -> '' so the joins stay hashable, name case-insensitive).
+_REPRICE_KEYS_SQL = """
+    stage AS (
+        SELECT row_no, market_value, tcgplayer_product_id,
+               lower(name) AS name_key, COALESCE(set_code, '') AS set_code,
+               COALESCE(collector_number, '') AS collector_number,
+               COALESCE(variant, '') AS variant
+        FROM pg_temp.reprice_stage
+    ),
+    items AS (
+        SELECT i.item_id, i.acquisition_id, i.market_value AS old_value,
+               i.tcgplayer_product_id,
+               lower(i.name) AS name_key, COALESCE(i.set_code, '') AS set_code,
+               COALESCE(i.collector_number, '') AS collector_number,
+               COALESCE(i.variant, '') AS variant
+        FROM {s}.item i
+        WHERE i.grader IS NULL AND i.status IN {statuses}
+    )"""
+
+
+def _reprice_match_sql(s):
+    """Each eligible item's new price: the staged row with its Product ID and
+    variant (the printing is part of the variant, so foil and normal copies of
+    one product price separately), else the row with its name / set / number /
+    variant. The last CSV row wins when a key repeats; unpriced rows are ignored."""
+    return f"""
+        CREATE TEMP TABLE reprice_match ON COMMIT DROP AS
+        WITH {_REPRICE_KEYS_SQL.format(s=s, statuses=_REPRICE_STATUSES)},
+        by_product AS (
+            SELECT DISTINCT ON (tcgplayer_product_id, variant)
+                   tcgplayer_product_id, variant, market_value
+            FROM stage
+            WHERE tcgplayer_product_id IS NOT NULL AND market_value IS NOT NULL
+            ORDER BY tcgplayer_product_id, variant, row_no DESC
+        ),
+        by_name AS (
+            SELECT DISTINCT ON (name_key, set_code, collector_number, variant)
+                   name_key, set_code, collector_number, variant, market_value
+            FROM stage
+            WHERE market_value IS NOT NULL
+            ORDER BY name_key, set_code, collector_number, variant, row_no DESC
+        )
+        SELECT it.item_id, it.acquisition_id, it.old_value,
+               COALESCE(p.market_value, n.market_value) AS new_value,
+               p.market_value IS NOT NULL               AS by_product_id
+        FROM items it
+        LEFT JOIN by_product p
+               ON p.tcgplayer_product_id = it.tcgplayer_product_id
+              AND p.variant = it.variant
+        LEFT JOIN by_name n
+               ON n.name_key = it.name_key AND n.set_code = it.set_code
+              AND n.collector_number = it.collector_number AND n.variant = it.variant
+        WHERE p.market_value IS NOT NULL OR n.market_value IS NOT NULL
+    """
+
+
+def _reprice_report_sql(s):
+    """Counts for the report; CSV rows are unmatched when no owned, ungraded
+    card has either of their keys."""
+    return f"""
+        WITH {_REPRICE_KEYS_SQL.format(s=s, statuses=_REPRICE_STATUSES)}
+        SELECT
+            (SELECT count(*) FROM stage)                                   AS csv_rows,
+            (SELECT count(*) FROM stage WHERE market_value IS NULL)        AS rows_unpriced,
+            (SELECT count(*) FROM stage st
+              WHERE st.market_value IS NOT NULL
+                AND NOT EXISTS (SELECT 1 FROM items it
+                                 WHERE it.tcgplayer_product_id = st.tcgplayer_product_id
+                                   AND it.variant = st.variant)
+                AND NOT EXISTS (SELECT 1 FROM items it
+                                 WHERE it.name_key = st.name_key AND it.set_code = st.set_code
+                                   AND it.collector_number = st.collector_number
+                                   AND it.variant = st.variant))           AS rows_unmatched,
+            (SELECT count(*) FROM pg_temp.reprice_match)                   AS items_matched,
+            (SELECT count(*) FROM pg_temp.reprice_match WHERE by_product_id) AS matched_by_product_id,
+            (SELECT count(*) FROM pg_temp.reprice_match
+              WHERE old_value IS DISTINCT FROM new_value)                  AS items_updated,
+            (SELECT COALESCE(SUM(old_value), 0) FROM pg_temp.reprice_match) AS value_before,
+            (SELECT COALESCE(SUM(new_value), 0) FROM pg_temp.reprice_match) AS value_after
+    """
+
+
+def reprice_from_csv(source, engine='rows', timeout_ms=None, apply=True):
+    """Parse a new TCGplayer scan export and reprice from it (see reprice_parsed).
+    `source` is anything parser.parse_csv() takes; rows are parsed with the import
+    rules (same set_code / collector_number / variant derivation)."""
+    parsed = csv_parser.parse_csv(source, expand=False, engine=engine)
+    return reprice_parsed(parsed, apply=apply, timeout_ms=timeout_ms)
+
+
+def reprice_parsed(parsed, apply=True, timeout_ms=None):
+    """Refresh item.market_value from a parsed scan export (compact "groups"
+    payload). One transaction.
+
+    The rows are COPYed into a temp table, matches are resolved in one statement
+    (see _reprice_match_sql) and applied in one joined UPDATE; the touched
+    boxes' box_pl / box_median rows and their portfolio_totals contribution are
+    refreshed before commit. apply=False is the preview: same matching and
+    report, then rolled back.
+
+    Returns a report dict: csv_rows, rows_unpriced, rows_unmatched, items_matched,
+    matched_by_product_id, matched_by_name, items_updated, value_before,
+    value_after, value_change (market value of the matched cards), acquisitions,
+    applied, and the parser's warnings.
+
+    timeout_ms sets statement_timeout for the transaction (0 = none); the
+    default None keeps the connection's, which suits the web page. The CLI
+    lifts it for large exports.
+    """
+    s = _schema()
+    rows = ((n, card['tcgplayer_product_id'], card['name'], card['set_code'],
+             card['collector_number'], card['variant'], card['market_value'])
+            for n, (card, _qty) in enumerate(parsed['groups']))
+    try:
+        _set_statement_timeout(timeout_ms)
+        if apply:
+            _lock_portfolio(s)
+        db.session.execute(text("""
+            CREATE TEMP TABLE reprice_stage (
+                row_no integer, tcgplayer_product_id text, name text, set_code text,
+                collector_number text, variant text, market_value numeric(12,2)
+            ) ON COMMIT DROP
+        """))
+        _copy_rows('pg_temp.reprice_stage', _REPRICE_COLUMNS, iter(rows))
+        db.session.execute(text("ANALYZE pg_temp.reprice_stage"))
+        db.session.execute(text(_reprice_match_sql(s)))
+
+        ids = db.session.execute(text("""
+            SELECT array_agg(DISTINCT acquisition_id) FROM pg_temp.reprice_match
+            WHERE old_value IS DISTINCT FROM new_value
+        """)).scalar_one() or []
+        report = dict(db.session.execute(text(_reprice_report_sql(s))).mappings().one())
+
+        if apply and ids:
+            params = {'ids': ids}
+            _portfolio_delta(s, -1, 'acquisitions', params)
+            db.session.execute(text(f"""
+                UPDATE {s}.item i SET market_value = m.new_value
+                FROM pg_temp.reprice_match m
+                WHERE i.item_id = m.item_id
+                  AND m.old_value IS DISTINCT FROM m.new_value
+            """))
+            db.session.execute(text(f"SELECT {s}.refresh_box_pl(CAST(:ids AS bigint[]))"), params)
+            db.session.execute(text(f"SELECT {s}.refresh_box_median(CAST(:ids AS bigint[]))"),
+                               params)
+            _portfolio_delta(s, 1, 'acquisitions', params)
+
+        if apply:
+            db.session.commit()
+        else:
+            db.session.rollback()   # preview: the temp tables go with it
+    except Exception:
+        db.session.rollback()
+        raise
+
+    report['matched_by_name'] = report['items_matched'] - report['matched_by_product_id']
+    report['value_change'] = report['value_after'] - report['value_before']
+    report['acquisitions'] = len(ids)
+    report['applied'] = apply
+    report['warnings'] = list(parsed.get('warnings') or [])
+    return report
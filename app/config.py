@@ -5,6 +5,42 @@ from dotenv import load_dotenv
 load_dotenv(Path(__file__).parent.parent /'app' / 'config' / '.env')
 
 
+def _flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ('1', 'true', 'yes')
+
+
+def _engine_options() -> dict:
+    """SQLAlchemy engine/pool options from the DB_* env vars.
+
+    pre-ping + recycle drop connections a restarted Postgres has killed instead
+    of handing them to a request; pool_timeout and connect_timeout make a worker
+    fail fast rather than hang when the DB is unreachable or the pool is drained.
+
+    statement_timeout is sent as a libpq startup option (`-c ...`), which
+    PgBouncer rejects. With DB_PGBOUNCER set it is left off, so set it on the
+    role instead (ALTER ROLE ... SET statement_timeout). The app itself only
+    ever issues SET LOCAL, which is safe under transaction pooling.
+    """
+    connect_args = {
+        'application_name': os.getenv('DB_APPLICATION_NAME', 'media_catalog'),
+        'connect_timeout':  int(os.getenv('DB_CONNECT_TIMEOUT', '5')),
+        'keepalives':       1,
+        'keepalives_idle':  int(os.getenv('DB_KEEPALIVES_IDLE', '30')),
+    }
+    timeout_ms = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', '30000'))
+    if timeout_ms and not _flag('DB_PGBOUNCER', 'false'):
+        connect_args['options'] = f'-c statement_timeout={timeout_ms}'
+
+    return {
+        'pool_size':     int(os.getenv('DB_POOL_SIZE', '5')),
+        'max_overflow':  int(os.getenv('DB_MAX_OVERFLOW', '5')),
+        'pool_timeout':  int(os.getenv('DB_POOL_TIMEOUT', '10')),
+        'pool_recycle':  int(os.getenv('DB_POOL_RECYCLE', '1800')),
+        'pool_pre_ping': _flag('DB_POOL_PRE_PING', 'true'),
+        'connect_args':  connect_args,
+    }
+
+
 class Config:
     DB_USER   = os.getenv('DB_USER')
     DB_PASS   = os.getenv('DB_PASS')
@@ -18,7 +54,61 @@ class Config:
     # Video game catalog lives in the same DB under its own schema.
     GAMES_SCHEMA = os.getenv('GAMES_SCHEMA', 'games')
 
+    # /locate: run each collection's lookup on its own pooled connection in a
+    # thread pool instead of one UNION ALL query (latency = slowest collection).
+    LOCATE_CONCURRENT  = _flag('LOCATE_CONCURRENT', 'false')
+    LOCATE_MAX_WORKERS = int(os.getenv('LOCATE_MAX_WORKERS', '3'))
+
+    # Home-page poster/cover cache (artwork.py). A background thread resolves
+    # tmdb_id/rawg_id -> image path once and stores it in artwork_cache.
+    TMDB_API_KEY = os.getenv('TMDB_API_KEY')
+    RAWG_API_KEY = os.getenv('RAWG_API_KEY')
+    TMDB_API_BASE = os.getenv('TMDB_API_BASE', 'https://api.themoviedb.org/3')
+    RAWG_API_BASE = os.getenv('RAWG_API_BASE', 'https://api.rawg.io/api')
+    ARTWORK_REFRESH          = _flag('ARTWORK_REFRESH', 'true')
+    ARTWORK_REFRESH_INTERVAL = int(os.getenv('ARTWORK_REFRESH_INTERVAL', '600'))
+    ARTWORK_BATCH_SIZE       = int(os.getenv('ARTWORK_BATCH_SIZE', '50'))
+    ARTWORK_RETRY_DAYS       = int(os.getenv('ARTWORK_RETRY_DAYS', '7'))
+
+    # /img image proxy (routes/images.py): fetch remote card scans and posters
+    # once, keep them content-addressed on local disk, serve small thumbnails.
+    # IMAGE_CACHE_DIR '' = <instance_path>/image_cache, which must be ours with
+    # mode 0700. IMAGE_CACHE_MAX_MB caps it on disk, oldest files evicted first
+    # (0 = no cap). Only raster images (jpeg/png/webp/gif) are stored.
+    IMAGE_PROXY        = _flag('IMAGE_PROXY', 'true')
+    IMAGE_CACHE_DIR    = os.getenv('IMAGE_CACHE_DIR', '')
+    IMAGE_CACHE_MAX_MB = int(os.getenv('IMAGE_CACHE_MAX_MB', '1024'))
+    IMAGE_PROXY_HOSTS  = frozenset(h.strip() for h in os.getenv(
+        'IMAGE_PROXY_HOSTS',
+        'tcgplayer-cdn.tcgplayer.com,product-images.tcgplayer.com,'
+        'image.tmdb.org,media.rawg.io',
+    ).split(',') if h.strip())
+
+    # Per-request DB timing (query_timing.py): statement count/time on flask.g,
+    # a slow-query log, and a Server-Timing response header.
+    QUERY_TIMING  = _flag('QUERY_TIMING', 'true')
+    SERVER_TIMING = _flag('SERVER_TIMING', 'true')
+    SLOW_QUERY_MS = int(os.getenv('SLOW_QUERY_MS', '200'))
+
+    # Card-ledger CSV import parser for the compact payloads the import and
+    # reprice pages stash: 'rows' streams row by row in constant memory;
+    # 'columnar' holds the file as columns. At 50k rows (bench/parser_bench.py)
+    # columnar is ~0-25% faster for ~1.5x the peak memory, so 'rows' stays the
+    # default. Both produce the same payload.
+    LEDGER_PARSE_ENGINE = os.getenv('LEDGER_PARSE_ENGINE', 'rows')
+
+    # /metrics (metrics.py): per-endpoint latency histograms, pool gauges and
+    # ledger import counters in Prometheus text format.
+    METRICS = _flag('METRICS', 'true')
+
+    # Startup: pickle the reflected table metadata keyed by a schema fingerprint,
+    # so workers skip full reflection until the tables change. Off by default
+    # (''); a relative path is under the instance folder, and the directory
+    # must be ours with mode 0700 (e.g. REFLECTION_CACHE_DIR=reflection_cache).
+    REFLECTION_CACHE_DIR = os.getenv('REFLECTION_CACHE_DIR', '')
+
     SQLALCHEMY_DATABASE_URI = (
         f'postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}/{DB_NAME}'
     )
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options()
     SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
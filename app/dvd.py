@@ -1,6 +1,11 @@
 from flask import Flask
 from config import Config
 from extensions import db
+from artwork import init_artwork
+from image_cache import init_images
+from query_timing import init_query_timing
+from metrics import init_metrics
+from card_ledger.cli import ledger_cli
 from models import reflect_models, reflect_game_models
 from routes.home import home_bp
 from routes.search import search_bp
@@ -10,17 +15,21 @@ from routes.titles import title_bp
 from routes.ledger import ledger_bp
 from routes.games import games_bp
 from routes.locate import locate_bp
+from routes.images import images_bp
+from routes.metrics import metrics_bp
 
 Titles    = None
 Dvds      = None
 Purchases = None
 
 
-def create_app(config=Config) -> Flask:
+def create_app(config=Config, artwork_client=None, image_fetcher=None) -> Flask:
     app = Flask(__name__)
     app.config.from_object(config)
 
     db.init_app(app)
+    init_query_timing(app)
+    init_metrics(app)
 
     with app.app_context():
         Titles, Dvds, Purchases = reflect_models()
@@ -41,6 +50,12 @@ def create_app(config=Config) -> Flask:
     app.register_blueprint(ledger_bp)
     app.register_blueprint(games_bp)
     app.register_blueprint(locate_bp)
+    app.register_blueprint(images_bp)
+    app.register_blueprint(metrics_bp)
+    app.cli.add_command(ledger_cli)
+
+    init_artwork(app, client=artwork_client)
+    init_images(app, fetcher=image_fetcher)
 
     return app
 
@@ -5,8 +5,9 @@ def _schema() -> str:
     return os.getenv('GAMES_SCHEMA', 'games')
 
 
-def base_query() -> str:
-    """Flattened title + copy + purchase rows, mirroring the DVD base_query()."""
+def base_query(where: str = '') -> str:
+    """Flattened title + copy + purchase rows, mirroring the DVD base_query().
+    `where` (trusted SQL over gt/gc/pi) filters the base tables before the join."""
     schema = _schema()
     return f"""
         SELECT
@@ -39,6 +40,7 @@ def base_query() -> str:
             ON gc.game_title_id = gt.id
         LEFT JOIN {schema}.purchase_info pi
             ON pi.game_copy_id = gc.id
+        {f'WHERE {where}' if where else ''}
     """
 
 
@@ -65,26 +67,49 @@ def stats_query(select: str, group_by: str = None, order_by: str = None) -> str:
 def location_count_query() -> str:
     return f"""
         SELECT COUNT(*) AS count
-        FROM ({base_query()}) AS sub
-        WHERE location_label ILIKE :loc
+        FROM ({base_query('gc.location_label ILIKE :loc')}) AS sub
+    """
+
+
+def cover_pool_query() -> str:
+    """Ids of every title with a rawg_id — the cover strip's sampling population."""
+    schema = _schema()
+    return f"""
+        SELECT gt.id
+        FROM {schema}.game_titles gt
+        WHERE gt.rawg_id IS NOT NULL AND gt.rawg_id <> ''
     """
 
 
 def random_covers_query() -> str:
-    """Distinct random titles that carry a rawg_id, for the home cover strip."""
+    """Cover rows for a pre-sampled list of game_title ids (:ids), in that order."""
     schema = _schema()
     return f"""
-        SELECT * FROM (
-            SELECT DISTINCT ON (gt.id)
-                gt.id     AS game_title_id,
-                gt.title,
-                gt.rawg_id
-            FROM {schema}.game_titles gt
-            WHERE gt.rawg_id IS NOT NULL AND gt.rawg_id <> ''
-            ORDER BY gt.id
-        ) AS deduped
-        ORDER BY random()
-        LIMIT 30
+        SELECT
+            gt.id     AS game_title_id,
+            gt.title,
+            gt.rawg_id
+        FROM unnest(CAST(:ids AS bigint[])) WITH ORDINALITY AS s(id, ord)
+        JOIN {schema}.game_titles gt ON gt.id = s.id
+        WHERE gt.rawg_id IS NOT NULL AND gt.rawg_id <> ''
+        ORDER BY s.ord
+    """
+
+
+def artwork_missing_query() -> str:
+    """RAWG ids with no cached cover yet (or a stale miss). The cache table itself
+    lives in the media schema — see queries.artwork_lookup_query()."""
+    schema = _schema()
+    media = os.getenv('DB_SCHEMA')
+    return f"""
+        SELECT DISTINCT 'rawg' AS source, gt.rawg_id AS external_id
+        FROM {schema}.game_titles gt
+        LEFT JOIN {media}.artwork_cache ac
+               ON ac.source = 'rawg' AND ac.external_id = gt.rawg_id
+        WHERE gt.rawg_id IS NOT NULL AND gt.rawg_id <> ''
+          AND (ac.source IS NULL
+               OR (ac.image_path IS NULL AND ac.fetched_at < now() - CAST(:retry AS interval)))
+        LIMIT :limit
     """
 
 
@@ -96,3 +121,63 @@ def cost_by_store_query() -> str:
         GROUP BY store
         ORDER BY store
     """
+
+
+def dashboard_stats_query() -> str:
+    """Every games-home aggregate, read from the precomputed dashboard_stats
+    table (mirrors the DVD dashboard_stats_query())."""
+    return f"""
+        SELECT
+            dimension,
+            label,
+            n_rows,
+            n_values,
+            CASE WHEN cost_n > 0 THEN cost_sum END AS sum
+        FROM {_schema()}.dashboard_stats
+        WHERE n_rows > 0
+          AND (dimension <> 'store' OR n_purchases > 0)
+        ORDER BY dimension,
+                 CASE WHEN dimension = 'platform' THEN -n_values END,
+                 label
+    """
+
+
+def dashboard_contribution_query(where: str = '') -> str:
+    """Dashboard stat contributions of the base_query() rows matching `where`,
+    one (dimension, label) bucket per row: 'total', or a platform / genre /
+    store value. Mirrors the DVD dashboard_contribution_query()."""
+    return f"""
+        SELECT
+            CASE WHEN GROUPING(platform) = 0 THEN 'platform'
+                 WHEN GROUPING(genre)    = 0 THEN 'genre'
+                 WHEN GROUPING(store)    = 0 THEN 'store'
+                 ELSE 'total' END                       AS dimension,
+            COALESCE(platform, genre, store)::text       AS label,
+            COUNT(*)                                     AS n_rows,
+            COUNT(COALESCE(platform, genre, store))      AS n_values,
+            COUNT(pi_id)                                 AS n_purchases,
+            COALESCE(SUM(cost), 0)                       AS cost_sum,
+            COUNT(cost)                                  AS cost_n
+        FROM ({base_query()}) AS sub
+        WHERE {where or '1=1'}
+        GROUP BY GROUPING SETS ((), (platform), (genre), (store))
+    """
+
+
+def dashboard_stats_delta_query() -> str:
+    """Add (:sign = 1) or remove (:sign = -1) one copy's contribution to the
+    dashboard_stats table, inside the caller's transaction."""
+    return f"""
+        INSERT INTO {_schema()}.dashboard_stats AS ds
+            (dimension, label, n_rows, n_values, n_purchases, cost_sum, cost_n)
+        SELECT dimension, label,
+               :sign * n_rows, :sign * n_values, :sign * n_purchases,
+               :sign * cost_sum, :sign * cost_n
+        FROM ({dashboard_contribution_query('game_copy_id = :copy_id')}) AS c
+        ON CONFLICT (dimension, label) DO UPDATE SET
+            n_rows      = ds.n_rows      + EXCLUDED.n_rows,
+            n_values    = ds.n_values    + EXCLUDED.n_values,
+            n_purchases = ds.n_purchases + EXCLUDED.n_purchases,
+            cost_sum    = ds.cost_sum    + EXCLUDED.cost_sum,
+            cost_n      = ds.cost_n      + EXCLUDED.cost_n
+    """
@@ -0,0 +1,228 @@
+"""
+Content-addressed local cache for remote images (card scans, posters, covers).
+
+Each remote URL is fetched once. The bytes are stored under their SHA-256
+digest, and resized copies for every configured size are generated at the
+same time, so later requests are a single file read. routes/images.py serves
+the results with a strong ETag (the digest) and a long Cache-Control.
+
+Layout under the cache root:
+    urls/<sha256(url)>             -> "<digest> <content-type>" for that URL
+    orig/<dd>/<digest>             -> original bytes
+    thumb/<dd>/<digest>_<size>.jpg -> resized JPEG (only if Pillow is installed)
+
+Only raster formats are stored (RASTER_TYPES): an SVG is script-capable and
+would be served from our own origin. The cache is capped at max_bytes; prune()
+evicts the oldest files first.
+
+The fetch backend is swappable: anything with
+`fetch(url) -> (bytes, content_type)` can be passed as `create_app(image_fetcher=...)`.
+A local stand-in can then serve fixtures in tests.
+"""
+import hashlib
+import io
+import os
+import tempfile
+import time
+from urllib.parse import urljoin, urlsplit
+
+import requests
+
+from private_dir import ensure_private_dir
+
+try:  # Thumbnails are optional; without Pillow the original is served.
+    from PIL import Image
+except ImportError:  # pragma: no cover
+    Image = None
+
+MAX_IMAGE_BYTES = 10 * 1024 * 1024
+MAX_REDIRECTS = 3
+PRUNE_INTERVAL = 5 * 60   # sweep the cache at most this often per process
+
+# Content types stored and served. Anything else (SVG, HTML...) is refused.
+RASTER_TYPES = frozenset({'image/jpeg', 'image/png', 'image/webp', 'image/gif'})
+
+# Size name -> max width in px. Roughly 2x the CSS box so tiles stay sharp on
+# high-DPI screens: the 110px poster/thumb strips and the ~150-200px card grid.
+IMAGE_SIZES = {
+    'strip': 220,
+    'grid':  400,
+}
+
+
+class RequestsFetcher:
+    """Default fetch backend: a pooled requests.Session with a timeout and size cap.
+
+    Redirects are followed by hand (at most MAX_REDIRECTS), and every hop must
+    stay on `hosts`. Otherwise an allowed host that redirects would let the
+    proxy fetch any URL."""
+
+    def __init__(self, hosts, timeout: float = 10.0):
+        self.session = requests.Session()
+        self.hosts = frozenset(hosts)
+        self.timeout = timeout
+
+    def _check(self, url: str):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or parts.hostname not in self.hosts:
+            raise ValueError(f'redirect to a host outside IMAGE_PROXY_HOSTS: {url}')
+
+    def fetch(self, url: str):
+        for _ in range(MAX_REDIRECTS + 1):
+            self._check(url)
+            res = self.session.get(url, timeout=self.timeout, stream=True,
+                                   allow_redirects=False)
+            if not res.is_redirect:
+                break
+            url = urljoin(url, res.headers['Location'])
+            res.close()
+        else:
+            raise ValueError(f'more than {MAX_REDIRECTS} redirects: {url}')
+        res.raise_for_status()
+        ctype = res.headers.get('Content-Type', '').split(';')[0].strip()
+        data = res.raw.read(MAX_IMAGE_BYTES + 1, decode_content=True)
+        if len(data) > MAX_IMAGE_BYTES:
+            raise ValueError(f'image larger than {MAX_IMAGE_BYTES} bytes: {url}')
+        return data, ctype
+
+
+def _atomic_write(path: str, data: bytes):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+
+
+class ImageCache:
+    """Fetch-once, serve-many store. `sizes` maps a size name to a max width;
+    `max_bytes` caps the files on disk (0 = no cap)."""
+
+    def __init__(self, root: str, fetcher, sizes: dict, max_bytes: int = 0):
+        self.root = root
+        self.fetcher = fetcher
+        self.sizes = sizes
+        self.max_bytes = max_bytes
+        self._last_prune = 0.0
+
+    # -- paths ---------------------------------------------------------------
+    def _url_path(self, url: str) -> str:
+        return os.path.join(self.root, 'urls', hashlib.sha256(url.encode()).hexdigest())
+
+    def _orig_path(self, digest: str) -> str:
+        return os.path.join(self.root, 'orig', digest[:2], digest)
+
+    def _thumb_path(self, digest: str, size: str) -> str:
+        return os.path.join(self.root, 'thumb', digest[:2], f'{digest}_{size}.jpg')
+
+    # -- lookups -------------------------------------------------------------
+    def lookup(self, url: str):
+        """(digest, content_type) already stored for `url`, or (None, None)."""
+        try:
+            with open(self._url_path(url)) as fh:
+                digest, _, ctype = fh.read().strip().partition(' ')
+        except FileNotFoundError:
+            return None, None
+        return (digest or None), (ctype or None)
+
+    def ensure(self, url: str):
+        """(digest, content_type) for `url`, fetching it and generating every
+        size on first use."""
+        digest, ctype = self.lookup(url)
+        if digest and ctype in RASTER_TYPES and os.path.exists(self._orig_path(digest)):
+            return digest, ctype
+
+        data, ctype = self.fetcher.fetch(url)
+        if ctype not in RASTER_TYPES:
+            raise ValueError(f'not a raster image ({ctype}): {url}')
+        self.prune()
+        digest = hashlib.sha256(data).hexdigest()
+        if not os.path.exists(self._orig_path(digest)):
+            _atomic_write(self._orig_path(digest), data)
+            for size in self.sizes:
+                self._make_thumb(digest, size, data)
+        _atomic_write(self._url_path(url), f'{digest} {ctype}'.encode())
+        return digest, ctype
+
+    def path_for(self, digest: str, ctype: str, size: str):
+        """(file path, mimetype) to serve for a digest at a size. Falls back to
+        the original if no thumbnail exists (Pillow missing or unreadable image)."""
+        if size in self.sizes:
+            thumb = self._thumb_path(digest, size)
+            if os.path.exists(thumb) or self._make_thumb(digest, size):
+                return thumb, 'image/jpeg'
+        return self._orig_path(digest), ctype
+
+    def _make_thumb(self, digest: str, size: str, data: bytes = None) -> bool:
+        if Image is None:
+            return False
+        try:
+            if data is None:
+                with open(self._orig_path(digest), 'rb') as fh:
+                    data = fh.read()
+            # Any decoder failure (truncated file, DecompressionBombError, ...)
+            # just means no thumbnail; the original is still served.
+            with Image.open(io.BytesIO(data)) as im:
+                im = im.convert('RGB')
+                width = self.sizes[size]
+                if im.width > width:
+                    im = im.resize((width, round(im.height * width / im.width)),
+                                   Image.LANCZOS)
+                out = io.BytesIO()
+                im.save(out, 'JPEG', quality=82, optimize=True, progressive=True)
+        except Exception:
+            return False
+        _atomic_write(self._thumb_path(digest, size), out.getvalue())
+        return True
+
+    def prune(self, force: bool = False):
+        """Evict the oldest files (originals, thumbnails, url entries) until the
+        cache is under max_bytes. A url whose bytes were evicted is simply fetched
+        again. Throttled to once per PRUNE_INTERVAL per process."""
+        now = time.time()
+        if not self.max_bytes or (not force and now - self._last_prune < PRUNE_INTERVAL):
+            return
+        self._last_prune = now
+
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+def init_images(app, fetcher=None):
+    """Attach the ImageCache to `app` (app.extensions['image_cache']).
+
+    IMAGE_CACHE_DIR defaults to <instance_path>/image_cache. With IMAGE_PROXY off,
+    or a directory that is not ours with mode 0700, no cache is built and the
+    proxy stays off (templates hot-link, /img answers 404)."""
+    app.extensions['image_cache'] = None
+    if not app.config.get('IMAGE_PROXY'):
+        return None
+    root = app.config.get('IMAGE_CACHE_DIR') or os.path.join(app.instance_path, 'image_cache')
+    if not ensure_private_dir(root):
+        app.logger.warning('image proxy disabled: %s must be owned by uid %s with mode 0700',
+                           root, os.getuid())
+        app.config['IMAGE_PROXY'] = False
+        return None
+    cache = ImageCache(root, fetcher or RequestsFetcher(app.config['IMAGE_PROXY_HOSTS']),
+                       IMAGE_SIZES, app.config.get('IMAGE_CACHE_MAX_MB', 0) * 1024 * 1024)
+    app.extensions['image_cache'] = cache
+    return cache
@@ -0,0 +1,149 @@
+"""
+Minimal Prometheus text-format metrics, standard library only.
+
+`init_metrics(app)` times every request into a per-endpoint latency histogram;
+routes/metrics.py serves the registry at /metrics together with connection-pool
+gauges read at scrape time. Other code records events through the module-level
+metrics below (e.g. the ledger import counters).
+
+Values live in process memory. Under a multi-worker server each worker reports
+its own numbers; add a `worker` label in the scrape config, or run one worker
+per port if aggregated totals matter.
+"""
+import threading
+import time
+
+from flask import g, request
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+IMPORT_SIZE_BUCKETS = (10, 50, 100, 500, 1000, 5000, 10000, 50000)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _labels(names, values, extra=()) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)] + list(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter:
+    def __init__(self, name: str, doc: str, labelnames=()):
+        self.name, self.doc, self.labelnames = name, doc, tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> list:
+        lines = [f'# HELP {self.name} {self.doc}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_labels(self.labelnames, labels)} {value}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, doc: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name, self.doc, self.labelnames = name, doc, tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}   # labels -> [per-bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    def render(self) -> list:
+        lines = [f'# HELP {self.name} {self.doc}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for labels, row in sorted(self._values.items()):
+                for bound, n in zip(self.buckets, row):
+                    le = _labels(self.labelnames, labels, [f'le="{bound}"'])
+                    lines.append(f'{self.name}_bucket{le} {n}')
+                inf = _labels(self.labelnames, labels, ['le="+Inf"'])
+                lines.append(f'{self.name}_bucket{inf} {row[-1]}')
+                lines.append(f'{self.name}_sum{_labels(self.labelnames, labels)} {row[-2]}')
+                lines.append(f'{self.name}_count{_labels(self.labelnames, labels)} {row[-1]}')
+        return lines
+
+
+class Gauge:
+    """Read at scrape time: `fn()` returns a list of (label values tuple, value)."""
+
+    def __init__(self, name: str, doc: str, fn, labelnames=()):
+        self.name, self.doc, self.fn, self.labelnames = name, doc, fn, tuple(labelnames)
+
+    def render(self) -> list:
+        lines = [f'# HELP {self.name} {self.doc}', f'# TYPE {self.name} gauge']
+        for labels, value in self.fn():
+            lines.append(f'{self.name}{_labels(self.labelnames, labels)} {value}')
+        return lines
+
+
+# ── Registry ────────────────────────────────────────────────────────────────
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Request latency by endpoint.',
+    ('endpoint', 'method', 'status'))
+REQUEST_DB_TIME = Histogram(
+    'http_request_db_seconds', 'Time spent in SQL per request, by endpoint.',
+    ('endpoint',))
+IMPORTS = Counter(
+    'ledger_imports_total', 'Committed card-ledger imports.', ('mode', 'intake'))
+IMPORT_CARDS = Counter(
+    'ledger_import_cards_total', 'Cards written by committed imports.', ('mode', 'intake'))
+IMPORT_SIZE = Histogram(
+    'ledger_import_cards', 'Cards per committed import.', ('mode',),
+    buckets=IMPORT_SIZE_BUCKETS)
+IMPORT_DURATION = Histogram(
+    'ledger_import_duration_seconds', 'Time to write a committed import.', ('mode',))
+
+REGISTRY = [REQUEST_LATENCY, REQUEST_DB_TIME, IMPORTS, IMPORT_CARDS, IMPORT_SIZE,
+            IMPORT_DURATION]
+
+
+def observe_import(mode: str, intake: str, n_cards: int, seconds: float):
+    IMPORTS.inc(mode, intake)
+    IMPORT_CARDS.inc(mode, intake, amount=n_cards)
+    IMPORT_SIZE.observe(n_cards, mode)
+    IMPORT_DURATION.observe(seconds, mode)
+
+
+def render(extra=()) -> str:
+    lines = []
+    for metric in list(REGISTRY) + list(extra):
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+# ── Request hooks ───────────────────────────────────────────────────────────
+def _start_timer():
+    g.metrics_start = time.perf_counter()
+
+
+def _record(response):
+    start = g.pop('metrics_start', None)
+    endpoint = request.endpoint or 'unmatched'
+    if start is not None and endpoint != 'metrics.metrics':
+        REQUEST_LATENCY.observe(time.perf_counter() - start,
+                                endpoint, request.method, response.status_code)
+        if 'db_time' in g:   # set by query_timing when QUERY_TIMING is on
+            REQUEST_DB_TIME.observe(g.db_time, endpoint)
+    return response
+
+
+def init_metrics(app):
+    if not app.config.get('METRICS', True):
+        return
+    app.before_request(_start_timer)
+    app.after_request(_record)
@@ -1,15 +1,111 @@
 import os
+import pickle
+import stat
+import tempfile
+
+from flask import current_app
+from sqlalchemy import MetaData, text
 from extensions import db
+from private_dir import ensure_private_dir
+
+# One cheap catalog query that changes whenever a reflected table's columns,
+# types, defaults or constraints do. Keys the on-disk reflection snapshot.
+_FINGERPRINT_SQL = """
+    SELECT md5(
+        coalesce((
+            SELECT string_agg(
+                       c.relname || '.' || a.attname || ':' || format_type(a.atttypid, a.atttypmod)
+                       || ':' || a.attnotnull || ':' || coalesce(pg_get_expr(d.adbin, d.adrelid), ''),
+                       ',' ORDER BY c.relname, a.attnum)
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+            LEFT JOIN pg_attrdef d ON d.adrelid = c.oid AND d.adnum = a.attnum
+            WHERE n.nspname = :schema AND c.relname = ANY(:tables)
+        ), '')
+        || '|' ||
+        coalesce((
+            SELECT string_agg(c.relname || '.' || con.conname || ':' || pg_get_constraintdef(con.oid),
+                              ',' ORDER BY c.relname, con.conname)
+            FROM pg_constraint con
+            JOIN pg_class c ON c.oid = con.conrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = :schema AND c.relname = ANY(:tables)
+        ), '')
+    )
+"""
+
+
+def _load_snapshot(path: str):
+    """Unpickle a snapshot only if the file is ours and nobody else can write
+    it. Raises OSError for a missing or foreign file."""
+    fd = os.open(path, os.O_RDONLY | os.O_NOFOLLOW)
+    with os.fdopen(fd, 'rb') as fh:
+        st = os.fstat(fd)
+        if st.st_uid != os.getuid() or stat.S_IMODE(st.st_mode) & 0o077:
+            raise PermissionError(f'reflection snapshot {path} is not private')
+        return pickle.load(fh)
+
+
+def _reflect(schema: str, tables: tuple):
+    """
+    Load `tables` of `schema` into db.metadata.
+
+    With REFLECTION_CACHE_DIR set (it is off by default), the reflected MetaData
+    is pickled under a fingerprint of those tables' catalog entries. A worker
+    whose fingerprint matches an existing snapshot loads it instead of running
+    full reflection (one catalog query instead of dozens). Any ALTER on the
+    tables changes the fingerprint and triggers a fresh reflect.
+
+    Unpickling runs code, so the cache is only used when its directory is ours
+    with mode 0700 and the snapshot is ours and private. A relative
+    REFLECTION_CACHE_DIR lives under the app's instance folder.
+    """
+    cache_dir = current_app.config.get('REFLECTION_CACHE_DIR')
+    if cache_dir:
+        cache_dir = os.path.join(current_app.instance_path, cache_dir)
+        if not ensure_private_dir(cache_dir):
+            current_app.logger.warning('reflection cache disabled: %s must be owned by '
+                                       'uid %s with mode 0700', cache_dir, os.getuid())
+            cache_dir = None
+    if not cache_dir:
+        db.metadata.reflect(bind=db.engine, schema=schema, only=list(tables))
+        return
+
+    with db.engine.connect() as conn:
+        fingerprint = conn.execute(text(_FINGERPRINT_SQL),
+                                   {'schema': schema, 'tables': list(tables)}).scalar()
+    path = os.path.join(cache_dir, f'{schema}-{fingerprint}.pkl')
+
+    try:
+        snapshot = _load_snapshot(path)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError,
+            ImportError, ValueError):
+        snapshot = MetaData()
+        snapshot.reflect(bind=db.engine, schema=schema, only=list(tables))
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as fh:
+            pickle.dump(snapshot, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        # Older snapshots of this schema can never match again.
+        for name in os.listdir(cache_dir):
+            if name.startswith(f'{schema}-') and name.endswith('.pkl') \
+                    and os.path.join(cache_dir, name) != path:
+                os.remove(os.path.join(cache_dir, name))
+
+    for table in snapshot.sorted_tables:
+        if table.key not in db.metadata.tables:
+            table.to_metadata(db.metadata)
 
 
 def reflect_models():
     """
-    Reflect tables from the live DB and define ORM classes.
+    Reflect tables from the live DB (or the reflection cache) and define ORM classes.
     Must be called inside an app context after db.init_app(app).
     Returns (Titles, Dvds, Purchases).
     """
     schema = os.getenv('DB_SCHEMA')
-    db.metadata.reflect(bind=db.engine, schema=schema)
+    _reflect(schema, ('media_titles', 'dvd_items', 'purchase_info'))
 
     class Titles(db.Model):
         __table__ = db.metadata.tables[f'{schema}.media_titles']
@@ -25,12 +121,12 @@ def reflect_models():
 
 def reflect_game_models():
     """
-    Reflect the video-game catalog tables from the live DB.
+    Reflect the video-game catalog tables from the live DB (or the reflection cache).
     Must be called inside an app context after db.init_app(app).
     Returns (GameTitles, GameCopies, GamePurchases).
     """
     schema = os.getenv('GAMES_SCHEMA', 'games')
-    db.metadata.reflect(bind=db.engine, schema=schema)
+    _reflect(schema, ('game_titles', 'game_copies', 'purchase_info'))
 
     class GameTitles(db.Model):
         __table__ = db.metadata.tables[f'{schema}.game_titles']
@@ -41,4 +137,4 @@ def reflect_game_models():
     class GamePurchases(db.Model):
         __table__ = db.metadata.tables[f'{schema}.purchase_info']
 
-    return GameTitles, GameCopies, GamePurchases
\ No newline at end of file
+    return GameTitles, GameCopies, GamePurchases
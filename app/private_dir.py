@@ -0,0 +1,22 @@
+"""Private on-disk directories for the app's caches.
+
+Anything the app reads back from disk (upload previews, the reflection snapshot,
+proxied images) lives in a directory only this process's user can write. A
+shared location such as /tmp lets another local user create the directory first
+or plant files in it, so a directory that fails the check is not used.
+"""
+import os
+import stat
+
+
+def ensure_private_dir(path: str) -> bool:
+    """Create `path` with mode 0700 if it is missing. Return True only if it is
+    a real directory (not a symlink) owned by the current uid with mode 0700."""
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return (stat.S_ISDIR(st.st_mode)
+            and st.st_uid == os.getuid()
+            and stat.S_IMODE(st.st_mode) == 0o700)
@@ -1,7 +1,12 @@
 import os
 
 
-def base_query() -> str:
+def base_query(where: str = '') -> str:
+    """
+    The three-table title/disk/purchase join. `where` (trusted SQL over the
+    mt/di/pi aliases) filters the base tables before the join, so indexed
+    predicates are applied up front instead of to a wrapped subquery.
+    """
     schema = os.getenv('DB_SCHEMA')
     return f"""
         SELECT
@@ -34,9 +39,30 @@ def base_query() -> str:
             ON di.media_title_id = mt.id
         LEFT JOIN {schema}.purchase_info pi
             ON di.id = pi.dvd_item_id
+        {f'WHERE {where}' if where else ''}
     """
 
 
+def name_match_filter() -> str:
+    """
+    base_query() predicate: disks whose title or season name contains :name.
+    Written as a UNION of one lookup per column so each half is served by its
+    pg_trgm GIN index (db/migrate_search_trgm.sql); an OR across the joined
+    tables would fall back to scanning the whole join.
+    """
+    schema = os.getenv('DB_SCHEMA')
+    return f"""di.id IN (
+            SELECT d.id
+            FROM {schema}.dvd_items d
+            JOIN {schema}.media_titles t ON t.id = d.media_title_id
+            WHERE t.title ILIKE :name
+            UNION
+            SELECT d.id
+            FROM {schema}.dvd_items d
+            WHERE d.season_name ILIKE :name
+        )"""
+
+
 def recent_dvds_query() -> str:
     return (
         base_query()
@@ -61,20 +87,49 @@ def stats_query(select: str, group_by: str = None, order_by: str=None) -> str:
 def location_count_query() -> str:
     return f"""
         SELECT COUNT(*) AS count
-        FROM ({base_query()}) AS sub
-        WHERE location_label ILIKE :loc
+        FROM ({base_query('di.location_label ILIKE :loc')}) AS sub
+    """
+
+
+def location_lookup_query() -> str:
+    """
+    Everything stored at a shelf/bin label, across movies, cards and games, in
+    one query over the v_locations view (db/migrate_locations.sql). Bind :loc
+    (ILIKE pattern) and :collections (list of 'movies' / 'cards' / 'games').
+    """
+    schema = os.getenv('DB_SCHEMA')
+    return f"""
+        SELECT collection, row_id, parent_id, label, title,
+               detail_1, detail_2, detail_3
+        FROM {schema}.v_locations
+        WHERE label ILIKE :loc
+          AND collection = ANY(:collections)
+        ORDER BY collection, title, row_id
+    """
+
+
+def poster_pool_query() -> str:
+    """Ids of every media_title with a tmdb_id on the title or any of its disks —
+    the population the home poster strip samples from (see sampling.py)."""
+    schema = os.getenv('DB_SCHEMA')
+    return f"""
+        SELECT DISTINCT mt.id
+        FROM {schema}.media_titles mt
+        JOIN {schema}.dvd_items di ON di.media_title_id = mt.id
+        WHERE COALESCE(di.tmdb_id, mt.tmdb_id) IS NOT NULL
     """
 
 
 def random_posters_query() -> str:
     """
-    Returns a distinct set of random titles that have a tmdb_id,
-    deduplicated at the media_title level so we don't repeat the
-    same movie for multiple disk editions.
+    Poster rows for a pre-sampled list of media_title ids (:ids), one per title
+    so we don't repeat the same movie for multiple disk editions, in the order
+    given. The sampling itself happens in sampling.py, so this is a primary-key
+    lookup of ~30 rows rather than a sort over the whole catalog.
     """
     schema = os.getenv('DB_SCHEMA')
     return f"""
-        SELECT * FROM (
+        SELECT deduped.* FROM (
         SELECT DISTINCT ON (mt.id)
             mt.id       AS media_title_id,
             mt.title,
@@ -82,11 +137,61 @@ def random_posters_query() -> str:
             COALESCE(di.tmdb_id, mt.tmdb_id) AS tmdb_id
         FROM {schema}.media_titles mt
         JOIN {schema}.dvd_items di ON di.media_title_id = mt.id
-        WHERE COALESCE(di.tmdb_id, mt.tmdb_id) IS NOT NULL
+        WHERE mt.id = ANY(:ids)
+          AND COALESCE(di.tmdb_id, mt.tmdb_id) IS NOT NULL
         ORDER BY mt.id
-        ) as deduped
-        ORDER BY random()
-        LIMIT 30
+        ) AS deduped
+        JOIN unnest(CAST(:ids AS bigint[])) WITH ORDINALITY AS s(id, ord)
+          ON s.id = deduped.media_title_id
+        ORDER BY s.ord
+    """
+
+
+def artwork_lookup_query() -> str:
+    """
+    Cached poster paths for a batch of (source, external_id) keys, passed as
+    two parallel arrays (:sources, :ids) so the lookup is one primary-key join.
+    """
+    schema = os.getenv('DB_SCHEMA')
+    return f"""
+        SELECT ac.source, ac.external_id, ac.image_path
+        FROM unnest(CAST(:sources AS text[]), CAST(:ids AS text[]))
+             AS k(source, external_id)
+        JOIN {schema}.artwork_cache ac USING (source, external_id)
+    """
+
+
+def artwork_missing_query() -> str:
+    """
+    TMDB ids in the catalog with no artwork_cache row yet, or whose last lookup
+    found no poster more than :retry ago. Feeds the background refresher.
+    """
+    schema = os.getenv('DB_SCHEMA')
+    return f"""
+        SELECT DISTINCT
+            CASE WHEN mt.type = 'movie' THEN 'tmdb_movie' ELSE 'tmdb_tv' END AS source,
+            COALESCE(di.tmdb_id, mt.tmdb_id)::text                            AS external_id
+        FROM {schema}.media_titles mt
+        JOIN {schema}.dvd_items di ON di.media_title_id = mt.id
+        LEFT JOIN {schema}.artwork_cache ac
+               ON ac.source = CASE WHEN mt.type = 'movie' THEN 'tmdb_movie' ELSE 'tmdb_tv' END
+              AND ac.external_id = COALESCE(di.tmdb_id, mt.tmdb_id)::text
+        WHERE COALESCE(di.tmdb_id, mt.tmdb_id) IS NOT NULL
+          AND (ac.source IS NULL
+               OR (ac.image_path IS NULL AND ac.fetched_at < now() - CAST(:retry AS interval)))
+        LIMIT :limit
+    """
+
+
+def artwork_upsert_query() -> str:
+    """Record one lookup result; a NULL image_path caches "no poster" until :retry."""
+    schema = os.getenv('DB_SCHEMA')
+    return f"""
+        INSERT INTO {schema}.artwork_cache (source, external_id, image_path, fetched_at)
+        VALUES (:source, :external_id, :image_path, now())
+        ON CONFLICT (source, external_id) DO UPDATE
+           SET image_path = EXCLUDED.image_path,
+               fetched_at = EXCLUDED.fetched_at
     """
 
 
@@ -97,4 +202,75 @@ def cost_by_store_query() -> str:
         FROM {schema}.purchase_info
         GROUP BY store
         ORDER BY store
-    """
\ No newline at end of file
+    """
+
+
+def dashboard_stats_query() -> str:
+    """
+    Every home-page aggregate, read from the precomputed dashboard_stats table
+    (one row per breakdown label, see db/migrate_dashboard_stats.sql). The table
+    is kept current by the add-media form handlers, so this is a small indexed
+    read instead of a GROUP BY over the whole collection.
+    """
+    schema = os.getenv('DB_SCHEMA')
+    return f"""
+        SELECT
+            dimension,
+            label,
+            n_rows,
+            n_values,
+            CASE WHEN cost_n > 0 THEN cost_sum END AS sum
+        FROM {schema}.dashboard_stats
+        WHERE n_rows > 0
+          AND (dimension <> 'store' OR n_purchases > 0)
+        ORDER BY dimension, label
+    """
+
+
+def dashboard_contribution_query(where: str = '') -> str:
+    """
+    Dashboard stat contributions of the base_query() rows matching `where`
+    (trusted SQL, e.g. "dvd_id = :dvd_id"), in one GROUPING SETS scan. Each row
+    is one (dimension, label) bucket: 'total', or a type / genre / disk_type /
+    store value. Used to backfill dashboard_stats and to apply per-disk deltas.
+    """
+    return f"""
+        SELECT
+            CASE WHEN GROUPING(type)      = 0 THEN 'type'
+                 WHEN GROUPING(genre)     = 0 THEN 'genre'
+                 WHEN GROUPING(disk_type) = 0 THEN 'disk_type'
+                 WHEN GROUPING(store)     = 0 THEN 'store'
+                 ELSE 'total' END                        AS dimension,
+            COALESCE(type, genre, disk_type, store)::text AS label,
+            COUNT(*)                                      AS n_rows,
+            COUNT(COALESCE(type, genre, disk_type, store)) AS n_values,
+            COUNT(pi_id)                                  AS n_purchases,
+            COALESCE(SUM(cost), 0)                        AS cost_sum,
+            COUNT(cost)                                   AS cost_n
+        FROM ({base_query()}) AS sub
+        WHERE {where or '1=1'}
+        GROUP BY GROUPING SETS ((), (type), (genre), (disk_type), (store))
+    """
+
+
+def dashboard_stats_delta_query() -> str:
+    """
+    Add (:sign = 1) or remove (:sign = -1) one disk's contribution to the
+    dashboard_stats table. Run with sign -1 before changing a disk's rows and
+    sign 1 after, inside the same transaction as the write.
+    """
+    schema = os.getenv('DB_SCHEMA')
+    return f"""
+        INSERT INTO {schema}.dashboard_stats AS ds
+            (dimension, label, n_rows, n_values, n_purchases, cost_sum, cost_n)
+        SELECT dimension, label,
+               :sign * n_rows, :sign * n_values, :sign * n_purchases,
+               :sign * cost_sum, :sign * cost_n
+        FROM ({dashboard_contribution_query('dvd_id = :dvd_id')}) AS c
+        ON CONFLICT (dimension, label) DO UPDATE SET
+            n_rows      = ds.n_rows      + EXCLUDED.n_rows,
+            n_values    = ds.n_values    + EXCLUDED.n_values,
+            n_purchases = ds.n_purchases + EXCLUDED.n_purchases,
+            cost_sum    = ds.cost_sum    + EXCLUDED.cost_sum,
+            cost_n      = ds.cost_n      + EXCLUDED.cost_n
+    """
@@ -0,0 +1,107 @@
+"""
+Per-request database timing, shared by every blueprint.
+
+SQLAlchemy cursor events time every statement on the app's engine, whichever
+`_fetch` helper, service function or ORM flush issued it. Within a request the
+totals accumulate on `flask.g`:
+
+    g.db_queries  number of statements
+    g.db_time     total seconds spent in the driver
+    g.db_slowest  the SLOWEST_KEPT slowest (seconds, sql) pairs, slowest first
+
+Statements over SLOW_QUERY_MS are logged with their parameters. With
+SERVER_TIMING on, each response carries a `Server-Timing` header, e.g.
+    Server-Timing: db;dur=41.7;desc="9 queries", app;dur=63.2
+so the browser dev tools show how much of a page is the database.
+
+Statements run outside a request (the artwork refresher, /locate's worker
+threads) are still slow-logged but are not added to any request's totals.
+"""
+import heapq
+import time
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+from extensions import db
+
+SLOWEST_KEPT = 3
+_PARAM_LOG_CHARS = 500
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, not the connection: a statement that
+    # raises never reaches the after hook, and its context dies with it.
+    if context is not None:
+        context._query_start = time.perf_counter()
+
+
+def _make_after(app):
+    slow_s = app.config.get('SLOW_QUERY_MS', 200) / 1000.0
+
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, '_query_start', None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+
+        if elapsed >= slow_s:
+            params = repr(parameters)
+            if len(params) > _PARAM_LOG_CHARS:
+                params = params[:_PARAM_LOG_CHARS] + '...'
+            app.logger.warning('slow query (%.1f ms)%s: %s | params=%s',
+                               elapsed * 1000,
+                               f' [{request.endpoint}]' if has_request_context() else '',
+                               ' '.join(statement.split()), params)
+
+        if has_request_context() and 'db_queries' in g:
+            g.db_queries += 1
+            g.db_time += elapsed
+            entry = (elapsed, statement)
+            if len(g.db_slowest) < SLOWEST_KEPT:
+                heapq.heappush(g.db_slowest, entry)
+            elif elapsed > g.db_slowest[0][0]:
+                heapq.heapreplace(g.db_slowest, entry)
+
+    return _after_cursor_execute
+
+
+def _start_request():
+    g.request_start = time.perf_counter()
+    g.db_queries = 0
+    g.db_time = 0.0
+    g.db_slowest = []
+
+
+def request_db_stats() -> dict:
+    """The current request's totals so far (for templates, logs or /metrics)."""
+    return {
+        'queries': g.get('db_queries', 0),
+        'db_ms': round(g.get('db_time', 0.0) * 1000, 1),
+        'slowest': [(round(s * 1000, 1), ' '.join(sql.split()))
+                    for s, sql in sorted(g.get('db_slowest', []), reverse=True)],
+    }
+
+
+def _server_timing(response):
+    if 'request_start' not in g:
+        return response
+    total_ms = (time.perf_counter() - g.request_start) * 1000
+    response.headers.add(
+        'Server-Timing',
+        f'db;dur={g.db_time * 1000:.1f};desc="{g.db_queries} queries", app;dur={total_ms:.1f}',
+    )
+    return response
+
+
+def init_query_timing(app):
+    """Hook the engine's cursor events and the request lifecycle for `app`."""
+    if not app.config.get('QUERY_TIMING', True):
+        return
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _make_after(app))
+    app.before_request(_start_request)
+    if app.config.get('SERVER_TIMING', True):
+        app.after_request(_server_timing)
@@ -4,14 +4,16 @@ from flask import (
 )
 from sqlalchemy import text
 from extensions import db
+from artwork import with_artwork
+import sampling
 from utilities import clean_int
 from games.queries import (
     base_query,
     recent_games_query,
-    stats_query,
+    dashboard_stats_query,
+    dashboard_stats_delta_query,
     location_count_query,
     random_covers_query,
-    cost_by_store_query,
 )
 
 games_bp = Blueprint('games', __name__, url_prefix='/games')
@@ -25,6 +27,37 @@ def _get_models():
     return current_app.GameTitles, current_app.GameCopies, current_app.GamePurchases
 
 
+def _apply_stats_delta(copy_id, sign: int):
+    """Add (sign=1) or remove (sign=-1) one copy's rows from dashboard_stats,
+    in the caller's transaction (mirrors routes/media.py)."""
+    if copy_id is None:
+        return
+    db.session.flush()
+    db.session.execute(text(dashboard_stats_delta_query()),
+                       {'copy_id': copy_id, 'sign': sign})
+
+
+def _split_dashboard(rows) -> dict:
+    """Fan the dashboard_stats rows back out into the lists games/home.html
+    renders."""
+    stats = {'counts': [], 'platforms': [], 'genres': [],
+             'cost_plats': [], 'cost_stores': []}
+    for r in rows:
+        dim, label = r['dimension'], r['label']
+        if dim == 'platform':
+            stats['platforms'].append({'platform': label, 'count': r['n_values']})
+            stats['cost_plats'].append({'platform': label, 'sum': r['sum']})
+        elif dim == 'genre':
+            stats['genres'].append({'genre': label, 'count': r['n_values']})
+        elif dim == 'store':
+            stats['cost_stores'].append({'store': label, 'sum': r['sum']})
+        elif dim == 'total':
+            stats['counts'].append({'count': r['n_rows']})
+    if not stats['counts']:
+        stats['counts'].append({'count': 0})
+    return stats
+
+
 # ── Add-game form handlers (mirror routes/media.py) ─────────────────────────
 def _handle_title_form():
     GameTitles, _, _ = _get_models()
@@ -39,7 +72,10 @@ def _handle_title_form():
         complete_collection = request.form.get('complete_collection') == 'on',
     )
     db.session.add(record)
+    # No dashboard_stats delta: a title has no base_query() rows until it has
+    # a copy, and the copy form applies that delta.
     db.session.commit()
+    sampling.covers.invalidate()
     return record.id
 
 
@@ -55,14 +91,19 @@ def _handle_copy_form():
         notes          = request.form.get('notes'),
     )
     db.session.add(record)
+    db.session.flush()
+    _apply_stats_delta(record.id, 1)
     db.session.commit()
     return record.id
 
 
 def _handle_purchase_form():
     _, _, GamePurchases = _get_models()
+    game_copy_id = clean_int(request.form.get('game_copy_id'))
+    # Swap the copy's whole contribution out and back in around the insert.
+    _apply_stats_delta(game_copy_id, -1)
     record = GamePurchases(
-        game_copy_id  = clean_int(request.form.get('game_copy_id')),
+        game_copy_id  = game_copy_id,
         purchase_date = request.form.get('purchase_date'),
         cost          = clean_int(request.form.get('cost')),
         store         = request.form.get('store'),
@@ -70,6 +111,7 @@ def _handle_purchase_form():
         notes         = request.form.get('notes'),
     )
     db.session.add(record)
+    _apply_stats_delta(game_copy_id, 1)
     db.session.commit()
     return record.id
 
@@ -77,32 +119,24 @@ def _handle_purchase_form():
 # ── Routes ──────────────────────────────────────────────────────────────────
 @games_bp.route('/')
 def home():
-    games       = _fetch(recent_games_query())
-    counts      = _fetch(stats_query('COUNT(*) AS count'))
-    platforms   = _fetch(stats_query('platform, COUNT(platform) AS count',
-                                      group_by='platform', order_by='count DESC'))
-    genres      = _fetch(stats_query('genre, COUNT(genre) AS count',
-                                      group_by='genre', order_by='genre, count'))
-    cost_plats  = _fetch(stats_query('platform, SUM(cost) AS sum', group_by='platform'))
-    cost_stores = _fetch(cost_by_store_query())
-    covers      = _fetch(random_covers_query())
+    games  = _fetch(recent_games_query())
+    stats  = _split_dashboard(_fetch(dashboard_stats_query()))
+    covers = with_artwork(_fetch(random_covers_query(), {'ids': sampling.covers.sample(30)}),
+                          'rawg_id', lambda r: 'rawg')
 
     return render_template(
         'games/home.html',
         games=games,
-        counts=counts,
-        platforms=platforms,
-        genres=genres,
-        cost_plats=cost_plats,
-        cost_stores=cost_stores,
         covers=covers,
-        rawg_api_key=os.getenv('RAWG_API_KEY'),
+        **stats,
     )
 
 
 # Whitelisted sort options (label -> trusted ORDER BY). Keys are validated, so
 # the clause is never user-controlled SQL.
 SEARCH_SORTS = {
+    'relevance':     ('Best match',        'GREATEST(word_similarity(:q, title), '
+                                           'word_similarity(:q, franchise)) DESC, title ASC'),
     'title':         ('Title (A–Z)',       'title ASC'),
     'acquired_desc': ('Newest acquired',   'purchase_date DESC NULLS LAST, title ASC'),
     'acquired_asc':  ('Oldest acquired',   'purchase_date ASC NULLS LAST, title ASC'),
@@ -111,23 +145,30 @@ SEARCH_SORTS = {
     'platform':      ('Platform',          'platform ASC, title ASC'),
     'year_desc':     ('Newest release',    'release_year DESC NULLS LAST, title ASC'),
 }
-DEFAULT_SORT = 'title'
+DEFAULT_SORT = 'relevance'
+FALLBACK_SORT = 'title'   # what 'relevance' means when there is no name to rank by
 
 
 def _build_search_sql(name: str, location: str, sort: str = DEFAULT_SORT) -> tuple:
-    sql = f"SELECT * FROM ({base_query()}) AS sub WHERE 1=1"
+    """Filter the base tables (trigram-indexed ILIKE) before the join, then sort."""
+    where = []
     params = {}
 
     if name:
-        sql += " AND (title ILIKE :name OR franchise ILIKE :name)"
+        where.append("(gt.title ILIKE :name OR gt.franchise ILIKE :name)")
         params['name'] = f"%{name}%"
+        params['q'] = name
 
     if location:
-        sql += " AND location_label ILIKE :loc"
+        where.append("gc.location_label ILIKE :loc")
         params['loc'] = f"%{location}%"
 
-    order_by = SEARCH_SORTS.get(sort, SEARCH_SORTS[DEFAULT_SORT])[1]
-    sql += f" ORDER BY {order_by}"
+    if sort not in SEARCH_SORTS:
+        sort = DEFAULT_SORT
+    if sort == 'relevance' and not name:
+        sort = FALLBACK_SORT
+    sql = f"SELECT * FROM ({base_query(' AND '.join(where))}) AS sub"
+    sql += f" ORDER BY {SEARCH_SORTS[sort][1]}"
     return sql, params
 
 
@@ -1,11 +1,11 @@
-import os
 from flask import Blueprint, render_template
 from sqlalchemy import text
 from extensions import db
+from artwork import with_artwork
+import sampling
 from queries import (
     recent_dvds_query,
-    stats_query,
-    cost_by_store_query,
+    dashboard_stats_query,
     random_posters_query,
 )
 
@@ -16,26 +16,42 @@ def _fetch(sql: str, params: dict = None):
     return db.session.execute(text(sql), params or {}).mappings().all()
 
 
+def _split_dashboard(rows) -> dict:
+    """Fan the dashboard_stats rows back out into the per-breakdown lists the
+    template expects (same keys as the old stats_query() calls, so home.html
+    is unchanged)."""
+    stats = {'counts': [], 'types': [], 'genres': [],
+             'costs': [], 'cost_disks': [], 'cost_stores': []}
+    for r in rows:
+        dim, label = r['dimension'], r['label']
+        if dim == 'type':
+            stats['types'].append({'type': label, 'count': r['n_values']})
+            stats['costs'].append({'type': label, 'sum': r['sum']})
+        elif dim == 'genre':
+            stats['genres'].append({'genre': label, 'count': r['n_values']})
+        elif dim == 'disk_type':
+            stats['cost_disks'].append({'disk_type': label, 'sum': r['sum']})
+        elif dim == 'store':
+            stats['cost_stores'].append({'store': label, 'sum': r['sum']})
+        elif dim == 'total':
+            stats['counts'].append({'count': r['n_rows']})
+    if not stats['counts']:
+        stats['counts'].append({'count': 0})
+    return stats
+
+
 @home_bp.route('/')
 def home():
-    dvds        = _fetch(recent_dvds_query())
-    counts      = _fetch(stats_query('COUNT(*) AS count'))
-    types       = _fetch(stats_query('type, COUNT(type) AS count', group_by='type'))
-    genres      = _fetch(stats_query('genre, COUNT(genre) AS count', group_by='genre', order_by='genre, count'))
-    costs       = _fetch(stats_query('type, SUM(cost) AS sum', group_by='type'))
-    cost_disks  = _fetch(stats_query('disk_type, SUM(cost) AS sum', group_by='disk_type'))
-    cost_stores = _fetch(cost_by_store_query())
-    posters     = _fetch(random_posters_query())
+    dvds    = _fetch(recent_dvds_query())
+    stats   = _split_dashboard(_fetch(dashboard_stats_query()))
+    posters = with_artwork(
+        _fetch(random_posters_query(), {'ids': sampling.posters.sample(30)}), 'tmdb_id',
+        lambda r: 'tmdb_movie' if r['type'] == 'movie' else 'tmdb_tv',
+    )
 
     return render_template(
         'home.html',
         dvds=dvds,
-        counts=counts,
-        types=types,
-        genres=genres,
-        costs=costs,
-        cost_disks=cost_disks,
-        cost_stores=cost_stores,
         posters=posters,
-        tmdb_api_key=os.getenv('TMDB_API_KEY'),
-    )
\ No newline at end of file
+        **stats,
+    )
@@ -0,0 +1,72 @@
+"""Local image proxy for card scans, posters and covers.
+
+/img/<size>?u=<remote url> fetches the remote image once into the
+content-addressed ImageCache (image_cache.py) and serves a pre-generated
+thumbnail from local disk. The ETag is the content digest plus the size, and
+Cache-Control is long-lived, so a revisit costs a 304 or nothing at all.
+
+Only hosts listed in IMAGE_PROXY_HOSTS are proxied, redirects included, so the
+route cannot be used to fetch arbitrary URLs from inside the network. Templates go through the
+`proxied_image(url, size)` global. It returns the URL untouched when the proxy
+is off or the host is not listed.
+"""
+from urllib.parse import urlsplit
+
+from flask import (
+    Blueprint, abort, current_app, redirect, request, send_file, url_for,
+)
+
+images_bp = Blueprint('images', __name__)
+
+CACHE_MAX_AGE = 30 * 24 * 60 * 60   # a stored URL's bytes never change
+
+
+def _cache():
+    return current_app.extensions['image_cache']
+
+
+def _allowed(url: str) -> bool:
+    parts = urlsplit(url)
+    return (parts.scheme in ('http', 'https')
+            and parts.hostname in current_app.config['IMAGE_PROXY_HOSTS'])
+
+
+@images_bp.app_template_global()
+def proxied_image(url, size='grid'):
+    if not url or not current_app.config.get('IMAGE_PROXY') or not _allowed(url):
+        return url
+    return url_for('images.proxy', size=size, u=url)
+
+
+@images_bp.route('/img/<size>')
+def proxy(size):
+    cache = _cache()
+    if not current_app.config.get('IMAGE_PROXY') or cache is None:
+        abort(404)
+    url = request.args.get('u', '')
+    if size not in cache.sizes and size != 'orig':
+        abort(404)
+    if not _allowed(url):
+        abort(400)
+
+    # Revalidation: answer from the url index alone, without touching the image.
+    digest, ctype = cache.lookup(url)
+    if digest and f'{digest}-{size}' in request.if_none_match:
+        return '', 304, {'ETag': f'"{digest}-{size}"',
+                         'Cache-Control': f'public, max-age={CACHE_MAX_AGE}, immutable'}
+
+    try:
+        digest, ctype = cache.ensure(url)
+    except Exception:
+        # Upstream down or not an image: let the browser try the original.
+        current_app.logger.warning('image proxy fetch failed for %s', url, exc_info=True)
+        return redirect(url)
+
+    path, mimetype = cache.path_for(digest, ctype, size)
+    resp = send_file(path, mimetype=mimetype, etag=f'{digest}-{size}',
+                     max_age=CACHE_MAX_AGE, conditional=True)
+    resp.cache_control.public = True
+    resp.cache_control.immutable = True
+    # Only raster types reach here; never let a browser sniff them into HTML.
+    resp.headers['X-Content-Type-Options'] = 'nosniff'
+    return resp
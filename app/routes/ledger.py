@@ -1,11 +1,22 @@
+import base64
+import csv
+import json
 import os
 import re
 import secrets
-import tempfile
+import time
+from datetime import date
+from decimal import Decimal, InvalidOperation
 
-from flask import Blueprint, render_template, request, redirect, url_for, abort
+from flask import (
+    Blueprint, render_template, stream_template, request, redirect, url_for, abort,
+    current_app,
+)
 from sqlalchemy import text
 from extensions import db
+import metrics
+import sampling
+from private_dir import ensure_private_dir
 from card_ledger import parser as csv_parser
 from card_ledger import service
 from card_ledger.parser import SEALED_TYPES
@@ -24,9 +35,10 @@ from card_ledger.queries import (
     grade_candidates_query,
     grade_candidate_one_query,
     grading_history_for_query,
+    grading_history_batch_query,
 )
 
-# Grading-candidate tuning constants — mirror v_grade_candidates in the schema.
+# Grading-candidate tuning constants — mirror v_grade_candidates (db/migrate_box_median.sql).
 GRADE_VALUE_THRESHOLD = 25     # raw market value at/above which an NM card is a grade candidate
 ASSUMED_GRADING_COST  = 30     # used for est_upside when a slab estimate is entered
 REVIEW_MULTIPLE       = 3      # review tier: value >= this * the box median
@@ -44,50 +56,220 @@ def _fetch_one(sql: str, params: dict = None):
     return db.session.execute(text(sql), params or {}).mappings().first()
 
 
-# Whitelisted sort options (label shown in the UI -> trusted ORDER BY clause).
-# Keys are validated against this dict, so the value is never user-controlled SQL.
+# Whitelisted sort options: key -> (label shown in the UI, trusted sort keys).
+# Keys are validated against this dict, so the SQL is never user-controlled.
+# Each sort key is (column, direction, SQL type, NULL sentinel): NULLs are
+# coalesced to the sentinel so they still sort last *and* compare cleanly in
+# the keyset predicate. item_id is always appended as the unique tiebreaker,
+# in the direction of the last key. Every sort but 'relevance' is served in
+# order by an index from db/migrate_collection_sort_indexes.sql, so a page
+# reads about COLLECTION_PAGE_SIZE rows wherever it starts.
 COLLECTION_SORTS = {
-    'name':         ('Name (A–Z)',        'name ASC'),
-    'value_desc':   ('Value (high→low)',  'market_value DESC NULLS LAST'),
-    'value_asc':    ('Value (low→high)',  'market_value ASC NULLS LAST'),
-    'acquired_desc':('Newest acquired',   'purchase_date DESC NULLS LAST, name ASC'),
-    'acquired_asc': ('Oldest acquired',   'purchase_date ASC NULLS LAST, name ASC'),
-    'basis_desc':   ('Cost basis (high→low)', 'total_basis DESC NULLS LAST'),
-    'status':       ('Status',            'status ASC, name ASC'),
+    'relevance':    ('Best match',        (('rank', 'DESC', 'numeric', None),
+                                           ('name', 'ASC', 'text', None))),
+    'name':         ('Name (A–Z)',        (('name', 'ASC', 'text', None),)),
+    'value_desc':   ('Value (high→low)',  (('market_value', 'DESC', 'numeric', "'-Infinity'"),)),
+    'value_asc':    ('Value (low→high)',  (('market_value', 'ASC', 'numeric', "'Infinity'"),)),
+    'acquired_desc':('Newest acquired',   (('purchase_date', 'DESC', 'date', None),
+                                           ('name', 'ASC', 'text', None))),
+    'acquired_asc': ('Oldest acquired',   (('purchase_date', 'ASC', 'date', None),
+                                           ('name', 'ASC', 'text', None))),
+    'basis_desc':   ('Cost basis (high→low)', (('total_basis', 'DESC', 'numeric', "'-Infinity'"),)),
+    'status':       ('Status',            (('status', 'ASC', 'text', None),
+                                           ('name', 'ASC', 'text', None))),
+}
+DEFAULT_SORT = 'relevance'
+FALLBACK_SORT = 'name'   # what 'relevance' means when there is no name to rank by
+
+# Trigram rank for the 'relevance' sort, rounded so it round-trips through a cursor.
+# No index can order by it: a relevance page sorts the whole (trigram-filtered)
+# match set, so its cost tracks the number of matches, not the page size.
+RELEVANCE_RANK = ("ROUND(GREATEST(word_similarity(:q, i.name), word_similarity(:q, i.set_code), "
+                  "word_similarity(:q, i.collector_number))::numeric, 4)")
+
+# Sort key -> the base-table expression it compares on, over item_ledger_base's
+# i/a aliases (the ones the filters and indexes use), not v_item_ledger's copies.
+_KEY_EXPR = {
+    'rank':          RELEVANCE_RANK,
+    'name':          'i.name',
+    'market_value':  'i.market_value',
+    'purchase_date': 'a.purchase_date',
+    'total_basis':   '(i.cost_basis + i.grading_total)',
+    'status':        'i.status',
+    'item_id':       'i.item_id',
 }
-DEFAULT_SORT = 'name'
 
+COLLECTION_PAGE_SIZE = 120   # cards per keyset page
+BOX_PAGE_SIZE = 50           # acquisitions per ledger-home page
+_BOX_CURSOR_RE = re.compile(r'^(\d{4}-\d{2}-\d{2})\.(\d{1,19})$')
+COLLECTION_STREAM_BATCH = 500  # rows per server-side cursor fetch in ?stream=1 mode
+
+
+def _sort_keys(sort: str) -> tuple:
+    keys = COLLECTION_SORTS[sort][1]
+    return keys + (('item_id', keys[-1][1], 'bigint', None),)
+
+
+def _key_sql(key, value_sql: str = None) -> str:
+    """The comparable SQL for one sort key: its base-table expression, or (when
+    value_sql is given) a bound cursor value, coalesced/cast the same way. The
+    expression form is exactly what the sort indexes are built on."""
+    col, _, typ, sentinel = key
+    expr = f"CAST({value_sql} AS {typ})" if value_sql else _KEY_EXPR[col]
+    return f"COALESCE({expr}, {sentinel}::{typ})" if sentinel else expr
+
+
+def _keyset_predicate(keys) -> str:
+    """Rows strictly after the cursor in ORDER BY order. When every key runs
+    the same way this is one row comparison, (k0, k1, ...) > (c0, c1, ...),
+    which a btree range-scans directly. Mixed directions expand to
+    (k0 > c0) OR (k0 = c0 AND k1 > c1) OR ..., led by k0 >= c0 so the index
+    on the first key still bounds the scan."""
+    cols = [_key_sql(k) for k in keys]
+    vals = [_key_sql(k, f':k{i}') for i, k in enumerate(keys)]
+    ops = ['<' if k[1] == 'DESC' else '>' for k in keys]
+    if len(set(ops)) == 1:
+        return f"({', '.join(cols)}) {ops[0]} ({', '.join(vals)})"
+
+    ors = []
+    for i in range(len(keys)):
+        ands = [f"{cols[j]} = {vals[j]}" for j in range(i)]
+        ands.append(f"{cols[i]} {ops[i]} {vals[i]}")
+        ors.append('(' + ' AND '.join(ands) + ')')
+    return f"{cols[0]} {ops[0]}= {vals[0]} AND ({' OR '.join(ors)})"
+
+
+def _cursor_value(value, typ: str):
+    """One decoded cursor value as the Python type of its SQL key; raises
+    ValueError/TypeError/InvalidOperation for anything that would not cast."""
+    if value is None:
+        return None
+    if typ == 'text':
+        if not isinstance(value, str):
+            raise TypeError(typ)
+        return value
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise TypeError(typ)
+    if typ == 'bigint':
+        value = int(value)
+        if not -2**63 <= value < 2**63:
+            raise ValueError(typ)
+        return value
+    if typ == 'numeric':
+        value = Decimal(str(value))
+        if not value.is_finite():
+            raise ValueError(typ)
+        return value
+    if typ == 'date':
+        return date.fromisoformat(value)
+    raise ValueError(typ)
+
+
+def _box_cursor(token: str):
+    """(purchase_date, acquisition_id) from a ledger-home ?after= token, or None
+    if it is malformed, an impossible date, or an id outside bigint."""
+    m = _BOX_CURSOR_RE.match(token or '')
+    if not m:
+        return None
+    try:
+        after_date = date.fromisoformat(m.group(1))
+    except ValueError:
+        return None
+    after_id = int(m.group(2))
+    if after_id >= 2**63:
+        return None
+    return after_date, after_id
+
+
+def _encode_cursor(row, sort: str) -> str:
+    """Opaque ?after= token: the last row's sort-key values, JSON + base64."""
+    values = [row[k[0]] for k in _sort_keys(sort)]
+    raw = json.dumps([v if v is None or isinstance(v, (int, str)) else str(v)
+                      for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
 
-def _build_collection_sql(name: str, game: str, status: str, sort: str) -> tuple:
-    """Filter the per-item ledger by name (ILIKE), game, and status, then sort."""
-    sql = f"SELECT * FROM ({item_ledger_base()}) AS sub WHERE 1=1"
+
+def _decode_cursor(token: str, sort: str):
+    """Cursor values for `sort`, or None if the token is missing/garbled/stale.
+    Each value is checked against its key's SQL type here, so a tampered token
+    falls back to the first page instead of failing the cast in Postgres."""
+    if not token:
+        return None
+    keys = _sort_keys(sort)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+        if not isinstance(values, list) or len(values) != len(keys):
+            return None
+        return [_cursor_value(v, k[2]) for v, k in zip(values, keys)]
+    except (ValueError, TypeError, InvalidOperation):
+        return None
+
+
+def _build_collection_sql(name: str, game: str, status: str, sort: str,
+                          after: list = None, limit: int = None) -> tuple:
+    """Filter the per-item ledger by name (trigram-indexed ILIKE), game, and
+    status on the base tables before the join, then sort. With `after` (decoded
+    cursor values) and `limit`, returns one keyset page."""
+    where = []
     params = {}
 
     if name:
-        sql += " AND (name ILIKE :name OR set_code ILIKE :name OR collector_number ILIKE :name)"
+        where.append("(i.name ILIKE :name OR i.set_code ILIKE :name "
+                     "OR i.collector_number ILIKE :name)")
         params['name'] = f"%{name}%"
+        params['q'] = name
     if game:
-        sql += " AND game = :game"
+        where.append("COALESCE(i.game, a.game) = :game")
         params['game'] = game
     if status:
-        sql += " AND status = :status"
+        where.append("i.status = :status")
         params['status'] = status
 
-    order_by = COLLECTION_SORTS.get(sort, COLLECTION_SORTS[DEFAULT_SORT])[1]
-    sql += f" ORDER BY {order_by}"
+    if sort not in COLLECTION_SORTS:
+        sort = DEFAULT_SORT
+    if sort == 'relevance' and not name:
+        sort = FALLBACK_SORT
+    keys = _sort_keys(sort)
+
+    # Cursor predicate and ORDER BY on the same level as the base filters, over
+    # the indexed expressions, so the scan starts at the cursor and stops at LIMIT.
+    if after is not None:
+        where.append(f"({_keyset_predicate(keys)})")
+        params.update({f'k{i}': v for i, v in enumerate(after)})
+
+    extra = f"{RELEVANCE_RANK} AS rank" if sort == 'relevance' else ''
+    sql = item_ledger_base(' AND '.join(where), extra_columns=extra)
+    sql += " ORDER BY " + ', '.join(f"{_key_sql(k)} {k[1]}" for k in keys)
+    if limit:
+        sql += " LIMIT :limit"
+        params['limit'] = limit
     return sql, params
 
 
 @ledger_bp.route('/')
 def home():
     portfolio = _fetch_one(portfolio_query())
-    boxes     = _fetch(box_pl_query())
-    posters   = _fetch(ledger_posters_query())
+    posters   = _fetch(ledger_posters_query(), {'ids': sampling.cards.sample(24)})
+
+    # Keyset page of the precomputed box_pl rows; ?after=<purchase_date>.<id>
+    # is the last row shown, so page N costs the same as page 1.
+    params = {'limit': BOX_PAGE_SIZE + 1}
+    cursor = _box_cursor(request.args.get('after', ''))
+    if cursor:
+        params.update(after_date=cursor[0], after_id=cursor[1])
+    boxes = _fetch(box_pl_query(after=bool(cursor)), params)
+    next_cursor = None
+    if len(boxes) > BOX_PAGE_SIZE:
+        boxes = boxes[:BOX_PAGE_SIZE]
+        next_cursor = f"{boxes[-1]['purchase_date'].isoformat()}.{boxes[-1]['acquisition_id']}"
+
     return render_template(
         'ledger/home.html',
         portfolio=portfolio,
         boxes=boxes,
         posters=posters,
+        next_cursor=next_cursor,
+        is_first_page=cursor is None,
     )
 
 
@@ -100,13 +282,12 @@ def collection():
     if sort_query not in COLLECTION_SORTS:
         sort_query = DEFAULT_SORT
     view         = request.args.get('view', 'grid')
+    streamed     = request.args.get('stream') == '1'
+    # The builder may swap 'relevance' for its fallback; cursors use the real sort.
+    effective_sort = (FALLBACK_SORT if sort_query == 'relevance' and not name_query
+                      else sort_query)
 
-    sql, params = _build_collection_sql(name_query, game_query, status_query, sort_query)
-    cards = _fetch(sql, params)
-
-    return render_template(
-        'ledger/collection.html',
-        cards=cards,
+    ctx = dict(
         games=_fetch(games_query()),
         statuses=_fetch(statuses_query()),
         name_query=name_query,
@@ -115,8 +296,32 @@ def collection():
         sort_query=sort_query,
         sort_options=COLLECTION_SORTS,
         view=view if view in ('grid', 'table') else 'grid',
+        streamed=streamed,
+        next_cursor=None,
+        is_first_page=True,
     )
 
+    if streamed:
+        # Whole result, rendered as it arrives: a server-side cursor feeds the
+        # template in batches, so memory stays flat however big the match is.
+        sql, params = _build_collection_sql(name_query, game_query, status_query, sort_query)
+        cards = db.session.execute(
+            text(sql), params,
+            execution_options={'stream_results': True, 'yield_per': COLLECTION_STREAM_BATCH},
+        ).mappings()
+        return stream_template('ledger/collection.html', cards=cards, **ctx)
+
+    after = _decode_cursor(request.args.get('after', ''), effective_sort)
+    sql, params = _build_collection_sql(name_query, game_query, status_query, sort_query,
+                                        after=after, limit=COLLECTION_PAGE_SIZE + 1)
+    cards = _fetch(sql, params)
+    if len(cards) > COLLECTION_PAGE_SIZE:
+        cards = cards[:COLLECTION_PAGE_SIZE]
+        ctx['next_cursor'] = _encode_cursor(cards[-1], effective_sort)
+    ctx['is_first_page'] = after is None
+
+    return render_template('ledger/collection.html', cards=cards, **ctx)
+
 
 def _grade_reason(cand) -> str:
     """Tier-aware 'why', built from the v_grade_candidates row."""
@@ -188,12 +393,20 @@ def box_set_location(acquisition_id):
 @ledger_bp.route('/grading')
 def grading():
     candidates = _fetch(grade_candidates_query())
+
+    # Grading history for every grade-tier card in one query, grouped by name.
+    names = sorted({c['name'].lower() for c in candidates if c['tier'] == 'grade'})
+    history = {}
+    if names:
+        for h in _fetch(grading_history_batch_query(), {'names': names}):
+            history.setdefault(h['name_key'], []).append(h)
+
     grade, review = [], []
     for c in candidates:
         d = dict(c)
         d['reason'] = _grade_reason(c)
         if c['tier'] == 'grade':
-            d['history'] = _fetch(grading_history_for_query(), {'name': c['name']})
+            d['history'] = history.get(c['name'].lower(), [])
             grade.append(d)
         elif c['tier'] == 'review':
             review.append(d)
@@ -205,37 +418,117 @@ def grading():
 PRODUCT_TYPES = ['sealed_box', 'sealed_pack', 'bundle', 'bulk_lot']
 GAMES = ['weiss', 'pokemon', 'mtg', 'other']
 
-_UPLOAD_DIR = os.path.join(tempfile.gettempdir(), 'ledger_uploads')
-
-
-def _stash_upload(raw_bytes) -> str:
-    """Persist the uploaded CSV to a temp file so the confirm step re-parses the
-    exact same bytes the preview was built from. Returns an opaque token."""
-    os.makedirs(_UPLOAD_DIR, exist_ok=True)
+_UPLOAD_TTL = 60 * 60                  # seconds a preview stays confirmable
+_UPLOAD_MAX_BYTES = 64 * 1024 * 1024   # cap on cached previews; oldest evicted first
+_PRUNE_INTERVAL = 5 * 60               # sweep the upload dir at most this often
+_last_prune = 0.0
+
+
+def _upload_dir() -> str:
+    """The stash directory under the app's instance folder. Refuses (RuntimeError)
+    to use one that is not owned by us with mode 0700."""
+    path = os.path.join(current_app.instance_path, 'ledger_uploads')
+    if not ensure_private_dir(path):
+        raise RuntimeError(f'upload stash {path} must be a directory owned by '
+                           f'uid {os.getuid()} with mode 0700')
+    return path
+
+
+def _upload_path(token: str, ext: str = '.json') -> str:
+    return os.path.join(_upload_dir(), token + ext)
+
+
+def _prune_uploads(force: bool = False):
+    """Delete stashed uploads older than _UPLOAD_TTL (including stray .csv files),
+    then evict the oldest until the directory is under
+    _UPLOAD_MAX_BYTES. Throttled to once per _PRUNE_INTERVAL per process."""
+    global _last_prune
+    now = time.time()
+    if not force and now - _last_prune < _PRUNE_INTERVAL:
+        return
+    _last_prune = now
+
+    try:
+        entries = []
+        for de in os.scandir(_upload_dir()):
+            if de.is_file():
+                st = de.stat()
+                entries.append((st.st_mtime, st.st_size, de.path))
+    except FileNotFoundError:
+        return
+
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    for mtime, size, path in entries:
+        if now - mtime <= _UPLOAD_TTL and total <= _UPLOAD_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def _stash_upload(upload) -> tuple:
+    """Parse an uploaded CSV once and cache the compact (card, qty) payload under
+    an opaque token, so the confirm step loads exactly what the preview showed
+    without re-parsing. The CSV is streamed to a temp file for the parse and then
+    removed; only the payload (plain dicts, lists and numbers) is kept, as JSON.
+    Returns (token, parsed)."""
+    _prune_uploads()
     token = secrets.token_hex(16)
-    with open(os.path.join(_UPLOAD_DIR, token + '.csv'), 'wb') as fh:
-        fh.write(raw_bytes)
-    return token
-
 
-def _read_upload(token: str):
-    """Return the stashed CSV bytes for a token, or None if missing/invalid."""
+    csv_path = _upload_path(token, '.csv')
+    upload.save(csv_path)
+    try:
+        with open(csv_path, 'rb') as fh:
+            parsed = csv_parser.parse_csv(
+                fh, expand=False, engine=current_app.config.get('LEDGER_PARSE_ENGINE', 'rows'))
+    finally:
+        os.remove(csv_path)
+
+    tmp_path = _upload_path(token, '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump(parsed, fh, separators=(',', ':'))
+    os.replace(tmp_path, _upload_path(token))
+    return token, parsed
+
+
+def _load_upload(token: str):
+    """The cached payload for a token, or None if missing, invalid, or expired.
+    A file that does not decode to a payload (truncated, or from another
+    version) reads as expired."""
     if not token or not token.isalnum():
         return None
-    path = os.path.join(_UPLOAD_DIR, token + '.csv')
-    if not os.path.exists(path):
+    path = _upload_path(token)
+    try:
+        if time.time() - os.path.getmtime(path) > _UPLOAD_TTL:
+            _discard_upload(token)
+            return None
+        with open(path, encoding='utf-8') as fh:
+            parsed = json.load(fh)
+    except (OSError, ValueError):
         return None
-    with open(path, 'rb') as fh:
-        return fh.read()
+    if not isinstance(parsed, dict) or not ('groups' in parsed or 'items' in parsed):
+        return None
+    return parsed
 
 
 def _discard_upload(token: str):
     if token and token.isalnum():
-        path = os.path.join(_UPLOAD_DIR, token + '.csv')
+        path = _upload_path(token)
         if os.path.exists(path):
             os.remove(path)
 
 
+def _preview_rows(parsed, mode):
+    """(card, qty) rows for the preview table. Singles get one row per physical
+    card so each has its own paid_<i> input, indexed in iter_items() order."""
+    if mode == 'singles':
+        return [(c, 1) for c in csv_parser.iter_items(parsed)]
+    return parsed.get('groups') or [(c, 1) for c in parsed['items']]
+
+
 VALID_MODES = ('sealed', 'singles', 'append')
 
 
@@ -338,18 +631,17 @@ def import_csv():
         upload = request.files.get('csvfile')
         if not upload or upload.filename == '':
             return _render_form("Choose a TCGplayer CSV export to upload.", values)
-        raw = upload.read()
-        parsed = csv_parser.parse_csv(raw)
+        token, parsed = _stash_upload(upload)
 
     # Manual + sealed may have zero cards (logging an unopened/sealed purchase).
     allow_empty = (intake == 'manual' and mode == 'sealed')
-    if not parsed['items'] and not allow_empty:
+    if not parsed['n_cards'] and not allow_empty:
+        if token:
+            _discard_upload(token)
         return _render_form(_no_cards_error(intake), values, rows)
 
-    if intake == 'csv':
-        token = _stash_upload(raw)
-
-    ctx = dict(parsed=parsed, v=values, token=token, mode=mode, intake=intake, rows=rows)
+    ctx = dict(parsed=parsed, v=values, token=token, mode=mode, intake=intake, rows=rows,
+               preview_rows=_preview_rows(parsed, mode))
 
     if mode == 'append':
         target = _fetch_one(acquisition_one_query(),
@@ -380,17 +672,17 @@ def import_commit():
         parsed = csv_parser.build_manual(_collect_manual_rows(request.form))
     else:
         token = request.form.get('token', '')
-        raw = _read_upload(token)
-        if raw is None:
+        parsed = _load_upload(token)
+        if parsed is None:
             return _render_form("That upload expired — please re-upload the CSV.")
-        parsed = csv_parser.parse_csv(raw)
 
     allow_empty = (intake == 'manual' and mode == 'sealed')
-    if not parsed['items'] and not allow_empty:
+    if not parsed['n_cards'] and not allow_empty:
         if token:
             _discard_upload(token)
         return _render_form(_no_cards_error(intake))
 
+    started = time.perf_counter()
     if mode == 'singles':
         # Per-card paid prices entered in the preview table (aligned by index).
         overrides = []
@@ -403,12 +695,54 @@ def import_commit():
     else:
         acquisition_id = service.commit_sealed_import(request.form, parsed)
 
+    metrics.observe_import(mode if mode in VALID_MODES else 'sealed',
+                           'manual' if intake == 'manual' else 'csv',
+                           parsed['n_cards'], time.perf_counter() - started)
+    sampling.cards.invalidate()   # new cards may carry thumbnails for the home strip
     if token:
         _discard_upload(token)
     return redirect(url_for('ledger.box_detail',
                             acquisition_id=acquisition_id, imported=1))
 
 
+@ledger_bp.route('/reprice', methods=['GET', 'POST'])
+def reprice():
+    """Upload a new TCGplayer export and preview what it would reprice. Nothing
+    is written until the preview is confirmed (reprice_confirm)."""
+    if request.method == 'GET':
+        return render_template('ledger/reprice.html', report=None, error=None)
+    upload = request.files.get('csvfile')
+    if not upload or upload.filename == '':
+        return render_template('ledger/reprice.html', report=None,
+                               error="Choose a TCGplayer CSV export to upload.")
+    try:
+        token, parsed = _stash_upload(upload)
+    except (UnicodeDecodeError, csv.Error):
+        return render_template('ledger/reprice.html', report=None,
+                               error="That file isn't a UTF-8 CSV — upload the TCGplayer "
+                                     "export as downloaded.")
+    if not parsed['groups']:
+        _discard_upload(token)
+        return render_template('ledger/reprice.html', report=None,
+                               error=' '.join(parsed['warnings'])
+                                     or "No card rows in that CSV.")
+    report = service.reprice_parsed(parsed, apply=False)
+    return render_template('ledger/reprice.html', report=report, token=token, error=None)
+
+
+@ledger_bp.route('/reprice/confirm', methods=['POST'])
+def reprice_confirm():
+    """Apply the previewed export (same stashed payload the preview matched)."""
+    token = request.form.get('token', '')
+    parsed = _load_upload(token)
+    if parsed is None:
+        return render_template('ledger/reprice.html', report=None,
+                               error="That upload expired — please re-upload the CSV.")
+    report = service.reprice_parsed(parsed, apply=True)
+    _discard_upload(token)
+    return render_template('ledger/reprice.html', report=report, error=None)
+
+
 @ledger_bp.route('/box/<int:acquisition_id>')
 def box_detail(acquisition_id):
     acquisition = _fetch_one(acquisition_one_query(), {'id': acquisition_id})
@@ -1,25 +1,93 @@
 """Unified location lookup across all three collections (movies, cards, games).
 
 A single shelf/bin label can hold DVDs, trading cards, and video games. This
-route queries whichever collections are toggled on and groups the results, so a
-QR scan or a typed location surfaces everything stored there.
+route queries the v_locations view (one trigram-indexed query covering whichever
+collections are toggled on) and groups the results, so a QR scan or a typed
+location surfaces everything stored there.
+
+With LOCATE_CONCURRENT set, a multi-collection lookup is instead split into one
+query per collection, dispatched on a thread pool with a pooled connection each,
+and merged — so latency is the slowest collection, not the sum.
 """
-from flask import Blueprint, render_template, request
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Blueprint, render_template, request, current_app
 from sqlalchemy import text
 from extensions import db
-from queries import base_query as dvd_base_query
-from games.queries import base_query as games_base_query
-from card_ledger.queries import location_search_query
+from queries import location_lookup_query
 
 locate_bp = Blueprint('locate', __name__)
 
 VALID_TYPES = ('all', 'movies', 'cards', 'games')
+COLLECTIONS = ('movies', 'cards', 'games')
+
+# v_locations' generic detail columns -> the keys locate.html reads per collection.
+DETAIL_KEYS = {
+    'movies': ('media_title_id', 'title', 'season_name', 'type', 'disk_type', 'location_label'),
+    'cards':  ('item_id', 'name', 'set_code', 'condition', 'status', 'storage_location'),
+    'games':  ('game_title_id', 'title', 'platform', 'edition', 'copy_condition', 'location_label'),
+}
+
+
+_executor = None
+_executor_lock = threading.Lock()
 
 
 def _fetch(sql: str, params: dict = None):
     return db.session.execute(text(sql), params or {}).mappings().all()
 
 
+def _get_executor() -> ThreadPoolExecutor:
+    """Process-wide worker pool for concurrent lookups, created on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=current_app.config.get('LOCATE_MAX_WORKERS', 3),
+                    thread_name_prefix='locate',
+                )
+    return _executor
+
+
+def _fetch_on_engine(engine, sql: str, params: dict):
+    """Run one read on its own pooled connection (safe to call from a worker
+    thread — no app context or scoped session needed)."""
+    with engine.connect() as conn:
+        return conn.execute(text(sql), params).mappings().all()
+
+
+def _lookup(location: str, collections: list):
+    """v_locations rows for `collections`: one query, or one per collection in
+    parallel when LOCATE_CONCURRENT is on."""
+    loc = f'%{location}%'
+    if len(collections) < 2 or not current_app.config.get('LOCATE_CONCURRENT'):
+        return _fetch(location_lookup_query(), {'loc': loc, 'collections': collections})
+
+    engine = db.engine
+    futures = [
+        _get_executor().submit(_fetch_on_engine, engine, location_lookup_query(),
+                               {'loc': loc, 'collections': [c]})
+        for c in collections
+    ]
+    rows = []
+    for f in futures:
+        rows.extend(f.result())
+    return rows
+
+
+def _group_locations(rows) -> dict:
+    """Split v_locations rows into per-collection lists shaped for locate.html."""
+    grouped = {c: [] for c in COLLECTIONS}
+    for r in rows:
+        keys = DETAIL_KEYS[r['collection']]
+        values = (r['parent_id'], r['title'], r['detail_1'], r['detail_2'],
+                  r['detail_3'], r['label'])
+        grouped[r['collection']].append(dict(zip(keys, values)))
+    return grouped
+
+
 @locate_bp.route('/locate')
 def locate():
     location = request.args.get('location', '').strip()
@@ -27,22 +95,13 @@ def locate():
     if kind not in VALID_TYPES:
         kind = 'all'
 
-    movies, cards, games = [], [], []
+    grouped = {c: [] for c in COLLECTIONS}
 
     if location:
-        loc = {'loc': f'%{location}%'}
-
-        if kind in ('all', 'movies'):
-            sql = f"SELECT * FROM ({dvd_base_query()}) AS sub WHERE location_label ILIKE :loc ORDER BY title"
-            movies = _fetch(sql, loc)
-
-        if kind in ('all', 'cards'):
-            cards = _fetch(location_search_query(), loc)
-
-        if kind in ('all', 'games'):
-            sql = f"SELECT * FROM ({games_base_query()}) AS sub WHERE location_label ILIKE :loc ORDER BY title"
-            games = _fetch(sql, loc)
+        collections = list(COLLECTIONS) if kind == 'all' else [kind]
+        grouped = _group_locations(_lookup(location, collections))
 
+    movies, cards, games = grouped['movies'], grouped['cards'], grouped['games']
     return render_template(
         'locate.html',
         location=location,
@@ -1,6 +1,9 @@
 import os
 from flask import Blueprint, render_template, request, redirect, url_for, current_app
+from sqlalchemy import text
 from extensions import db
+from queries import dashboard_stats_delta_query
+import sampling
 from utilities import clean_int
 
 media_bp = Blueprint('media', __name__)
@@ -14,6 +17,16 @@ def _get_models():
     return current_app.Titles, current_app.Dvds, current_app.Purchases
 
 
+def _apply_stats_delta(dvd_id, sign: int):
+    """Add (sign=1) or remove (sign=-1) one disk's rows from dashboard_stats.
+    Runs in the caller's transaction, so the stats commit with the write."""
+    if dvd_id is None:
+        return
+    db.session.flush()
+    db.session.execute(text(dashboard_stats_delta_query()),
+                       {'dvd_id': dvd_id, 'sign': sign})
+
+
 def _handle_media_form():
     Titles, _, _ = _get_models()
     record = Titles(
@@ -27,6 +40,8 @@ def _handle_media_form():
         tmdb_id             = request.form.get('tmdb_id'),
     )
     db.session.add(record)
+    # No dashboard_stats delta: a title contributes no base_query() rows until
+    # it has a disk, and the disk form applies that delta.
     db.session.commit()
     return record.id
 
@@ -52,14 +67,22 @@ def _handle_dvd_form():
         disk_type_uploaded = request.form.get('disk_type_uploaded'),
     )
     db.session.add(record)
+    db.session.flush()
+    _apply_stats_delta(record.id, 1)
     db.session.commit()
+    # A title only joins the poster strip's pool once it has a disk.
+    sampling.posters.invalidate()
     return record.id
 
 
 def _handle_purchase_form():
     _, _, Purchases = _get_models()
+    dvd_item_id = clean_int(request.form.get('dvd_item_id'))
+    # A purchase replaces (or adds to) the disk's rows in base_query(), so swap
+    # the disk's whole contribution out and back in around the insert.
+    _apply_stats_delta(dvd_item_id, -1)
     record = Purchases(
-        dvd_item_id   = clean_int(request.form.get('dvd_item_id')),
+        dvd_item_id   = dvd_item_id,
         purchase_date = request.form.get('purchase_date'),
         cost          = clean_int(request.form.get('cost')),
         store         = request.form.get('store'),
@@ -67,6 +90,7 @@ def _handle_purchase_form():
         notes         = request.form.get('notes'),
     )
     db.session.add(record)
+    _apply_stats_delta(dvd_item_id, 1)
     db.session.commit()
     return record.id
 
@@ -0,0 +1,30 @@
+"""/metrics — Prometheus text exposition of metrics.py plus DB pool gauges."""
+from flask import Blueprint, Response, abort, current_app
+from extensions import db
+import metrics as m
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+def _pool_stats():
+    pool = db.engine.pool
+    stats = []
+    # QueuePool exposes these; other pool classes (e.g. NullPool) may not.
+    for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+        fn = getattr(pool, name, None)
+        if fn is not None:
+            stats.append(((name,), fn()))
+    return stats
+
+
+POOL_GAUGE = m.Gauge('db_pool_connections',
+                     'SQLAlchemy pool state: size, checkedin, checkedout, overflow.',
+                     _pool_stats, ('state',))
+
+
+@metrics_bp.route('/metrics')
+def metrics():
+    if not current_app.config.get('METRICS', True):
+        abort(404)
+    return Response(m.render(extra=[POOL_GAUGE]),
+                    mimetype='text/plain; version=0.0.4; charset=utf-8')
@@ -1,13 +1,15 @@
 from flask import Blueprint, render_template, request
 from sqlalchemy import text
 from extensions import db
-from queries import base_query, location_count_query
+from queries import base_query, name_match_filter, location_count_query
 
 search_bp = Blueprint('search', __name__)
 
 # Whitelisted sort options (label -> trusted ORDER BY). Keys are validated, so
 # the clause is never user-controlled SQL.
 SEARCH_SORTS = {
+    'relevance':     ('Best match',        'GREATEST(word_similarity(:q, title), '
+                                           'word_similarity(:q, season_name)) DESC, title ASC'),
     'title':         ('Title (A–Z)',       'title ASC'),
     'acquired_desc': ('Newest acquired',   'purchase_date DESC NULLS LAST, title ASC'),
     'acquired_asc':  ('Oldest acquired',   'purchase_date ASC NULLS LAST, title ASC'),
@@ -15,23 +17,30 @@ SEARCH_SORTS = {
     'cost_asc':      ('Cost (low→high)',   'cost ASC NULLS LAST'),
     'genre':         ('Genre',             'genre ASC, title ASC'),
 }
-DEFAULT_SORT = 'title'
+DEFAULT_SORT = 'relevance'
+FALLBACK_SORT = 'title'   # what 'relevance' means when there is no name to rank by
 
 
 def _build_search_sql(name: str, location: str, sort: str = DEFAULT_SORT) -> tuple:
-    sql = f"SELECT * FROM ({base_query()}) AS sub WHERE 1=1"
+    """Filter the base tables (trigram-indexed ILIKE) before the join, then sort."""
+    where = []
     params = {}
 
     if name:
-        sql += " AND (title ILIKE :name OR season_name ILIKE :name)"
+        where.append(name_match_filter())
         params['name'] = f"%{name}%"
+        params['q'] = name
 
     if location:
-        sql += " AND location_label ILIKE :loc"
+        where.append("di.location_label ILIKE :loc")
         params['loc'] = f"%{location}%"
 
-    order_by = SEARCH_SORTS.get(sort, SEARCH_SORTS[DEFAULT_SORT])[1]
-    sql += f" ORDER BY {order_by}"
+    if sort not in SEARCH_SORTS:
+        sort = DEFAULT_SORT
+    if sort == 'relevance' and not name:
+        sort = FALLBACK_SORT
+    sql = f"SELECT * FROM ({base_query(' AND '.join(where))}) AS sub"
+    sql += f" ORDER BY {SEARCH_SORTS[sort][1]}"
     return sql, params
 
 
@@ -0,0 +1,57 @@
+"""
+Cheap random sampling for the home-page poster strips.
+
+The strips used to run `ORDER BY random() LIMIT N`. That sorts every eligible
+row (after a DISTINCT ON, for the DVD catalog) on every page view. Instead, each
+strip keeps an in-process pool of eligible ids. The pool is loaded by one
+index-only query, reused for POOL_TTL seconds, and dropped early by
+`invalidate()` when this process writes something that changes eligibility.
+A page view is then `random.sample()` over a list plus a primary-key lookup
+of N rows, and its cost does not depend on collection size.
+
+The TTL covers writes made by other worker processes. A title added elsewhere
+shows up in the strip within POOL_TTL seconds.
+"""
+import random
+import threading
+import time
+
+from sqlalchemy import text
+
+from extensions import db
+from queries import poster_pool_query
+from games.queries import cover_pool_query
+from card_ledger.queries import ledger_poster_pool_query
+
+POOL_TTL = 5 * 60
+
+
+class IdPool:
+    """Eligible ids for one strip, loaded lazily by `pool_sql()` (one id column)."""
+
+    def __init__(self, pool_sql, ttl: int = POOL_TTL):
+        self.pool_sql = pool_sql
+        self.ttl = ttl
+        self._ids = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        self._ids = None
+
+    def _current(self) -> list:
+        with self._lock:
+            if self._ids is None or time.monotonic() - self._loaded_at > self.ttl:
+                self._ids = db.session.execute(text(self.pool_sql())).scalars().all()
+                self._loaded_at = time.monotonic()
+            return self._ids
+
+    def sample(self, n: int) -> list:
+        """Up to `n` distinct random ids, in random order."""
+        ids = self._current()
+        return random.sample(ids, min(n, len(ids)))
+
+
+posters = IdPool(poster_pool_query)        # DVD home: media_titles with a tmdb_id
+covers  = IdPool(cover_pool_query)         # games home: game_titles with a rawg_id
+cards   = IdPool(ledger_poster_pool_query) # ledger home: items with an image_url
@@ -0,0 +1,454 @@
+"""End-to-end benchmark harness: seed synthetic collections, time hot endpoints.
+
+Runs the real app (create_app() with the normal Config, pointed at a separate
+database) through Flask's test client. Timings therefore include routing,
+SQL and template rendering but no network. Each endpoint's Server-Timing
+header (query_timing.py) also provides its DB time and query count.
+
+    # one-off: create the schemas in an empty database and seed 10k rows each
+    python bench/bench.py --database-url postgresql://u:p@localhost/media_bench \\
+        --setup --reset --scale 10000 --out bench/baseline.json
+
+    # later: re-time against the existing data and diff with the baseline
+    python bench/bench.py --database-url postgresql://u:p@localhost/media_bench \\
+        --compare bench/baseline.json --out bench/current.json
+
+--reset TRUNCATEs every catalog, game and ledger table in the target database.
+Never point it at the real collection.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_DIR = ROOT / 'app'
+DB_DIR = ROOT / 'db'
+
+# The db/ migrations hardcode these schema names, so the bench uses them too.
+BENCH_ENV = {
+    'DB_SCHEMA': 'media_catalog',
+    'GAMES_SCHEMA': 'games',
+    'LEDGER_SCHEMA': 'card_ledger',
+    'ARTWORK_REFRESH': 'false',      # no TMDB/RAWG calls from a benchmark
+    'SLOW_QUERY_MS': '1000000',      # keep the slow-query log quiet
+}
+
+# The repo does not ship the media_catalog DDL (that schema predates db/), so
+# the bench creates a minimal equivalent with the columns the app reads.
+MEDIA_DDL = """
+CREATE SCHEMA IF NOT EXISTS media_catalog;
+CREATE TABLE IF NOT EXISTS media_catalog.media_titles (
+    id                  serial PRIMARY KEY,
+    title               varchar(255) NOT NULL,
+    type                varchar(20),
+    genre               varchar(100),
+    total_seasons       integer,
+    ongoing_ind         boolean,
+    complete_collection boolean,
+    brand               varchar(150),
+    tmdb_id             integer
+);
+CREATE TABLE IF NOT EXISTS media_catalog.dvd_items (
+    id                 serial PRIMARY KEY,
+    media_title_id     integer NOT NULL REFERENCES media_catalog.media_titles(id),
+    season_name        varchar(255),
+    season_number      integer,
+    season_part        integer,
+    episodes           integer,
+    location_label     varchar(255),
+    box_set            boolean,
+    complete_season    boolean,
+    disk_type          varchar(30),
+    disk_region        integer,
+    file_size          numeric,
+    category           varchar(50),
+    compressed         boolean,
+    adjusted_file_size numeric,
+    disk_type_uploaded varchar(30),
+    tmdb_id            integer
+);
+CREATE TABLE IF NOT EXISTS media_catalog.purchase_info (
+    id            serial PRIMARY KEY,
+    dvd_item_id   integer NOT NULL REFERENCES media_catalog.dvd_items(id),
+    purchase_date date,
+    cost          numeric(8,2),
+    store         varchar(150),
+    condition     varchar(15),
+    notes         text
+);
+"""
+
+# Row counts scale with --scale (N): N disks, N game copies, N cards; half as
+# many titles; ~90% of disks/copies purchased; one box per 100 cards; 10% sold.
+SEED_SQL = """
+SELECT setseed(0.42);
+
+TRUNCATE media_catalog.purchase_info, media_catalog.dvd_items, media_catalog.media_titles,
+         games.purchase_info, games.game_copies, games.game_titles,
+         card_ledger.sale, card_ledger.item, card_ledger.acquisition
+         RESTART IDENTITY CASCADE;
+
+INSERT INTO media_catalog.media_titles
+    (title, type, genre, total_seasons, ongoing_ind, complete_collection, brand, tmdb_id)
+SELECT (ARRAY['The','A','Last','Dark','Silent','Golden'])[1 + g % 6] || ' '
+         || (ARRAY['Night','Saga','River','Empire','Garden','Signal','Harbor'])[1 + g % 7]
+         || ' ' || g,
+       CASE WHEN g % 3 = 0 THEN 'tv' ELSE 'movie' END,
+       (ARRAY['Drama','Comedy','Horror','Sci-Fi','Animation','Documentary','Action'])[1 + g % 7],
+       CASE WHEN g % 3 = 0 THEN 1 + g % 8 END,
+       g % 15 = 0, g % 11 = 0,
+       (ARRAY['Criterion','Arrow','Disney','BBC','Shout'])[1 + g % 5],
+       CASE WHEN g % 10 <> 0 THEN 1000 + g END
+FROM generate_series(1, GREATEST({n} / 2, 1)) g;
+
+INSERT INTO media_catalog.dvd_items
+    (media_title_id, season_name, season_number, episodes, location_label,
+     box_set, complete_season, disk_type, disk_region, file_size, category, compressed)
+SELECT 1 + g % GREATEST({n} / 2, 1),
+       'Season ' || (1 + g % 8),
+       1 + g % 8, 6 + g % 18,
+       'Shelf ' || chr(65 + g % 26) || (1 + g % 40),
+       g % 9 = 0, g % 4 = 0,
+       (ARRAY['DVD','Blu-ray','4K UHD'])[1 + g % 3],
+       1, round((random() * 40)::numeric, 2),
+       (ARRAY['Film','Series','Anime'])[1 + g % 3], g % 2 = 0
+FROM generate_series(1, {n}) g;
+
+INSERT INTO media_catalog.purchase_info (dvd_item_id, purchase_date, cost, store, condition)
+SELECT g, date '2012-01-01' + (g % 4000),
+       round((3 + random() * 60)::numeric, 2),
+       (ARRAY['Amazon','Target','Goodwill','eBay','Best Buy', NULL])[1 + g % 6],
+       (ARRAY['New','Used'])[1 + g % 2]
+FROM generate_series(1, {n}) g
+WHERE g % 10 <> 0;
+
+INSERT INTO games.game_titles
+    (title, franchise, genre, developer, publisher, release_year, rawg_id, complete_collection)
+SELECT (ARRAY['Legend','Chrono','Final','Super','Dark','Star'])[1 + g % 6] || ' '
+         || (ARRAY['Quest','Fantasy','Souls','Kart','Odyssey','Tactics'])[1 + g % 6] || ' ' || g,
+       (ARRAY['Zelda','Mario','Final Fantasy','Souls', NULL])[1 + g % 5],
+       (ARRAY['RPG','Platformer','Action','Racing','Strategy'])[1 + g % 5],
+       'Studio ' || (g % 40), 'Publisher ' || (g % 12),
+       1985 + g % 40,
+       CASE WHEN g % 8 <> 0 THEN (3000 + g)::text END,
+       false
+FROM generate_series(1, GREATEST({n} / 2, 1)) g;
+
+INSERT INTO games.game_copies
+    (game_title_id, platform, edition, region, condition, location_label)
+SELECT 1 + g % GREATEST({n} / 2, 1),
+       (ARRAY['PS5','Switch','PS2','N64','PC','Xbox'])[1 + g % 6],
+       (ARRAY['Standard','Collector''s','GOTY'])[1 + g % 3],
+       (ARRAY['NTSC-U','PAL','NTSC-J'])[1 + g % 3],
+       (ARRAY['CIB','Loose','Sealed','Digital'])[1 + g % 4],
+       'Shelf ' || chr(65 + g % 26) || (1 + g % 40)
+FROM generate_series(1, {n}) g;
+
+INSERT INTO games.purchase_info (game_copy_id, purchase_date, cost, store, condition)
+SELECT g, date '2012-01-01' + (g % 4000),
+       round((5 + random() * 70)::numeric, 2),
+       (ARRAY['GameStop','Amazon','eBay','Local'])[1 + g % 4],
+       (ARRAY['New','Used'])[1 + g % 2]
+FROM generate_series(1, {n}) g
+WHERE g % 10 <> 0;
+
+INSERT INTO card_ledger.acquisition
+    (purchase_date, description, game, product_type, set_code, packs_total,
+     cards_per_pack, packs_opened, purchase_price, tax, source, status)
+SELECT date '2020-01-01' + g * 3,
+       'Bench Box ' || g,
+       (ARRAY['weiss','pokemon','mtg'])[1 + g % 3],
+       'sealed_box',
+       (ARRAY['SFN/S108','CSM/S96','OSK/S107'])[1 + g % 3],
+       16, 8, 16,
+       round((80 + random() * 150)::numeric, 2), 0, 'Bench', 'opened'
+FROM generate_series(1, GREATEST({n} / 100, 1)) g;
+
+INSERT INTO card_ledger.item
+    (acquisition_id, name, game, set_code, collector_number, variant, condition,
+     market_value_at_open, market_value, status, grade_candidate, grader, grade,
+     storage_location, tcgplayer_product_id, image_url)
+SELECT a.id, c.name, a.game, a.set_code, a.set_code || '-E' || lpad((g % 110)::text, 3, '0'),
+       (ARRAY['C','U','R','RR','SR','SP'])[1 + g % 6],
+       (ARRAY['NM','NM','NM','LP','MP'])[1 + g % 5],
+       c.value, round(c.value * (0.7 + random() * 0.6), 2),
+       CASE WHEN g % 10 = 0 THEN 'sold' WHEN g % 13 = 0 THEN 'keep' ELSE 'inventory' END,
+       g % 97 = 0,
+       CASE WHEN g % 211 = 0 THEN 'PSA' END,
+       CASE WHEN g % 211 = 0 THEN 8 + g % 3 END,
+       'Binder ' || (g % 50),
+       (100000 + g)::text,
+       'https://tcgplayer-cdn.tcgplayer.com/product/' || (100000 + g) || '_200w.jpg'
+FROM generate_series(1, {n}) g
+CROSS JOIN LATERAL (
+    SELECT 1 + g % GREATEST({n} / 100, 1) AS id,
+           (ARRAY['weiss','pokemon','mtg'])[1 + (1 + g % GREATEST({n} / 100, 1)) % 3] AS game,
+           (ARRAY['SFN/S108','CSM/S96','OSK/S107'])[1 + (1 + g % GREATEST({n} / 100, 1)) % 3] AS set_code
+) a
+CROSS JOIN LATERAL (
+    SELECT (ARRAY['Frieren','Fern','Stark','Pikachu','Charizard','Sheoldred','Atraxa'])[1 + g % 7]
+             || ' ' || (ARRAY['Mage','Knight','Ember','Oracle','Maiden'])[1 + g % 5]
+             || ' ' || (g % 400) AS name,
+           round((exp(random() * 6) - 1)::numeric * 0.5, 2) AS value
+) c;
+
+INSERT INTO card_ledger.sale
+    (item_id, sale_date, channel, gross_price, marketplace_fee, processing_fee, shipping_paid)
+SELECT i.item_id, date '2024-01-01' + (i.item_id % 500)::int, 'tcgplayer',
+       round(COALESCE(i.market_value, 1) * 1.05, 2),
+       round(COALESCE(i.market_value, 1) * 0.1075, 2),
+       round(COALESCE(i.market_value, 1) * 0.025 + 0.30, 2), 1.00
+FROM card_ledger.item i
+WHERE i.status = 'sold';
+"""
+
+ENDPOINTS = [
+    ('home',               '/'),
+    ('search',             '/search?name=night'),
+    ('search_location',    '/search?location=Shelf%20A1'),
+    ('locate',             '/locate?location=Shelf%20A1'),
+    ('games_home',         '/games/'),
+    ('ledger_home',        '/ledger/'),
+    ('ledger_collection',  '/ledger/collection'),
+    ('ledger_collection_name', '/ledger/collection?name=frieren'),
+    ('ledger_grading',     '/ledger/grading'),
+]
+
+SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+
+# ── Database setup / seeding ────────────────────────────────────────────────
+def _raw_conn(url):
+    from sqlalchemy import create_engine
+    conn = create_engine(url).raw_connection()
+    conn.autocommit = True   # the db/*.sql files carry their own BEGIN/COMMIT
+    return conn
+
+
+def _exists(cur, relation):
+    cur.execute("SELECT to_regclass(%s) IS NOT NULL", (relation,))
+    return cur.fetchone()[0]
+
+
+def _run_file(cur, name, search_path=None):
+    if search_path:
+        cur.execute(f"SET search_path TO {search_path}")
+    cur.execute((DB_DIR / name).read_text())
+    if search_path:
+        cur.execute("RESET search_path")
+
+
+def setup(url):
+    """Create any missing schemas/tables, then apply the idempotent migrations."""
+    conn = _raw_conn(url)
+    with conn.cursor() as cur:
+        cur.execute(MEDIA_DDL)
+        if not _exists(cur, 'games.game_titles'):
+            _run_file(cur, 'games_schema.sql')
+        if not _exists(cur, 'card_ledger.item'):
+            cur.execute("CREATE SCHEMA IF NOT EXISTS card_ledger")
+            _run_file(cur, 'card_ledger_schema.sql', 'card_ledger, public')
+        for name in ('migrate_search_trgm.sql', 'migrate_locations.sql',
+                     'migrate_artwork_cache.sql', 'migrate_dashboard_stats.sql',
+                     'migrate_box_pl_summary.sql', 'migrate_portfolio_totals.sql',
+                     'migrate_box_median.sql', 'migrate_bulk_allocation.sql',
+                     'migrate_collection_sort_indexes.sql'):
+            _run_file(cur, name)
+    conn.close()
+
+
+def seed(url, scale):
+    conn = _raw_conn(url)
+    started = time.perf_counter()
+    with conn.cursor() as cur:
+        cur.execute(SEED_SQL.format(n=int(scale)))
+        cur.execute("SET search_path TO card_ledger, public")
+        cur.execute("SELECT allocate_box_costs(ARRAY(SELECT acquisition_id FROM acquisition))")
+        cur.execute("SELECT refresh_box_pl(NULL)")
+        cur.execute("SELECT refresh_box_median(NULL)")
+        cur.execute("RESET search_path")
+        _run_file(cur, 'migrate_dashboard_stats.sql')   # rebuilds from the new rows
+        _run_file(cur, 'migrate_portfolio_totals.sql')
+        cur.execute("ANALYZE")
+    conn.close()
+    return round(time.perf_counter() - started, 2)
+
+
+# ── Timing ──────────────────────────────────────────────────────────────────
+def make_app(url):
+    os.environ.update(BENCH_ENV)
+    sys.path.insert(0, str(APP_DIR))
+    from config import Config
+    from dvd import create_app
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = url
+
+    return create_app(BenchConfig)
+
+
+def _summary(samples, db_ms, queries):
+    samples_ms = sorted(s * 1000 for s in samples)
+    return {
+        'runs': len(samples_ms),
+        'p50_ms': round(statistics.median(samples_ms), 2),
+        'p95_ms': round(samples_ms[min(len(samples_ms) - 1,
+                                       int(round(0.95 * (len(samples_ms) - 1))))], 2),
+        'mean_ms': round(statistics.fmean(samples_ms), 2),
+        'min_ms': round(samples_ms[0], 2),
+        'max_ms': round(samples_ms[-1], 2),
+        'db_p50_ms': round(statistics.median(db_ms), 2) if db_ms else None,
+        'queries': max(queries) if queries else None,
+    }
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    resp = fn()
+    elapsed = time.perf_counter() - started
+    if resp.status_code >= 400:
+        raise RuntimeError(f'{resp.request.path} -> HTTP {resp.status_code}')
+    match = SERVER_TIMING_DB.search(resp.headers.get('Server-Timing', ''))
+    db = (float(match.group(1)), int(match.group(2))) if match else None
+    return elapsed, db, resp
+
+
+def time_endpoints(client, runs, warmup):
+    results = {}
+    for name, path in ENDPOINTS:
+        for _ in range(warmup):
+            _timed(lambda: client.get(path))
+        samples, db_ms, queries = [], [], []
+        for _ in range(runs):
+            elapsed, db, _ = _timed(lambda: client.get(path))
+            samples.append(elapsed)
+            if db:
+                db_ms.append(db[0])
+                queries.append(db[1])
+        results[name] = _summary(samples, db_ms, queries)
+        print(f"  {name:<24} p50 {results[name]['p50_ms']:>9.2f} ms"
+              f"   db {results[name]['db_p50_ms'] or 0:>8.2f} ms"
+              f"   {results[name]['queries'] or 0} queries")
+    return results
+
+
+def time_import(client, n_cards, runs):
+    """Preview + commit of a synthetic sealed-box CSV export, `runs` times."""
+    from synthetic import tcgplayer_csv
+    import io
+
+    form = {'intake': 'csv', 'mode': 'sealed', 'description': 'Bench import',
+            'purchase_date': '2024-06-01', 'price': '120.00',
+            'product_type': 'sealed_box', 'packs_total': '16', 'language': 'EN'}
+    out = {}
+    for stage in ('import_preview', 'import_commit'):
+        out[stage] = []
+    for i in range(runs):
+        data = dict(form, csvfile=(io.BytesIO(tcgplayer_csv(n_cards, seed=i)), 'bench.csv'))
+        elapsed, _, resp = _timed(lambda: client.post(
+            '/ledger/import', data=data, content_type='multipart/form-data'))
+        out['import_preview'].append(elapsed)
+        token = re.search(r'name="token" value="([0-9a-f]+)"', resp.get_data(as_text=True))
+        if not token:
+            raise RuntimeError('import preview did not return an upload token')
+        elapsed, _, _ = _timed(lambda: client.post(
+            '/ledger/import/commit', data=dict(form, token=token.group(1))))
+        out['import_commit'].append(elapsed)
+    results = {f'{stage}_{n_cards}': _summary(s, [], []) for stage, s in out.items()}
+    for name, r in results.items():
+        print(f"  {name:<24} p50 {r['p50_ms']:>9.2f} ms")
+    return results
+
+
+# ── Baseline diff ───────────────────────────────────────────────────────────
+def compare(current, baseline_path):
+    baseline = json.loads(Path(baseline_path).read_text())
+    print(f"\nvs {baseline_path} (scale {baseline['meta'].get('scale')}, "
+          f"{baseline['meta'].get('git_rev')}):")
+    for name, now in current['results'].items():
+        before = baseline['results'].get(name)
+        if not before:
+            print(f"  {name:<24} (new)")
+            continue
+        delta = (now['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100 if before['p50_ms'] else 0
+        print(f"  {name:<24} {before['p50_ms']:>9.2f} -> {now['p50_ms']:>9.2f} ms  ({delta:+.1f}%)")
+
+
+def _git_rev():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    ap.add_argument('--database-url', required=True,
+                    help='a throwaway Postgres database (15+), NOT the real collection')
+    ap.add_argument('--setup', action='store_true', help='create missing schemas/tables first')
+    ap.add_argument('--reset', action='store_true',
+                    help='TRUNCATE and re-seed every collection at --scale')
+    ap.add_argument('--scale', type=int, default=10000,
+                    help='rows per collection (disks, game copies, cards); default 10000')
+    ap.add_argument('--runs', type=int, default=20, help='timed requests per endpoint')
+    ap.add_argument('--warmup', type=int, default=3, help='untimed requests per endpoint')
+    ap.add_argument('--import-cards', type=int, default=1000,
+                    help='CSV rows per import benchmark (0 skips it)')
+    ap.add_argument('--import-runs', type=int, default=3)
+    ap.add_argument('--out', help='write the JSON baseline here')
+    ap.add_argument('--compare', help='diff against an earlier JSON baseline')
+    args = ap.parse_args(argv)
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    meta = {
+        'scale': args.scale if args.reset else None,
+        'git_rev': _git_rev(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'runs': args.runs,
+    }
+
+    if args.setup:
+        print('setting up schemas...')
+        setup(args.database_url)
+    if args.reset:
+        print(f'seeding scale={args.scale}...')
+        meta['seed_seconds'] = seed(args.database_url, args.scale)
+
+    app = make_app(args.database_url)
+    client = app.test_client()
+    with app.app_context():
+        from extensions import db
+        from sqlalchemy import text
+        meta['postgres'] = db.session.execute(text('SHOW server_version')).scalar()
+        meta['row_counts'] = dict(db.session.execute(text("""
+            SELECT 'dvd_items', count(*) FROM media_catalog.dvd_items
+            UNION ALL SELECT 'game_copies', count(*) FROM games.game_copies
+            UNION ALL SELECT 'cards', count(*) FROM card_ledger.item
+        """)).all())
+        db.session.remove()
+
+    print('timing endpoints...')
+    results = time_endpoints(client, args.runs, args.warmup)
+    if args.import_cards:
+        print(f'timing import of {args.import_cards} CSV rows...')
+        results.update(time_import(client, args.import_cards, args.import_runs))
+
+    report = {'meta': meta, 'results': results}
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2) + '\n')
+        print(f'\nwrote {args.out}')
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""Microbenchmarks and profiling for card_ledger.parser (pure CPU, no database).
+
+Generates synthetic TCGplayer exports (bench/synthetic.py: Weiss, Pokémon and
+MTG rows with varied quantities and a partly-filled Paid column). Each parser
+entry point then gets rows/sec and cards/sec from the best of --repeat runs,
+plus peak traced memory from a separate tracemalloc pass.
+
+    python bench/parser_bench.py                         # 1k / 10k / 50k rows
+    python bench/parser_bench.py --rows 10000 --profile  # + cProfile hot spots
+    python bench/parser_bench.py --out bench/parser.json --compare bench/parser_base.json
+
+--profile prints the cProfile breakdown of one expanded parse_csv() call,
+limited to the parser's own helpers (strip_rarity, set_code_for, _get, _num,
+_card_from_row, _collect, ...), so a regression in one of them is obvious.
+"""
+import argparse
+import cProfile
+import io
+import json
+import pstats
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+sys.path.insert(0, str(HERE.parent / 'app'))
+
+from card_ledger import parser                       # noqa: E402
+from synthetic import tcgplayer_csv, manual_rows     # noqa: E402
+
+
+def _cases(csv_bytes, manual):
+    """name -> zero-arg callable returning the payload."""
+    return {
+        'parse_csv':          lambda: parser.parse_csv(csv_bytes),
+        'parse_csv_compact':  lambda: parser.parse_csv(csv_bytes, expand=False),
+        'columnar_compact':   lambda: parser.parse_csv(csv_bytes, expand=False,
+                                                       engine='columnar'),
+        'parse_csv_file':     lambda: parser.parse_csv(io.BytesIO(csv_bytes), expand=False),
+        'iter_csv':           lambda: sum(q for _, q in parser.iter_csv(csv_bytes)),
+        'build_manual':       lambda: parser.build_manual(manual),
+    }
+
+
+def _best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _peak_memory(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(sizes, repeat, seed):
+    results = {}
+    for n_rows in sizes:
+        csv_bytes = tcgplayer_csv(n_rows, seed=seed)
+        manual = list(manual_rows(min(n_rows, 2000), seed=seed))
+        n_cards = parser.parse_csv(csv_bytes, expand=False)['n_cards']
+        print(f'\n{n_rows} rows ({len(csv_bytes) / 1e6:.1f} MB, {n_cards} cards):')
+        for name, fn in _cases(csv_bytes, manual).items():
+            rows = len(manual) if name == 'build_manual' else n_rows
+            seconds = _best_of(fn, repeat)
+            peak = _peak_memory(fn)
+            key = f'{name}_{n_rows}'
+            results[key] = {
+                'rows': rows,
+                'seconds': round(seconds, 5),
+                'rows_per_sec': round(rows / seconds),
+                'cards_per_sec': None if name == 'build_manual' else round(n_cards / seconds),
+                'peak_mb': round(peak / 1e6, 2),
+            }
+            print(f"  {name:<18} {results[key]['rows_per_sec']:>10,} rows/s"
+                  f"   {seconds * 1000:>9.1f} ms   peak {results[key]['peak_mb']:>8.2f} MB")
+    return results
+
+
+def profile(n_rows, seed, limit):
+    csv_bytes = tcgplayer_csv(n_rows, seed=seed)
+    prof = cProfile.Profile()
+    prof.enable()
+    parser.parse_csv(csv_bytes)
+    prof.disable()
+    print(f'\ncProfile: parse_csv() on {n_rows} rows (parser.py functions only)')
+    stats = pstats.Stats(prof).strip_dirs().sort_stats('tottime')
+    stats.print_stats(r'parser\.py', limit)
+
+
+def compare(current, baseline_path):
+    baseline = json.loads(Path(baseline_path).read_text())['results']
+    print(f'\nvs {baseline_path}:')
+    for key, now in current.items():
+        before = baseline.get(key)
+        if before:
+            delta = (now['rows_per_sec'] - before['rows_per_sec']) / before['rows_per_sec'] * 100
+            print(f"  {key:<26} {before['rows_per_sec']:>10,} -> {now['rows_per_sec']:>10,} rows/s"
+                  f"  ({delta:+.1f}%)")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    ap.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 50000],
+                    help='CSV sizes to benchmark (rows)')
+    ap.add_argument('--repeat', type=int, default=5, help='runs per case (best is kept)')
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--profile', action='store_true',
+                    help='cProfile one parse_csv() at the largest --rows size')
+    ap.add_argument('--profile-limit', type=int, default=25)
+    ap.add_argument('--out', help='write results as JSON')
+    ap.add_argument('--compare', help='diff rows/sec against an earlier --out file')
+    args = ap.parse_args(argv)
+
+    results = run(args.rows, args.repeat, args.seed)
+    if args.profile:
+        profile(max(args.rows), args.seed, args.profile_limit)
+    if args.out:
+        Path(args.out).write_text(json.dumps(
+            {'meta': {'python': sys.version.split()[0], 'repeat': args.repeat,
+                      'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z')},
+             'results': results}, indent=2) + '\n')
+        print(f'\nwrote {args.out}')
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
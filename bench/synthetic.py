@@ -0,0 +1,122 @@
+"""Synthetic TCGplayer exports for the benchmarks.
+
+Rows look like real scanner exports for the three product lines the parser
+special-cases: Weiss Schwarz numbers with an embedded set code and trailing
+rarity token, Pokémon 'nnn/nnn' numbers, and MTG collector numbers. Quantities
+and conditions are varied, some rows carry the Paid column, and a few blank-name
+rows are included so the parser's skip path is exercised. Output is
+deterministic for a given seed, so runs are comparable.
+"""
+import csv
+import io
+import random
+
+HEADER = [
+    "Product Line", "Set Name", "Product Name", "Title", "Number", "Rarity",
+    "Condition", "Printing", "Language", "TCG Market Price", "Add to Quantity",
+    "Product ID", "Photo URL",
+]
+PAID_HEADER = "Paid"
+
+CONDITIONS = ["Near Mint"] * 6 + ["Lightly Played"] * 2 + [
+    "Moderately Played", "Heavily Played", "Damaged"]
+PRINTINGS = ["Normal"] * 5 + ["Foil", "Reverse Holofoil"]
+
+WEISS_SETS = ["SFN/S108", "CSM/S96", "OSK/S107", "BD/W95", "HOL/W104"]
+WEISS_RARITIES = ["C", "U", "R", "RR", "SR", "SP", "SSP", "OFR"]
+POKEMON_SETS = [("Scarlet & Violet", 198), ("Paldea Evolved", 193),
+                ("Obsidian Flames", 197), ("151", 165), ("Paradox Rift", 182)]
+POKEMON_RARITIES = ["Common", "Uncommon", "Rare", "Holo Rare", "Ultra Rare",
+                    "Illustration Rare", "Special Illustration Rare"]
+MTG_SETS = ["Murders at Karlov Manor", "Outlaws of Thunder Junction",
+            "Bloomburrow", "Duskmourn", "Modern Horizons 3"]
+MTG_RARITIES = ["C", "U", "R", "M"]
+
+NAME_WORDS = ["Frieren", "Fern", "Stark", "Himmel", "Pikachu", "Charizard",
+              "Gardevoir", "Miraidon", "Sheoldred", "Ragavan", "Atraxa",
+              "Archmage", "Shrine", "Oracle", "Dragon", "Maiden", "Knight",
+              "Ember", "Tide", "Echo", "of", "the", "Ascendant", "Lost"]
+
+
+def _name(rng):
+    return " ".join(rng.choice(NAME_WORDS) for _ in range(rng.randint(1, 4))).strip()
+
+
+def _price(rng):
+    # Long tail: mostly bulk, a few chase cards.
+    return round(min(rng.lognormvariate(-0.5, 1.6), 2500.0), 2)
+
+
+def _qty(rng):
+    r = rng.random()
+    if r < 0.80:
+        return 1
+    if r < 0.97:
+        return rng.randint(2, 4)
+    return rng.randint(10, 200)   # bulk rows
+
+
+def tcgplayer_rows(n_rows, seed=0, paid=True, blank_every=500):
+    """Yield `n_rows` export rows as dicts keyed by HEADER (+ 'Paid' if paid)."""
+    rng = random.Random(seed)
+    for i in range(n_rows):
+        line = rng.random()
+        if line < 0.4:
+            set_code = rng.choice(WEISS_SETS)
+            rarity = rng.choice(WEISS_RARITIES)
+            row = {"Product Line": "Weiss Schwarz", "Set Name": set_code,
+                   "Number": f"{set_code}-E{rng.randint(1, 110):03d} {rarity}",
+                   "Rarity": rarity}
+        elif line < 0.75:
+            set_name, size = rng.choice(POKEMON_SETS)
+            row = {"Product Line": "Pokemon", "Set Name": set_name,
+                   "Number": f"{rng.randint(1, size + 30):03d}/{size}",
+                   "Rarity": rng.choice(POKEMON_RARITIES)}
+        else:
+            row = {"Product Line": "Magic: The Gathering", "Set Name": rng.choice(MTG_SETS),
+                   "Number": str(rng.randint(1, 400)), "Rarity": rng.choice(MTG_RARITIES)}
+
+        price = _price(rng)
+        product_id = rng.randint(100000, 600000)
+        row.update({
+            "Product Name": "" if blank_every and i % blank_every == blank_every - 1 else _name(rng),
+            "Title": "",
+            "Condition": rng.choice(CONDITIONS),
+            "Printing": rng.choice(PRINTINGS),
+            "Language": "English",
+            "TCG Market Price": f"{price:.2f}",
+            "Add to Quantity": str(_qty(rng)),
+            "Product ID": str(product_id),
+            "Photo URL": f"https://tcgplayer-cdn.tcgplayer.com/product/{product_id}_200w.jpg",
+        })
+        if paid:
+            row[PAID_HEADER] = f"{price * rng.uniform(0.5, 1.1):.2f}" if rng.random() < 0.7 else ""
+        yield row
+
+
+def tcgplayer_csv(n_rows, seed=0, paid=True) -> bytes:
+    """A complete export as UTF-8 bytes (with BOM, like TCGplayer's own files)."""
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=HEADER + ([PAID_HEADER] if paid else []))
+    writer.writeheader()
+    writer.writerows(tcgplayer_rows(n_rows, seed, paid))
+    return out.getvalue().encode("utf-8-sig")
+
+
+def manual_rows(n_rows, seed=0):
+    """Hand-entry rows in the shape parser.build_manual() takes."""
+    rng = random.Random(seed)
+    games = ["weiss", "pokemon", "mtg"]
+    for _ in range(n_rows):
+        yield {
+            "name": _name(rng),
+            "game": rng.choice(games),
+            "set_code": rng.choice(WEISS_SETS),
+            "collector_number": str(rng.randint(1, 200)),
+            "variant": rng.choice(["", "SR", "foil"]),
+            "condition": rng.choice(["NM", "LP", "MP"]),
+            "market_value": f"{_price(rng):.2f}",
+            "paid": f"{_price(rng):.2f}" if rng.random() < 0.5 else "",
+            "image_url": "",
+            "qty": str(_qty(rng)),
+        }
@@ -116,6 +116,13 @@ CREATE TABLE item (
 CREATE INDEX idx_item_acquisition ON item(acquisition_id);
 CREATE INDEX idx_item_status      ON item(status);
 
+-- Trigram indexes for the collection's ILIKE '%text%' search (see migrate_search_trgm.sql).
+CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public;
+CREATE INDEX idx_item_name_trgm             ON item USING gin (name             public.gin_trgm_ops);
+CREATE INDEX idx_item_set_code_trgm         ON item USING gin (set_code         public.gin_trgm_ops);
+CREATE INDEX idx_item_collector_number_trgm ON item USING gin (collector_number public.gin_trgm_ops);
+CREATE INDEX idx_item_storage_location_trgm ON item USING gin (storage_location public.gin_trgm_ops);
+
 COMMENT ON TABLE  item                        IS 'One row per individual card (or a sealed product being flipped).';
 COMMENT ON COLUMN item.cost_basis             IS 'Allocated share of the acquisition cost. Set by allocate_box_cost() for box pulls.';
 COMMENT ON COLUMN item.grading_total          IS 'Total grading spend added to basis: fee + shipping + extras.';
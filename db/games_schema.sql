@@ -53,6 +53,12 @@ COMMENT ON COLUMN games.game_copies.condition IS 'Sealed, CIB (complete in box),
 
 CREATE INDEX idx_game_copies_title ON games.game_copies(game_title_id);
 
+-- Trigram indexes for ILIKE '%text%' search / shelf lookup (see migrate_search_trgm.sql).
+CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public;
+CREATE INDEX idx_game_titles_title_trgm     ON games.game_titles USING gin (title          public.gin_trgm_ops);
+CREATE INDEX idx_game_titles_franchise_trgm ON games.game_titles USING gin (franchise      public.gin_trgm_ops);
+CREATE INDEX idx_game_copies_location_trgm  ON games.game_copies USING gin (location_label public.gin_trgm_ops);
+
 -- ---------------------------------------------------------------------------
 -- 3. PURCHASE INFO  (one row per acquisition; mirrors media_catalog.purchase_info)
 -- ---------------------------------------------------------------------------
@@ -99,4 +105,21 @@ CREATE VIEW games.v_game_library AS
     JOIN games.game_copies gc ON gc.game_title_id = gt.id
     LEFT JOIN games.purchase_info pi ON pi.game_copy_id = gc.id;
 
+-- ---------------------------------------------------------------------------
+-- 5. DASHBOARD STATS  (precomputed /games/ aggregates, kept by the add-game form)
+-- ---------------------------------------------------------------------------
+-- One row per breakdown bucket (total / platform / genre / store). The add-game
+-- handlers apply per-copy deltas in the same transaction as each write; rebuild
+-- with db/migrate_dashboard_stats.sql if it ever drifts. PostgreSQL 15+.
+CREATE TABLE games.dashboard_stats (
+    dimension    text    NOT NULL,                      -- 'total','platform','genre','store'
+    label        text,                                  -- the platform/genre/store value
+    n_rows       bigint  NOT NULL DEFAULT 0,
+    n_values     bigint  NOT NULL DEFAULT 0,
+    n_purchases  bigint  NOT NULL DEFAULT 0,
+    cost_sum     numeric(14,2) NOT NULL DEFAULT 0,
+    cost_n       bigint  NOT NULL DEFAULT 0,
+    CONSTRAINT dashboard_stats_key UNIQUE NULLS NOT DISTINCT (dimension, label)
+);
+
 COMMIT;
@@ -263,6 +263,21 @@ def main():
     L.append("")
     if basis == "allocate":
         L.append("  PERFORM allocate_box_cost(aid);")
+    # box_pl / box_median (db/migrate_box_pl_summary.sql, migrate_box_median.sql)
+    # are optional; refresh them if present.
+    for fn in ("refresh_box_pl", "refresh_box_median"):
+        L.append(f"  IF to_regprocedure('{fn}(bigint[])') IS NOT NULL THEN")
+        L.append(f"    PERFORM {fn}(ARRAY[aid]);")
+        L.append("  END IF;")
+    # Same for portfolio_totals (db/migrate_portfolio_totals.sql): a full recompute
+    # is fine for a one-off load.
+    L.append("  IF to_regclass('portfolio_totals') IS NOT NULL THEN")
+    L.append("    UPDATE portfolio_totals t SET total_invested = v.total_invested,")
+    L.append("        total_realized_net = v.total_realized_net, realized_profit = v.realized_profit,")
+    L.append("        unsold_market_value = v.unsold_market_value,")
+    L.append("        unrealized_profit = v.unrealized_profit, reconciled_at = now()")
+    L.append("    FROM v_portfolio v;")
+    L.append("  END IF;")
     L.append("  RAISE NOTICE 'acquisition % now has % cards', aid,")
     L.append("    (SELECT count(*) FROM item WHERE acquisition_id = aid);")
     L.append("END $$;")
@@ -0,0 +1,32 @@
+-- =============================================================================
+-- Migration: server-side poster/cover cache for the home pages — ADDITIVE
+-- =============================================================================
+-- One row per external artwork id:
+--     source       'tmdb_movie' | 'tmdb_tv' | 'rawg'
+--     external_id  the tmdb_id / rawg_id, as text
+--     image_path   TMDB poster_path ('/abc.jpg') or RAWG background_image URL;
+--                  NULL = looked up, no artwork (re-tried after ARTWORK_RETRY_DAYS)
+--
+-- Filled by the app's background refresher (app/artwork.py); the DVD and games
+-- home pages read it with a single primary-key lookup per page view instead of
+-- calling TMDB/RAWG from the browser. Lives in media_catalog and is shared with
+-- the games schema.
+--
+-- Creates a table only; the refresher populates it. Idempotent (safe to re-run).
+-- Run once:  psql -d media -f db/migrate_artwork_cache.sql
+-- =============================================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS media_catalog.artwork_cache (
+    source       text        NOT NULL,
+    external_id  text        NOT NULL,
+    image_path   text,
+    fetched_at   timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (source, external_id)
+);
+
+COMMENT ON TABLE media_catalog.artwork_cache IS
+    'tmdb_id/rawg_id -> poster path, filled by the app''s artwork refresher';
+
+COMMIT;
@@ -0,0 +1,103 @@
+-- =============================================================================
+-- Migration: stored per-box median value behind v_grade_candidates
+-- =============================================================================
+-- The review tier compares each card with its box's median market value. The
+-- view computed that median with percentile_cont over the whole item table on
+-- every read, so box detail (one box) and card detail (one card) paid for a
+-- ledger-wide aggregate.
+--
+-- This adds card_ledger.box_median (one row per acquisition that has valued
+-- items) and refresh_box_median(ids). The app's writers that change market
+-- values call refresh_box_median in the same transaction: the import commits and
+-- update_item, in app/card_ledger/service.py. v_grade_candidates is rewritten to
+-- read the stored median. Without an aggregate in the view, a filter on
+-- acquisition_id or item_id reaches the item indexes, so a box's or a card's
+-- tiers are evaluated for just those rows.
+--
+-- Same tiers and constants as before (25 / 3 / 0.50 / 30; mirrored in
+-- routes/ledger.py). After editing market values by hand, run
+--     SELECT card_ledger.refresh_box_median(NULL);
+-- Idempotent (re-running rebuilds the table).
+-- Run once:  psql -d media -f db/migrate_box_median.sql
+-- =============================================================================
+
+BEGIN;
+
+SET search_path TO card_ledger, public;
+
+CREATE TABLE IF NOT EXISTS box_median (
+    acquisition_id bigint PRIMARY KEY
+                   REFERENCES acquisition(acquisition_id) ON DELETE CASCADE,
+    median_value   double precision NOT NULL,   -- percentile_cont(0.5) of market_value
+    n_valued       integer NOT NULL              -- items with a market_value
+);
+
+COMMENT ON TABLE box_median IS 'Median item market_value per acquisition, for the review tier. Maintained by refresh_box_median().';
+
+-- Recompute box_median rows for the given acquisitions (NULL = all). Pinned to
+-- this schema's search_path, like refresh_box_pl().
+CREATE OR REPLACE FUNCTION refresh_box_median(p_acquisition_ids bigint[])
+RETURNS void
+LANGUAGE plpgsql
+SET search_path FROM CURRENT
+AS $$
+BEGIN
+    IF p_acquisition_ids IS NULL THEN
+        DELETE FROM box_median;
+        INSERT INTO box_median (acquisition_id, median_value, n_valued)
+        SELECT acquisition_id,
+               percentile_cont(0.5) WITHIN GROUP (ORDER BY market_value),
+               count(*)
+        FROM item
+        WHERE market_value IS NOT NULL
+        GROUP BY acquisition_id;
+    ELSE
+        DELETE FROM box_median WHERE acquisition_id = ANY(p_acquisition_ids);
+        INSERT INTO box_median (acquisition_id, median_value, n_valued)
+        SELECT acquisition_id,
+               percentile_cont(0.5) WITHIN GROUP (ORDER BY market_value),
+               count(*)
+        FROM item
+        WHERE market_value IS NOT NULL
+          AND acquisition_id = ANY(p_acquisition_ids)
+        GROUP BY acquisition_id;
+    END IF;
+END;
+$$;
+
+COMMENT ON FUNCTION refresh_box_median(bigint[])
+    IS 'Recompute box_median for the given acquisition ids (NULL = all).';
+
+SELECT refresh_box_median(NULL);
+
+-- Same two tiers as migrate_multigame_and_review.sql, reading the stored median.
+DROP VIEW IF EXISTS v_grade_candidates;
+CREATE VIEW v_grade_candidates AS
+SELECT
+    i.item_id,
+    i.acquisition_id,
+    i.name,
+    i.set_code,
+    i.condition,
+    i.market_value,
+    i.graded_value_est,
+    i.grade_candidate,
+    (i.cost_basis + i.grading_total)              AS total_basis,
+    (i.graded_value_est - i.market_value - 30)    AS est_upside,
+    b.median_value,
+    CASE
+        WHEN i.grade_candidate
+             OR (i.condition = 'NM' AND i.market_value >= 25)          THEN 'grade'
+        WHEN i.market_value >= 0.50 AND b.median_value > 0
+             AND i.market_value >= 3 * b.median_value                  THEN 'review'
+    END                                           AS tier
+FROM item i
+LEFT JOIN box_median b ON b.acquisition_id = i.acquisition_id
+WHERE i.grader IS NULL
+  AND i.status IN ('inventory','keep')
+  AND ( i.grade_candidate
+        OR (i.condition = 'NM' AND i.market_value >= 25)
+        OR (i.market_value >= 0.50 AND b.median_value > 0
+            AND i.market_value >= 3 * b.median_value) );
+
+COMMIT;
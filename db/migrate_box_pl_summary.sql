@@ -0,0 +1,80 @@
+-- =============================================================================
+-- Migration: precomputed per-box P&L (box_pl) behind the ledger home page
+-- =============================================================================
+-- v_box_pl aggregates acquisition LEFT JOIN item LEFT JOIN sale over the whole
+-- ledger on every read, so the ledger home slows down with every card ever
+-- pulled. This adds card_ledger.box_pl: one row per acquisition holding exactly
+-- the v_box_pl columns, plus refresh_box_pl(ids) to re-derive rows from the
+-- view. The app's writers (app/card_ledger/service.py: the import commits,
+-- record_sale, set_grading, update_item) call it for the acquisitions they touch,
+-- in the same transaction, so the home page is a paginated indexed read.
+--
+-- v_box_pl stays the definition of the numbers; box_pl is only its cache. Rows
+-- for deleted acquisitions go with them (ON DELETE CASCADE). Edits made outside
+-- the app (DBeaver, psql) are picked up by
+--     SELECT card_ledger.refresh_box_pl(ARRAY[<acquisition_id>]);   -- one box
+--     SELECT card_ledger.refresh_box_pl(NULL);                      -- everything
+-- Idempotent: re-running keeps the table (and anything that depends on it) and
+-- just re-derives every row with refresh_box_pl(NULL). If v_box_pl gains a
+-- column, DROP TABLE card_ledger.box_pl first so the re-run recreates it.
+-- Run once:  psql -d media -f db/migrate_box_pl_summary.sql
+-- =============================================================================
+
+BEGIN;
+
+SET search_path TO card_ledger, public;
+
+-- Same columns and types as the view, in the same order, plus refreshed_at.
+CREATE TABLE IF NOT EXISTS box_pl AS
+SELECT v.*, now() AS refreshed_at
+FROM v_box_pl v
+WITH NO DATA;
+
+-- Keys only on first creation (a re-run finds them already there).
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint
+                   WHERE conrelid = 'box_pl'::regclass AND contype = 'p') THEN
+        ALTER TABLE box_pl
+            ADD PRIMARY KEY (acquisition_id),
+            ADD FOREIGN KEY (acquisition_id) REFERENCES acquisition(acquisition_id) ON DELETE CASCADE,
+            ALTER COLUMN refreshed_at SET NOT NULL;
+    END IF;
+END;
+$$;
+
+-- The home page's keyset order (newest first).
+CREATE INDEX IF NOT EXISTS idx_box_pl_recent ON box_pl (purchase_date DESC, acquisition_id DESC);
+
+COMMENT ON TABLE  box_pl              IS 'Precomputed v_box_pl, one row per acquisition. Maintained by refresh_box_pl(); never edit by hand.';
+COMMENT ON COLUMN box_pl.refreshed_at IS 'When refresh_box_pl() last re-derived this row.';
+
+-- Re-derive box_pl rows from v_box_pl: the given acquisitions, or all of them
+-- when p_acquisition_ids is NULL. Filtering on the view's GROUP BY key lets the
+-- planner push it down to the acquisition/item/sale indexes, so refreshing one
+-- box reads only that box's items. search_path is pinned to this schema, so
+-- callers need no SET LOCAL.
+CREATE OR REPLACE FUNCTION refresh_box_pl(p_acquisition_ids bigint[])
+RETURNS void
+LANGUAGE plpgsql
+SET search_path FROM CURRENT
+AS $$
+BEGIN
+    IF p_acquisition_ids IS NULL THEN
+        DELETE FROM box_pl;
+        INSERT INTO box_pl SELECT v.*, now() FROM v_box_pl v;
+    ELSE
+        DELETE FROM box_pl WHERE acquisition_id = ANY(p_acquisition_ids);
+        INSERT INTO box_pl
+        SELECT v.*, now() FROM v_box_pl v
+        WHERE v.acquisition_id = ANY(p_acquisition_ids);
+    END IF;
+END;
+$$;
+
+COMMENT ON FUNCTION refresh_box_pl(bigint[])
+    IS 'Recompute box_pl rows from v_box_pl for the given acquisition ids (NULL = all).';
+
+SELECT refresh_box_pl(NULL);
+
+COMMIT;
@@ -0,0 +1,76 @@
+-- =============================================================================
+-- Migration: set-based cost allocation across many acquisitions
+-- =============================================================================
+-- allocate_box_cost(id) settles one box per call. After correcting tax or
+-- shipping on many boxes, or refreshing market_value_at_open, that means one
+-- call per acquisition. allocate_box_costs(ids) does the same math for a set of
+-- acquisitions (or every allocated one) in a single UPDATE ... FROM. Window
+-- aggregates partitioned by acquisition supply each box's total value and item
+-- count. Used by reallocate_costs() in app/card_ledger/service.py and
+-- db/reallocate_costs.py.
+--
+-- Results match allocate_box_cost() exactly: the weighted split by
+-- market_value_at_open, prorated by packs_opened/packs_total, an even split when
+-- a box has no values, and the same numeric(12,2) rounding of the intermediate
+-- amounts. Acquisitions without items are left alone.
+--
+-- NULL means every acquisition except product_type 'single'. Singles carry
+-- their as-paid basis and are never allocated. Ids passed explicitly are
+-- allocated whatever their type, just as allocate_box_cost(id) would be.
+-- Idempotent (CREATE OR REPLACE).
+-- Run once:  psql -d media -f db/migrate_bulk_allocation.sql
+-- =============================================================================
+
+BEGIN;
+
+SET search_path TO card_ledger, public;
+
+CREATE OR REPLACE FUNCTION allocate_box_costs(p_acquisition_ids bigint[])
+RETURNS integer
+LANGUAGE plpgsql
+SET search_path FROM CURRENT
+AS $$
+DECLARE
+    v_updated integer;
+BEGIN
+    UPDATE item i
+    SET cost_basis = x.new_basis
+    FROM (
+        SELECT w.item_id,
+               CASE
+                   WHEN w.total_mv > 0
+                   THEN ROUND(w.allocatable * COALESCE(w.mv_at_open, 0) / w.total_mv, 2)
+                   ELSE ROUND(w.allocatable / w.n_items, 2)
+               END AS new_basis
+        FROM (
+            SELECT it.item_id,
+                   it.market_value_at_open                                               AS mv_at_open,
+                   -- numeric(12,2) casts mirror allocate_box_cost()'s typed variables.
+                   CAST(COALESCE(SUM(it.market_value_at_open) OVER box, 0) AS numeric(12,2)) AS total_mv,
+                   COUNT(*) OVER box                                                     AS n_items,
+                   CAST(CASE
+                            WHEN a.packs_total IS NOT NULL AND a.packs_opened IS NOT NULL
+                                 AND a.packs_total > 0
+                            THEN a.total_cost * LEAST(a.packs_opened, a.packs_total)::numeric
+                                 / a.packs_total
+                            ELSE a.total_cost
+                        END AS numeric(12,2))                                            AS allocatable
+            FROM item it
+            JOIN acquisition a ON a.acquisition_id = it.acquisition_id
+            WHERE (p_acquisition_ids IS NULL AND a.product_type <> 'single')
+               OR it.acquisition_id = ANY(p_acquisition_ids)
+            WINDOW box AS (PARTITION BY it.acquisition_id)
+        ) AS w
+    ) AS x
+    WHERE i.item_id = x.item_id
+      AND i.cost_basis IS DISTINCT FROM x.new_basis;   -- settled cards: no write, no dead tuple
+
+    GET DIAGNOSTICS v_updated = ROW_COUNT;
+    RETURN v_updated;
+END;
+$$;
+
+COMMENT ON FUNCTION allocate_box_costs(bigint[])
+    IS 'Set-based allocate_box_cost() for many acquisitions (NULL = all but singles). Returns the number of items whose cost_basis changed.';
+
+COMMIT;
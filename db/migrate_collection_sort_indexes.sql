@@ -0,0 +1,44 @@
+-- =============================================================================
+-- Migration: btree indexes behind the /ledger/collection keyset sorts
+-- =============================================================================
+-- /ledger/collection pages by keyset: each sort orders by base-table expressions
+-- (routes/ledger.py _KEY_EXPR, NULLs coalesced to a sentinel) plus item_id, and
+-- the next page starts with a row comparison against the last row shown. These
+-- indexes are built on exactly those expressions, so a page is an index range
+-- scan that stops after COLLECTION_PAGE_SIZE rows, on page 1 or page 500.
+--
+--   name                 item (name, item_id)
+--   value_desc           item (COALESCE(market_value, '-Infinity'), item_id), backwards
+--   value_asc            item (COALESCE(market_value, 'Infinity'), item_id)
+--   basis_desc           item (COALESCE(cost_basis + grading_total, '-Infinity'), item_id)
+--   status               item (status, name, item_id)
+--   acquired_desc/_asc   acquisition (purchase_date, acquisition_id), then each
+--                        box's cards from item (acquisition_id, name, item_id)
+--
+-- 'relevance' orders by a trigram rank no index can supply. Its pages sort the
+-- name-filtered match set (found via the migrate_search_trgm.sql GIN indexes),
+-- so they cost O(matches), not O(page).
+-- Idempotent (IF NOT EXISTS).
+-- Run once:  psql -d media -f db/migrate_collection_sort_indexes.sql
+-- =============================================================================
+
+BEGIN;
+
+SET search_path TO card_ledger, public;
+
+CREATE INDEX IF NOT EXISTS idx_item_sort_name
+    ON item (name, item_id);
+CREATE INDEX IF NOT EXISTS idx_item_sort_value_desc
+    ON item ((COALESCE(market_value, '-Infinity'::numeric)), item_id);
+CREATE INDEX IF NOT EXISTS idx_item_sort_value_asc
+    ON item ((COALESCE(market_value, 'Infinity'::numeric)), item_id);
+CREATE INDEX IF NOT EXISTS idx_item_sort_basis_desc
+    ON item ((COALESCE(cost_basis + grading_total, '-Infinity'::numeric)), item_id);
+CREATE INDEX IF NOT EXISTS idx_item_sort_status
+    ON item (status, name, item_id);
+CREATE INDEX IF NOT EXISTS idx_item_acquisition_name
+    ON item (acquisition_id, name, item_id);
+CREATE INDEX IF NOT EXISTS idx_acquisition_purchase_date
+    ON acquisition (purchase_date, acquisition_id);
+
+COMMIT;
@@ -0,0 +1,89 @@
+-- =============================================================================
+-- Migration: precomputed dashboard stats for the DVD and games home pages
+-- =============================================================================
+-- Adds a dashboard_stats summary table to media_catalog and games. Each row is
+-- one breakdown bucket the home page shows (total / type / genre / disk_type /
+-- store for DVDs; total / platform / genre / store for games) with running
+-- counts and cost sums. The add-media and add-game form handlers apply deltas
+-- to it in the same transaction as each write, so a dashboard hit is a small
+-- indexed read instead of a GROUP BY over the whole collection.
+--
+-- Touches no existing data. Idempotent: re-running rebuilds both tables from
+-- scratch, which also repairs any drift (e.g. after editing rows in DBeaver).
+-- Requires PostgreSQL 15+ (UNIQUE NULLS NOT DISTINCT, so NULL labels such as
+-- "no store" get one bucket).
+-- Run once:  psql -d media -f db/migrate_dashboard_stats.sql
+-- =============================================================================
+
+BEGIN;
+
+-- ---------------------------------------------------------------------------
+-- 1. DVD catalog
+-- ---------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS media_catalog.dashboard_stats (
+    dimension    text    NOT NULL,                -- 'total','type','genre','disk_type','store'
+    label        text,                            -- the type/genre/... value (NULL for 'total')
+    n_rows       bigint  NOT NULL DEFAULT 0,      -- base_query() rows in this bucket
+    n_values     bigint  NOT NULL DEFAULT 0,      -- COUNT(<dimension column>)
+    n_purchases  bigint  NOT NULL DEFAULT 0,      -- rows with a purchase_info match
+    cost_sum     numeric(14,2) NOT NULL DEFAULT 0,
+    cost_n       bigint  NOT NULL DEFAULT 0,      -- non-NULL costs (sum shows NULL when 0)
+    CONSTRAINT dashboard_stats_key UNIQUE NULLS NOT DISTINCT (dimension, label)
+);
+
+TRUNCATE media_catalog.dashboard_stats;
+
+INSERT INTO media_catalog.dashboard_stats
+    (dimension, label, n_rows, n_values, n_purchases, cost_sum, cost_n)
+SELECT
+    CASE WHEN GROUPING(mt.type)      = 0 THEN 'type'
+         WHEN GROUPING(mt.genre)     = 0 THEN 'genre'
+         WHEN GROUPING(di.disk_type) = 0 THEN 'disk_type'
+         WHEN GROUPING(pi.store)     = 0 THEN 'store'
+         ELSE 'total' END,
+    COALESCE(mt.type, mt.genre, di.disk_type, pi.store)::text,
+    COUNT(*),
+    COUNT(COALESCE(mt.type, mt.genre, di.disk_type, pi.store)),
+    COUNT(pi.id),
+    COALESCE(SUM(pi.cost), 0),
+    COUNT(pi.cost)
+FROM media_catalog.media_titles mt
+JOIN media_catalog.dvd_items di ON di.media_title_id = mt.id
+LEFT JOIN media_catalog.purchase_info pi ON di.id = pi.dvd_item_id
+GROUP BY GROUPING SETS ((), (mt.type), (mt.genre), (di.disk_type), (pi.store));
+
+-- ---------------------------------------------------------------------------
+-- 2. Games catalog
+-- ---------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS games.dashboard_stats (
+    dimension    text    NOT NULL,                -- 'total','platform','genre','store'
+    label        text,
+    n_rows       bigint  NOT NULL DEFAULT 0,
+    n_values     bigint  NOT NULL DEFAULT 0,
+    n_purchases  bigint  NOT NULL DEFAULT 0,
+    cost_sum     numeric(14,2) NOT NULL DEFAULT 0,
+    cost_n       bigint  NOT NULL DEFAULT 0,
+    CONSTRAINT dashboard_stats_key UNIQUE NULLS NOT DISTINCT (dimension, label)
+);
+
+TRUNCATE games.dashboard_stats;
+
+INSERT INTO games.dashboard_stats
+    (dimension, label, n_rows, n_values, n_purchases, cost_sum, cost_n)
+SELECT
+    CASE WHEN GROUPING(gc.platform) = 0 THEN 'platform'
+         WHEN GROUPING(gt.genre)    = 0 THEN 'genre'
+         WHEN GROUPING(pi.store)    = 0 THEN 'store'
+         ELSE 'total' END,
+    COALESCE(gc.platform, gt.genre, pi.store)::text,
+    COUNT(*),
+    COUNT(COALESCE(gc.platform, gt.genre, pi.store)),
+    COUNT(pi.id),
+    COALESCE(SUM(pi.cost), 0),
+    COUNT(pi.cost)
+FROM games.game_titles gt
+JOIN games.game_copies gc ON gc.game_title_id = gt.id
+LEFT JOIN games.purchase_info pi ON pi.game_copy_id = gc.id
+GROUP BY GROUPING SETS ((), (gc.platform), (gt.genre), (pi.store));
+
+COMMIT;
@@ -0,0 +1,70 @@
+-- =============================================================================
+-- Migration: unified shelf/bin location index for /locate — ADDITIVE
+-- =============================================================================
+-- One view over every located thing in the database: DVD disks, card-ledger
+-- items, and game copies, normalised to
+--     (collection, row_id, parent_id, label, title, detail_1..3)
+-- so /locate answers all three collections with a single query.
+--
+-- The view is a UNION ALL, so a `label ILIKE '%...%'` filter is pushed down
+-- into each branch and served by that table's pg_trgm index, and a filter on
+-- `collection` prunes whole branches. Run db/migrate_search_trgm.sql first —
+-- it creates the trigram indexes on dvd_items.location_label,
+-- game_copies.location_label and item.storage_location.
+--
+-- Creates a view only; touches no data. Idempotent (safe to re-run).
+-- Run once:  psql -d media -f db/migrate_locations.sql
+-- =============================================================================
+
+BEGIN;
+
+CREATE OR REPLACE VIEW media_catalog.v_locations AS
+    -- detail_1..3: movies = season_name, type, disk_type
+    SELECT
+        'movies'::text          AS collection,
+        di.id::bigint           AS row_id,
+        mt.id::bigint           AS parent_id,       -- media_titles.id (detail page)
+        di.location_label::text AS label,
+        mt.title::text          AS title,
+        di.season_name::text    AS detail_1,
+        mt.type::text           AS detail_2,
+        di.disk_type::text      AS detail_3
+    FROM media_catalog.dvd_items di
+    JOIN media_catalog.media_titles mt ON mt.id = di.media_title_id
+    WHERE di.location_label IS NOT NULL
+
+    UNION ALL
+
+    -- cards = set_code, condition, status
+    SELECT
+        'cards',
+        i.item_id,
+        i.item_id,                                   -- card detail is per item
+        i.storage_location,
+        i.name,
+        i.set_code,
+        i.condition,
+        i.status
+    FROM card_ledger.item i
+    WHERE i.storage_location IS NOT NULL
+
+    UNION ALL
+
+    -- games = platform, edition, copy condition
+    SELECT
+        'games',
+        gc.id,
+        gt.id,                                       -- game_titles.id (detail page)
+        gc.location_label,
+        gt.title,
+        gc.platform,
+        gc.edition,
+        gc.condition
+    FROM games.game_copies gc
+    JOIN games.game_titles gt ON gt.id = gc.game_title_id
+    WHERE gc.location_label IS NOT NULL;
+
+COMMENT ON VIEW media_catalog.v_locations
+    IS 'Every located disk, card and game copy as (collection, row_id, parent_id, label, title, detail_1..3); backs /locate.';
+
+COMMIT;
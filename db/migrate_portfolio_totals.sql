@@ -0,0 +1,45 @@
+-- =============================================================================
+-- Migration: running portfolio counters (portfolio_totals) behind /ledger/
+-- =============================================================================
+-- v_portfolio runs five scalar subqueries over every acquisition, item and sale
+-- each time the ledger home loads. This adds card_ledger.portfolio_totals: one
+-- row holding the same five numbers, under the same column names. The app's
+-- writers (app/card_ledger/service.py) keep it current with deltas: they
+-- subtract the touched acquisition's or item's contribution before a write and
+-- add it back after, in the same transaction, having locked the row first
+-- (SELECT ... FOR UPDATE) so overlapping writers serialise. The home page
+-- reads one row.
+--
+-- v_portfolio stays the definition. `flask --app dvd ledger reconcile`
+-- recomputes the row from scratch and reports any drift, e.g. after editing
+-- rows in DBeaver. Re-running this migration also rebuilds it.
+-- Idempotent.
+-- Run once:  psql -d media -f db/migrate_portfolio_totals.sql
+-- =============================================================================
+
+BEGIN;
+
+SET search_path TO card_ledger, public;
+
+CREATE TABLE IF NOT EXISTS portfolio_totals (
+    singleton           boolean PRIMARY KEY DEFAULT true CHECK (singleton),  -- exactly one row
+    total_invested      numeric(14,2) NOT NULL DEFAULT 0,
+    total_realized_net  numeric(14,2) NOT NULL DEFAULT 0,
+    realized_profit     numeric(14,2) NOT NULL DEFAULT 0,
+    unsold_market_value numeric(14,2) NOT NULL DEFAULT 0,
+    unrealized_profit   numeric(14,2) NOT NULL DEFAULT 0,
+    reconciled_at       timestamptz                      -- last full recompute
+);
+
+COMMENT ON TABLE portfolio_totals IS 'v_portfolio as running counters (one row). Maintained by deltas from the app; reconcile with `flask ledger reconcile`.';
+
+DELETE FROM portfolio_totals;
+
+INSERT INTO portfolio_totals
+    (total_invested, total_realized_net, realized_profit,
+     unsold_market_value, unrealized_profit, reconciled_at)
+SELECT total_invested, total_realized_net, realized_profit,
+       unsold_market_value, unrealized_profit, now()
+FROM v_portfolio;
+
+COMMIT;
@@ -0,0 +1,46 @@
+-- =============================================================================
+-- Migration: trigram search indexes (catalog, games, card ledger) — ADDITIVE
+-- =============================================================================
+-- The search pages filter with ILIKE '%text%'. A plain btree can't serve a
+-- leading wildcard, so every search was a sequential scan of the joined rows.
+-- pg_trgm GIN indexes can: the query builders in routes/search.py,
+-- routes/games.py and routes/ledger.py now apply those ILIKE predicates to the
+-- base tables before the join, and rank by word_similarity() (also pg_trgm).
+--
+-- Creates indexes only; touches no data. Idempotent (safe to re-run).
+-- Run once:  psql -d media -f db/migrate_search_trgm.sql
+-- =============================================================================
+
+BEGIN;
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public;
+
+-- DVD catalog: title / season name search and shelf-label lookup.
+CREATE INDEX IF NOT EXISTS idx_media_titles_title_trgm
+    ON media_catalog.media_titles USING gin (title public.gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_dvd_items_season_name_trgm
+    ON media_catalog.dvd_items USING gin (season_name public.gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_dvd_items_location_trgm
+    ON media_catalog.dvd_items USING gin (location_label public.gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_dvd_items_title
+    ON media_catalog.dvd_items (media_title_id);
+
+-- Games catalog: title / franchise search and shelf-label lookup.
+CREATE INDEX IF NOT EXISTS idx_game_titles_title_trgm
+    ON games.game_titles USING gin (title public.gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_game_titles_franchise_trgm
+    ON games.game_titles USING gin (franchise public.gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_game_copies_location_trgm
+    ON games.game_copies USING gin (location_label public.gin_trgm_ops);
+
+-- Card ledger: collection name / set / number search and storage lookup.
+CREATE INDEX IF NOT EXISTS idx_item_name_trgm
+    ON card_ledger.item USING gin (name public.gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_item_set_code_trgm
+    ON card_ledger.item USING gin (set_code public.gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_item_collector_number_trgm
+    ON card_ledger.item USING gin (collector_number public.gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_item_storage_location_trgm
+    ON card_ledger.item USING gin (storage_location public.gin_trgm_ops);
+
+COMMIT;
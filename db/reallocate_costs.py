@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+reallocate_costs.py
+-------------------
+Re-settle cost_basis for many acquisitions in one set-based UPDATE. Use it after
+correcting tax/shipping on several boxes in DBeaver, or after refreshing
+market_value_at_open. Same math as allocate_box_cost(), one statement instead of
+one call per box:
+
+    python db/reallocate_costs.py 12 15 40     # these acquisitions
+    python db/reallocate_costs.py --all        # every acquisition except singles
+
+Connects with the app's own settings (app/config/.env) and goes through
+card_ledger.service.reallocate_costs(). That also refreshes box_pl and
+portfolio_totals, all in one transaction. Needs db/migrate_bulk_allocation.sql.
+The app's 30 s statement_timeout is lifted for that transaction; --timeout sets
+one (seconds) instead.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
+
+from flask import Flask                  # noqa: E402
+from config import Config                # noqa: E402
+from extensions import db                # noqa: E402
+from card_ledger import service          # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Bulk card-ledger cost reallocation")
+    ap.add_argument("acquisition_ids", nargs="*", type=int,
+                    help="Acquisitions to re-allocate")
+    ap.add_argument("--all", action="store_true",
+                    help="Re-allocate every acquisition except singles")
+    ap.add_argument("--timeout", type=float, default=0,
+                    help="statement_timeout in seconds for the run (default 0 = none)")
+    args = ap.parse_args()
+    if args.all == bool(args.acquisition_ids):
+        ap.error("give acquisition ids or --all (not both)")
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    db.init_app(app)
+
+    started = time.perf_counter()
+    with app.app_context():
+        changed = service.reallocate_costs(None if args.all else args.acquisition_ids,
+                                           timeout_ms=int(args.timeout * 1000))
+    scope = ("all acquisitions" if args.all
+             else f"{len(args.acquisition_ids)} acquisition(s)")
+    print(f"Re-allocated {scope}: {changed} card(s) changed basis "
+          f"in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
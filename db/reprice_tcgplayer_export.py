@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+reprice_tcgplayer_export.py
+---------------------------
+Refresh market_value for every owned, ungraded card from a fresh TCGplayer scan
+export. This is the CLI for the ledger's Reprice page
+(card_ledger.service.reprice_from_csv()):
+
+    python db/reprice_tcgplayer_export.py --csv collection_scan.csv --dry-run
+    python db/reprice_tcgplayer_export.py --csv collection_scan.csv
+
+The CSV is parsed with the app's import rules and staged in a temp table. Cards
+are matched on Product ID and variant, falling back to name + set + number +
+variant, and updated in one joined UPDATE. box_pl, box_median and
+portfolio_totals are refreshed in the same transaction. Connects with the app's
+settings (app/config/.env), but with no statement timeout for the run unless
+--timeout sets one (seconds).
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
+
+from flask import Flask                  # noqa: E402
+from config import Config                # noqa: E402
+from extensions import db                # noqa: E402
+from card_ledger import service          # noqa: E402
+from card_ledger.parser import ENGINES   # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Bulk card-ledger repricing from a TCGplayer CSV")
+    ap.add_argument("--csv", required=True, help="TCGplayer export with current market prices")
+    ap.add_argument("--engine", choices=ENGINES, default="rows",
+                    help="CSV parse engine (columnar: ~0-25%% faster, "
+                         "for ~1.5x the memory)")
+    ap.add_argument("--dry-run", action="store_true",
+                    help="report what would change, then roll back")
+    ap.add_argument("--timeout", type=float, default=0,
+                    help="statement_timeout in seconds for the run (default 0 = none)")
+    args = ap.parse_args()
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    db.init_app(app)
+
+    started = time.perf_counter()
+    with app.app_context(), open(args.csv, "rb") as fh:
+        r = service.reprice_from_csv(fh, engine=args.engine, apply=not args.dry_run,
+                                     timeout_ms=int(args.timeout * 1000))
+    for warning in r['warnings']:
+        print(f"warning: {warning}")
+    print(f"{r['csv_rows']} CSV rows: {r['rows_unmatched']} matched no owned card, "
+          f"{r['rows_unpriced']} had no market price")
+    print(f"{r['items_matched']} cards matched ({r['matched_by_product_id']} by Product ID, "
+          f"{r['matched_by_name']} by name/set/number), {r['items_updated']} repriced "
+          f"across {r['acquisitions']} box(es)")
+    print(f"value ${r['value_before']:,.2f} -> ${r['value_after']:,.2f} "
+          f"({r['value_change']:+,.2f}) in {time.perf_counter() - started:.2f}s"
+          + ("" if r['applied'] else " (dry run, nothing saved)"))
+
+
+if __name__ == "__main__":
+    main()
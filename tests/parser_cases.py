@@ -0,0 +1,71 @@
+"""TCGplayer CSV fixtures for the parser tests.
+
+EDGE_CASES are hand-written exports for the corners a real scanner export
+rarely hits. export_csv() builds deterministic exports across the three product
+lines the parser special-cases (Weiss numbers with an embedded set code and
+rarity token, Pokémon 'nnn/nnn', MTG), with repeated values, varied quantities,
+junk cells, blank-name rows and an optional Paid column.
+"""
+import csv
+import io
+import random
+
+EDGE_CASES = {
+    'empty':          b'',
+    'header_only':    b'Product Name,Quantity\n',
+    'title_fallback': b'Product Name,Title,Add to Quantity\n,Alt Name,2\nReal,,x\n',
+    'short_rows':     b'Product Line,Product Name,Number,Rarity,TCG Market Price\n'
+                      b'Weiss Schwarz,Fern,SFN/S108-E006 R\nPokemon,Pika\n\n',
+    'duplicate_cols': b'Product Name,Paid,Paid,Total Quantity\nA,1.00,2.50,3\nB,,,\n',
+    'bom_and_junk':   '﻿Product Name,TCG Market Price,Add to Quantity,Condition\n'
+                      ' Card ,abc, 2.0 ,NEAR MINT\nX,1e2,-4,Damaged\n'.encode('utf-8'),
+}
+
+HEADER = ["Product Line", "Set Name", "Product Name", "Title", "Number", "Rarity",
+          "Condition", "Printing", "TCG Market Price", "Add to Quantity", "Product ID",
+          "Photo URL"]
+
+_LINES = [
+    ("Weiss Schwarz", ["SFN/S108", "CSM/S96"], ["C", "R", "SR", "SSP"]),
+    ("Pokemon", ["Paldea Evolved", "151"], ["Common", "Holo Rare", "Ultra Rare"]),
+    ("Magic: The Gathering", ["Bloomburrow", "Duskmourn"], ["C", "U", "R", "M"]),
+    ("Lorcana", ["The First Chapter"], ["Rare"]),
+]
+_CONDITIONS = ["Near Mint", "Near Mint", "Lightly Played", "Damaged", "", "Mint-ish"]
+_PRINTINGS = ["Normal", "Normal", "Foil", "Reverse Holofoil", ""]
+_NAMES = ["Fern", "Frieren", "Pikachu", "Charizard", "Sheoldred", "Ember Knight"]
+
+
+def _number(rng, line, set_name, rarity):
+    if line == "Weiss Schwarz":
+        return f"{set_name}-E{rng.randint(1, 40):03d} {rarity}"
+    if line == "Pokemon":
+        return f"{rng.randint(1, 200):03d}/193"
+    return str(rng.randint(1, 300))
+
+
+def export_csv(n_rows, seed=0, paid=True) -> bytes:
+    """`n_rows` export rows as UTF-8 bytes with a BOM, like TCGplayer's files."""
+    rng = random.Random(seed)
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(HEADER + (["Paid"] if paid else []))
+    for i in range(n_rows):
+        line, sets, rarities = rng.choice(_LINES)
+        set_name, rarity = rng.choice(sets), rng.choice(rarities)
+        product_id = rng.randint(1000, 1200)
+        row = [
+            line, set_name,
+            "" if i % 37 == 36 else rng.choice(_NAMES),
+            rng.choice(["", "", "Alt Title"]),
+            _number(rng, line, set_name, rarity), rarity,
+            rng.choice(_CONDITIONS), rng.choice(_PRINTINGS),
+            rng.choice([f"{rng.uniform(0.1, 80):.2f}", "", "n/a"]),
+            rng.choice(["1", "1", "3", "2.0", "", "x", "150"]),
+            str(product_id),
+            rng.choice(["", f"https://tcgplayer-cdn.tcgplayer.com/product/{product_id}.jpg"]),
+        ]
+        if paid:
+            row.append(rng.choice(["", f"{rng.uniform(0.1, 50):.2f}", "-"]))
+        writer.writerow(row)
+    return out.getvalue().encode("utf-8-sig")
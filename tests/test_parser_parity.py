@@ -0,0 +1,49 @@
+"""The columnar parse engine must return exactly the row engine's compact payload.
+
+Runs card_ledger.parser.parse_csv(expand=False) both ways over the hand-written
+edge cases and generated exports (with and without a Paid column) from
+parser_cases.py. The columnar engine has no expanded ("items") mode.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'app'))
+
+from card_ledger import parser                  # noqa: E402
+from parser_cases import EDGE_CASES, export_csv  # noqa: E402
+
+INPUTS = dict(EDGE_CASES)
+for _n_rows in (1, 50, 2000):
+    for _paid in (True, False):
+        INPUTS[f'export_{_n_rows}_{"paid" if _paid else "nopaid"}'] = \
+            export_csv(_n_rows, seed=7, paid=_paid)
+
+
+@pytest.mark.parametrize('name', sorted(INPUTS))
+def test_columnar_matches_rows(name):
+    data = INPUTS[name]
+    rows = parser.parse_csv(data, expand=False, engine='rows')
+    cols = parser.parse_csv(data, expand=False, engine='columnar')
+    assert cols == rows
+
+
+def test_columnar_matches_rows_from_binary_file(tmp_path):
+    path = tmp_path / 'export.csv'
+    path.write_bytes(INPUTS['export_2000_paid'])
+    with open(path, 'rb') as fh:
+        rows = parser.parse_csv(fh, expand=False, engine='rows')
+    with open(path, 'rb') as fh:
+        cols = parser.parse_csv(fh, expand=False, engine='columnar')
+    assert cols == rows
+
+
+def test_columnar_refuses_expanded_payload():
+    with pytest.raises(ValueError):
+        parser.parse_csv(EDGE_CASES['duplicate_cols'], expand=True, engine='columnar')
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        parser.parse_csv(b'Product Name\nA\n', engine='numpy')